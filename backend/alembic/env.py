@@ -22,6 +22,7 @@ from app.database import Base, engine
 from app.auth import models  # noqa: F401
 from app.auth import models_extras  # noqa: F401
 from app.vehicles import models as vehicle_models  # noqa: F401
+from app.jobs import models as job_models  # noqa: F401
 
 config = context.config
 if config.config_file_name is not None:
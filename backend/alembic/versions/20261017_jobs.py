@@ -0,0 +1,48 @@
+"""Jobs table for the background job queue (app.jobs).
+
+Revision ID: 007_jobs
+Revises: 006_vehicle_image_path_index
+Create Date: 2026-10-17
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision: str = "007_jobs"
+down_revision: Union[str, None] = "006_vehicle_image_path_index"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "jobs",
+        sa.Column("id", sa.BigInteger(), autoincrement=True, nullable=False),
+        sa.Column("kind", sa.String(length=100), nullable=False),
+        sa.Column("payload", postgresql.JSONB(), nullable=False),
+        sa.Column("status", sa.String(length=20), nullable=False),
+        sa.Column("attempts", sa.Integer(), nullable=False),
+        sa.Column("max_attempts", sa.Integer(), nullable=False),
+        sa.Column("run_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.Column("locked_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("locked_by", sa.String(length=100), nullable=True),
+        sa.Column("last_error", sa.Text(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.Column("finished_at", sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    # Claim query: due queued jobs in run_at order, and stale running jobs to reclaim
+    op.create_index("ix_jobs_queued_run_at", "jobs", ["run_at", "id"], postgresql_where=sa.text("status = 'queued'"))
+    op.create_index("ix_jobs_running_locked_at", "jobs", ["locked_at"], postgresql_where=sa.text("status = 'running'"))
+    # Latency stats and purge of finished jobs
+    op.create_index("ix_jobs_finished_at", "jobs", ["finished_at"], postgresql_where=sa.text("status = 'done'"))
+
+
+def downgrade() -> None:
+    op.drop_index("ix_jobs_finished_at", table_name="jobs")
+    op.drop_index("ix_jobs_running_locked_at", table_name="jobs")
+    op.drop_index("ix_jobs_queued_run_at", table_name="jobs")
+    op.drop_table("jobs")
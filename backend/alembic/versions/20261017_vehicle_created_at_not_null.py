@@ -0,0 +1,37 @@
+"""Make vehicles.created_at NOT NULL (it always gets a default on insert).
+
+Keyset pages sorted by created_at then need no `OR created_at IS NULL`, which
+kept Postgres from using the cursor as an index range condition.
+
+The column is checked through a NOT VALID constraint validated separately, so
+the table is scanned under a lock that still allows reads and writes; SET NOT
+NULL then relies on the validated constraint instead of scanning again.
+
+Revision ID: 008_vehicle_created_at_not_null
+Revises: 007_jobs
+Create Date: 2026-10-17
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+revision: str = "008_vehicle_created_at_not_null"
+down_revision: Union[str, None] = "007_jobs"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+CHECK = "vehicles_created_at_not_null"
+
+
+def upgrade() -> None:
+    op.execute("UPDATE vehicles SET created_at = COALESCE(updated_at, now()) WHERE created_at IS NULL")
+    with op.get_context().autocommit_block():
+        op.execute(f"ALTER TABLE vehicles ADD CONSTRAINT {CHECK} CHECK (created_at IS NOT NULL) NOT VALID")
+        op.execute(f"ALTER TABLE vehicles VALIDATE CONSTRAINT {CHECK}")
+        op.execute("ALTER TABLE vehicles ALTER COLUMN created_at SET NOT NULL")
+        op.execute(f"ALTER TABLE vehicles DROP CONSTRAINT {CHECK}")
+
+
+def downgrade() -> None:
+    op.execute("ALTER TABLE vehicles ALTER COLUMN created_at DROP NOT NULL")
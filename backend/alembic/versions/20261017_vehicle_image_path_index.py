@@ -0,0 +1,41 @@
+"""Index vehicle_images.image_path for shared-file reference checks.
+
+Image files are content-addressed, so several rows can point at one file; on
+delete the app checks whether any row still references the path. Built
+CONCURRENTLY so the table is not locked.
+
+Revision ID: 006_vehicle_image_path_index
+Revises: 005_vehicle_image_variants
+Create Date: 2026-10-17
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+revision: str = "006_vehicle_image_path_index"
+down_revision: Union[str, None] = "005_vehicle_image_variants"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_vehicle_images_image_path",
+            "vehicle_images",
+            ["image_path"],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_vehicle_images_image_path",
+            table_name="vehicle_images",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
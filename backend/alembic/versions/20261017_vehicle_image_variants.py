@@ -0,0 +1,28 @@
+"""Record generated image variants (thumbnail, detail, WebP) per vehicle image.
+
+Adds a nullable JSONB column, so no table rewrite. Existing images get variants
+with: python -m scripts.build_image_variants
+
+Revision ID: 005_vehicle_image_variants
+Revises: 004_vehicle_search
+Create Date: 2026-10-17
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision: str = "005_vehicle_image_variants"
+down_revision: Union[str, None] = "004_vehicle_search"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("vehicle_images", sa.Column("variants", postgresql.JSONB(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("vehicle_images", "variants")
@@ -0,0 +1,57 @@
+"""Composite and partial indexes for vehicle list queries; index user_roles.user_id.
+
+Indexes are built CONCURRENTLY (outside the migration transaction) so the live
+vehicles table is not locked. Verify with: python -m scripts.check_indexes
+
+Revision ID: 003_vehicle_query_indexes
+Revises: 002_vehicles
+Create Date: 2026-10-17
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "003_vehicle_query_indexes"
+down_revision: Union[str, None] = "002_vehicles"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+ACTIVE = sa.text("status = 'active'")
+
+# (name, table, columns, partial-index predicate)
+INDEXES = [
+    # GET /vehicles/browse [?product=] ordered by created_at, price, model_year or mileage
+    ("ix_vehicles_active_created", "vehicles", ["created_at DESC", "id DESC"], ACTIVE),
+    ("ix_vehicles_active_product_created", "vehicles", ["product", "created_at DESC", "id DESC"], ACTIVE),
+    ("ix_vehicles_active_amount", "vehicles", ["amount", "id"], ACTIVE),
+    ("ix_vehicles_active_model_year", "vehicles", ["model_year", "id"], ACTIVE),
+    ("ix_vehicles_active_mileage", "vehicles", ["mileage", "id"], ACTIVE),
+    # GET /vehicles (tenant list) [?product=] [?status_filter=]
+    ("ix_vehicles_account_created", "vehicles", ["account_id", "created_at DESC", "id DESC"], None),
+    ("ix_vehicles_account_product_created", "vehicles", ["account_id", "product", "created_at DESC", "id DESC"], None),
+    ("ix_vehicles_account_status_created", "vehicles", ["account_id", "status", "created_at DESC", "id DESC"], None),
+    # get_user_roles on login, refresh and /auth/me
+    ("ix_user_roles_user_id", "user_roles", ["user_id"], None),
+]
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, columns, where in INDEXES:
+            op.create_index(
+                name,
+                table,
+                [sa.text(c) for c in columns],
+                unique=False,
+                postgresql_where=where,
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, _, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,73 @@
+"""Full-text search column on vehicles (name, location, description) with a GIN index.
+
+search_vector is kept current by a BEFORE INSERT/UPDATE trigger rather than a
+generated column, so adding it does not rewrite the table. Existing rows are
+backfilled in batches and the GIN index is built CONCURRENTLY.
+
+Revision ID: 004_vehicle_search
+Revises: 003_vehicle_query_indexes
+Create Date: 2026-10-17
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision: str = "004_vehicle_search"
+down_revision: Union[str, None] = "003_vehicle_query_indexes"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BACKFILL_BATCH = 5000
+
+# Must match app.vehicles.search.SEARCH_CONFIG
+_DOCUMENT = """
+    setweight(to_tsvector('english', coalesce({row}name, '')), 'A') ||
+    setweight(to_tsvector('english', coalesce({row}location, '')), 'B') ||
+    setweight(to_tsvector('english', coalesce({row}description, '')), 'C')
+"""
+
+
+def upgrade() -> None:
+    op.add_column("vehicles", sa.Column("search_vector", postgresql.TSVECTOR(), nullable=True))
+    op.execute(f"""
+        CREATE FUNCTION vehicles_search_vector_update() RETURNS trigger AS $$
+        BEGIN
+            NEW.search_vector := {_DOCUMENT.format(row="NEW.")};
+            RETURN NEW;
+        END
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE TRIGGER vehicles_search_vector_trg
+        BEFORE INSERT OR UPDATE OF name, location, description ON vehicles
+        FOR EACH ROW EXECUTE FUNCTION vehicles_search_vector_update()
+    """)
+    with op.get_context().autocommit_block():
+        bind = op.get_bind()
+        while True:
+            result = bind.execute(sa.text(f"""
+                UPDATE vehicles SET search_vector = {_DOCUMENT.format(row="")}
+                WHERE id IN (SELECT id FROM vehicles WHERE search_vector IS NULL LIMIT {BACKFILL_BATCH})
+            """))
+            if result.rowcount < BACKFILL_BATCH:
+                break
+        op.create_index(
+            "ix_vehicles_search_vector",
+            "vehicles",
+            ["search_vector"],
+            unique=False,
+            postgresql_using="gin",
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index("ix_vehicles_search_vector", table_name="vehicles", postgresql_concurrently=True, if_exists=True)
+    op.execute("DROP TRIGGER IF EXISTS vehicles_search_vector_trg ON vehicles")
+    op.execute("DROP FUNCTION IF EXISTS vehicles_search_vector_update()")
+    op.drop_column("vehicles", "search_vector")
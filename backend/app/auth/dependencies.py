@@ -1,9 +1,11 @@
-"""Auth dependencies: OAuth2 scheme, get_current_user, roles_required."""
+"""Auth dependencies: OAuth2 scheme, get_current_user (sync and async routes), roles_required, superuser_required."""
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.database import get_db
+from app.database import get_async_db, get_db
+from app.core import metrics
 from app.core.config import settings
 from app.core.security import decode_jwt, CLAIM_SUB, CLAIM_TYP, CLAIM_JTI
 from app.auth.models import User
@@ -11,19 +13,18 @@ from app.auth.models import User
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/token", auto_error=True)
 
 
-def get_current_user(
-    token: str = Depends(oauth2_scheme),
-    db: Session = Depends(get_db),
-) -> User:
+def _user_for_token(db: Session, token: str) -> User:
     try:
         payload = decode_jwt(token, settings.JWT_SECRET_KEY)
     except Exception:
+        metrics.AUTH_TOKEN_REJECTIONS.labels("invalid").inc()
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid or expired token",
             headers={"WWW-Authenticate": "Bearer"},
         )
     if payload.get(CLAIM_TYP) != "access":
+        metrics.AUTH_TOKEN_REJECTIONS.labels("wrong_type").inc()
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid token type",
@@ -32,6 +33,7 @@ def get_current_user(
     from app.auth.service import is_revoked
     jti = payload.get(CLAIM_JTI)
     if jti and is_revoked(db, jti=jti):
+        metrics.AUTH_TOKEN_REJECTIONS.labels("revoked").inc()
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Token has been revoked",
@@ -39,13 +41,30 @@ def get_current_user(
         )
     user_id = payload.get(CLAIM_SUB)
     if not user_id:
+        metrics.AUTH_TOKEN_REJECTIONS.labels("invalid").inc()
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
     user = db.get(User, int(user_id))
     if not user or not user.is_active:
+        metrics.AUTH_TOKEN_REJECTIONS.labels("inactive").inc()
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found or inactive")
     return user
 
 
+def get_current_user(
+    token: str = Depends(oauth2_scheme),
+    db: Session = Depends(get_db),
+) -> User:
+    return _user_for_token(db, token)
+
+
+async def get_current_user_async(
+    token: str = Depends(oauth2_scheme),
+    db: AsyncSession = Depends(get_async_db),
+) -> User:
+    """get_current_user for async def routes; shares their AsyncSession."""
+    return await db.run_sync(_user_for_token, token)
+
+
 def roles_required(*allowed_roles: str):
     def _check(user: User = Depends(get_current_user), db: Session = Depends(get_db)) -> User:
         from app.auth.service import get_user_roles
@@ -54,3 +73,10 @@ def roles_required(*allowed_roles: str):
             raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Insufficient permissions")
         return user
     return _check
+
+
+def superuser_required(user: User = Depends(get_current_user)) -> User:
+    """Platform operators only: users.is_superuser, which is set in the database and granted by no account role."""
+    if not user.is_superuser:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Insufficient permissions")
+    return user
@@ -34,7 +34,7 @@ class Role(PKMixin, TenantMixin, TimestampMixin, Base):
 
 class UserRole(PKMixin, Base):
     __tablename__ = "user_roles"
-    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
     role_id = Column(Integer, ForeignKey("roles.id", ondelete="CASCADE"), nullable=False)
     user = relationship("User", back_populates="roles")
     role = relationship("Role", back_populates="user_roles")
@@ -2,10 +2,12 @@
 from __future__ import annotations
 import hashlib
 from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from fastapi.security import OAuth2PasswordRequestForm
 
-from app.database import get_db
+from app.database import get_async_db, get_db
+from app.core import metrics
 from app.core.config import settings
 from app.core.security import CLAIM_SUB, CLAIM_ACC, CLAIM_ROLE, CLAIM_TYP, CLAIM_JTI, decode_jwt, create_jwt, hash_password, verify_password
 from app.auth.schemas import (
@@ -29,7 +31,7 @@ from app.auth.service import (
     get_user_by_email,
     is_revoked,
 )
-from app.auth.dependencies import get_current_user, oauth2_scheme, roles_required
+from app.auth.dependencies import get_current_user_async, oauth2_scheme, roles_required
 from app.auth.models import User
 
 router = APIRouter(prefix="/auth", tags=["Auth"])
@@ -63,8 +65,10 @@ def verify(req: VerifyEmailRequest, db: Session = Depends(get_db)) -> dict:
 def login(payload: LoginRequest, db: Session = Depends(get_db)) -> TokenPair:
     user = authenticate_user(db, payload.email, payload.password)
     if not user:
+        metrics.AUTH_LOGINS.labels("failure").inc()
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials")
     access, refresh = issue_tokens(user, get_user_roles(db, user.id))
+    metrics.AUTH_LOGINS.labels("success").inc()
     return TokenPair(access_token=access, refresh_token=refresh)
 
 
@@ -104,14 +108,15 @@ def logout(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)) -
 
 
 @router.get("/me", response_model=UserOut)
-def me(user: User = Depends(get_current_user), db: Session = Depends(get_db)) -> UserOut:
+async def me(user: User = Depends(get_current_user_async), db: AsyncSession = Depends(get_async_db)) -> UserOut:
+    roles = await db.run_sync(get_user_roles, user.id)
     return UserOut(
         id=user.id,
         email=user.email,
         first_name=user.first_name,
         last_name=user.last_name,
         account_id=user.account_id,
-        roles=get_user_roles(db, user.id),
+        roles=roles,
         is_superuser=user.is_superuser,
     )
 
@@ -120,8 +125,10 @@ def me(user: User = Depends(get_current_user), db: Session = Depends(get_db)) ->
 def login_token(form: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)) -> TokenPair:
     user = authenticate_user(db, form.username, form.password)
     if not user:
+        metrics.AUTH_LOGINS.labels("failure").inc()
         raise HTTPException(status_code=401, detail="Invalid credentials")
     access, refresh = issue_tokens(user, get_user_roles(db, user.id))
+    metrics.AUTH_LOGINS.labels("success").inc()
     return TokenPair(access_token=access, refresh_token=refresh)
 
 
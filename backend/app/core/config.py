@@ -12,7 +12,7 @@ def _get_database_url() -> str:
         if "psycopg2" in url:
             url = url.replace("psycopg2", "psycopg", 1)
         return url
-    # Build from parts (same as app.database)
+    # Build from parts
     user = os.getenv("DB_USER", "systemiser")
     password = os.getenv("DB_PASSWORD", "systemiser")
     host = os.getenv("DB_HOST", "localhost")
@@ -21,13 +21,91 @@ def _get_database_url() -> str:
     return f"postgresql+psycopg://{user}:{password}@{host}:{port}/{name}"
 
 
+def _get_storage_dir() -> str:
+    # One absolute root for writing, serving and the scripts: a relative STORAGE_DIR is taken
+    # from the backend directory, not from wherever the process was started
+    backend_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    return os.path.abspath(os.path.join(backend_dir, os.getenv("STORAGE_DIR", "storage")))
+
+
 class Settings:
     DATABASE_URL: str = _get_database_url()
+    # Read-only public endpoints use these (comma-separated, same form as DATABASE_URL); see app.core.replicas
+    DATABASE_REPLICA_URLS: list[str] = [
+        u.strip().replace("+psycopg2", "+psycopg", 1) for u in os.getenv("DATABASE_REPLICA_URLS", "").split(",") if u.strip()
+    ]
+    # Replica health/lag re-check interval, and the replay lag above which a replica is skipped (0 = ignore lag)
+    REPLICA_HEALTH_CHECK_SECONDS: float = float(os.getenv("REPLICA_HEALTH_CHECK_SECONDS", "5"))
+    REPLICA_MAX_LAG_SECONDS: float = float(os.getenv("REPLICA_MAX_LAG_SECONDS", "10"))
+    # After a write, that client reads from the primary for this long (cookie lifetime; 0 = off)
+    READ_PRIMARY_AFTER_WRITE_SECONDS: int = int(os.getenv("READ_PRIMARY_AFTER_WRITE_SECONDS", "10"))
+    # Connection pool of each engine (sync and async), per worker process; see app.database.make_engine
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", "5"))
+    DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+    # Seconds to wait for a free connection before failing the request
+    DB_POOL_TIMEOUT: float = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+    # Replace connections older than this many seconds (-1 = never); keep below any proxy/server idle timeout
+    DB_POOL_RECYCLE: int = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+    # Test each connection on checkout (one round-trip) so a dropped connection is replaced, not failed
+    DB_POOL_PRE_PING: bool = os.getenv("DB_POOL_PRE_PING", "true").lower() in ("1", "true", "yes")
+    # SQLAlchemy compiled-statement cache entries per engine
+    DB_STATEMENT_CACHE_SIZE: int = int(os.getenv("DB_STATEMENT_CACHE_SIZE", "500"))
+    # psycopg server-side prepare after this many executions of a query; empty disables (needed behind PgBouncer)
+    DB_PREPARE_THRESHOLD: int | None = int(os.getenv("DB_PREPARE_THRESHOLD", "5")) if os.getenv("DB_PREPARE_THRESHOLD", "5") else None
     JWT_SECRET_KEY: str = os.getenv("JWT_SECRET_KEY", "change-me-in-production-use-long-secret")
     ACCESS_TOKEN_EXPIRE_MINUTES: int = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "60"))
     REFRESH_TOKEN_EXPIRE_MINUTES: int = int(os.getenv("REFRESH_TOKEN_EXPIRE_MINUTES", "10080"))
     DEFAULT_ACCOUNT_SLUG: str = os.getenv("DEFAULT_ACCOUNT_SLUG", "hashagile")
-    STORAGE_DIR: str = os.getenv("STORAGE_DIR", "storage")
+    STORAGE_DIR: str = _get_storage_dir()
+    # Stored files modified this recently are never deleted (an upload of the same bytes may not have committed yet)
+    STORAGE_GRACE_MINUTES: float = float(os.getenv("STORAGE_GRACE_MINUTES", "60"))
+    # /storage: max-age for content-addressed (never-changing) files, sent as "immutable"; other files revalidate
+    STORAGE_CACHE_MAX_AGE: int = int(os.getenv("STORAGE_CACHE_MAX_AGE", "31536000"))
+    # Hand file delivery to the front proxy: "" (app streams files), "x-accel-redirect" (nginx) or "x-sendfile"
+    STORAGE_SENDFILE: str = os.getenv("STORAGE_SENDFILE", "").lower()
+    # x-accel-redirect: internal nginx location mapped (alias) to STORAGE_DIR
+    STORAGE_ACCEL_PREFIX: str = os.getenv("STORAGE_ACCEL_PREFIX", "/_storage/")
+    # POST /vehicles/import: rows per INSERT executemany (one pipelined round trip), and the most rows one file may hold
+    IMPORT_BATCH_SIZE: int = int(os.getenv("IMPORT_BATCH_SIZE", "500"))
+    IMPORT_MAX_ROWS: int = int(os.getenv("IMPORT_MAX_ROWS", "10000"))
+    # GET /vehicles/export: rows fetched per round-trip from the server-side cursor
+    EXPORT_YIELD_PER: int = int(os.getenv("EXPORT_YIELD_PER", "1000"))
+    # Threads (shared by all requests) writing and hashing the images of multi-image uploads; 1 = serial
+    UPLOAD_WORKERS: int = int(os.getenv("UPLOAD_WORKERS", "4"))
+    # Largest request body accepted (413 otherwise), checked before multipart uploads are spooled; 0 = no limit
+    MAX_REQUEST_BODY_MB: float = float(os.getenv("MAX_REQUEST_BODY_MB", "100"))
+    # Background jobs (app.jobs): worker poll interval, retries with exponential backoff, stale lock
+    # reclaim (worker died mid-job) and how long finished jobs are kept
+    JOB_POLL_INTERVAL_SECONDS: float = float(os.getenv("JOB_POLL_INTERVAL_SECONDS", "1"))
+    JOB_MAX_ATTEMPTS: int = int(os.getenv("JOB_MAX_ATTEMPTS", "5"))
+    JOB_BACKOFF_BASE_SECONDS: float = float(os.getenv("JOB_BACKOFF_BASE_SECONDS", "5"))
+    JOB_BACKOFF_MAX_SECONDS: float = float(os.getenv("JOB_BACKOFF_MAX_SECONDS", "900"))
+    JOB_LOCK_TIMEOUT_SECONDS: float = float(os.getenv("JOB_LOCK_TIMEOUT_SECONDS", "600"))
+    JOB_RETENTION_HOURS: float = float(os.getenv("JOB_RETENTION_HOURS", "24"))
+    MAX_PAGE_SIZE: int = int(os.getenv("MAX_PAGE_SIZE", "100"))
+    COUNT_CACHE_TTL_SECONDS: float = float(os.getenv("COUNT_CACHE_TTL_SECONDS", "30"))
+    COUNT_CACHE_SIZE: int = int(os.getenv("COUNT_CACHE_SIZE", "1024"))
+    # Above this many planner-estimated rows, list totals are estimated instead of counted (0 = always count)
+    COUNT_ESTIMATE_THRESHOLD: int = int(os.getenv("COUNT_ESTIMATE_THRESHOLD", "100000"))
+    # Serialized /vehicles/browse pages (first BROWSE_CACHE_MAX_PAGE pages, non-cursor); TTL 0 disables
+    BROWSE_CACHE_TTL_SECONDS: float = float(os.getenv("BROWSE_CACHE_TTL_SECONDS", "15"))
+    BROWSE_CACHE_SIZE: int = int(os.getenv("BROWSE_CACHE_SIZE", "512"))
+    BROWSE_CACHE_MAX_PAGE: int = int(os.getenv("BROWSE_CACHE_MAX_PAGE", "3"))
+    # Rendered /v/{id} share pages (HTML + gzip), keyed by vehicle version; TTL 0 disables
+    SHARE_PAGE_CACHE_TTL_SECONDS: float = float(os.getenv("SHARE_PAGE_CACHE_TTL_SECONDS", "300"))
+    SHARE_PAGE_CACHE_SIZE: int = int(os.getenv("SHARE_PAGE_CACHE_SIZE", "256"))
+    # Cache-Control max-age for public vehicle JSON and share pages (clients revalidate with ETag after)
+    PUBLIC_CACHE_MAX_AGE: int = int(os.getenv("PUBLIC_CACHE_MAX_AGE", "60"))
+    # Raise instead of log when an endpoint exceeds its @query_budget (enable in CI)
+    QUERY_BUDGET_STRICT: bool = os.getenv("QUERY_BUDGET_STRICT", "false").lower() in ("1", "true", "yes")
+    # "production" turns off debugging aids such as the SQL profile response headers
+    ENVIRONMENT: str = os.getenv("ENVIRONMENT", "development").lower()
+    # Time every SQL statement: per-request profile log, slow-query log, X-Query-Count/Server-Timing outside production
+    SQL_PROFILE: bool = os.getenv("SQL_PROFILE", "false").lower() in ("1", "true", "yes")
+    # With SQL_PROFILE: log statements taking at least this long, with their route (0 = off)
+    SQL_SLOW_QUERY_MS: float = float(os.getenv("SQL_SLOW_QUERY_MS", "100"))
+    # Shared directory for /metrics samples when running several uvicorn workers (empty it on restart)
+    PROMETHEUS_MULTIPROC_DIR: str = os.getenv("PROMETHEUS_MULTIPROC_DIR", "")
 
 
 settings = Settings()
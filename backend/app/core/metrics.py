@@ -0,0 +1,119 @@
+"""Prometheus metrics (GET /metrics).
+
+MetricsMiddleware counts every HTTP request and times it, labelled by method,
+route template (e.g. /vehicles/{vehicle_id}, so label values stay bounded) and
+status; it also records response body sizes and the number of requests in flight.
+The instrumented pools in app.core.pool_metrics export checkout waits, timeouts
+and connections in use per engine, and app.auth counts login and token outcomes.
+
+Several uvicorn workers: set PROMETHEUS_MULTIPROC_DIR to an empty directory
+(clear it on every restart). Each worker then writes its samples to files
+there and /metrics, whichever worker serves it, reports the sum over all of them.
+Without it, /metrics covers the serving process only.
+"""
+import os
+import time
+
+from app.core.config import settings
+
+# prometheus_client picks its multiprocess value store at import time, from the environment
+if settings.PROMETHEUS_MULTIPROC_DIR:
+    os.environ["PROMETHEUS_MULTIPROC_DIR"] = settings.PROMETHEUS_MULTIPROC_DIR
+    os.makedirs(settings.PROMETHEUS_MULTIPROC_DIR, exist_ok=True)
+
+from prometheus_client import (  # noqa: E402
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+
+_METHODS = {"GET", "HEAD", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"}
+UNMATCHED_ROUTE = "<unmatched>"
+
+REQUESTS = Counter("http_requests_total", "HTTP requests", ["method", "route", "status"])
+REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds", "Time to the end of the response body", ["method", "route"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30),
+)
+RESPONSE_SIZE = Histogram(
+    "http_response_size_bytes", "Response body bytes sent", ["method", "route"],
+    buckets=(256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216),
+)
+IN_FLIGHT = Gauge("http_requests_in_flight", "HTTP requests being served", multiprocess_mode="livesum")
+
+POOL_SIZE = Gauge("db_pool_size", "Configured pool size", ["pool"], multiprocess_mode="livesum")
+POOL_MAX_OVERFLOW = Gauge("db_pool_max_overflow", "Connections allowed beyond the pool size", ["pool"],
+                          multiprocess_mode="livesum")
+POOL_CHECKED_OUT = Gauge("db_pool_checked_out", "Connections in use", ["pool"], multiprocess_mode="livesum")
+POOL_CHECKOUT_WAIT = Histogram(
+    "db_pool_checkout_wait_seconds", "Wait for a pooled connection (or to open one)", ["pool"],
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 5, 10, 30),
+)
+POOL_TIMEOUTS = Counter("db_pool_timeouts_total", "Checkouts that gave up after the pool timeout", ["pool"])
+
+AUTH_LOGINS = Counter("auth_logins_total", "Password logins (/auth/login, /auth/token)", ["outcome"])
+AUTH_TOKEN_REJECTIONS = Counter(
+    "auth_token_rejections_total", "Access tokens refused: invalid, wrong_type, revoked or inactive user", ["reason"]
+)
+
+
+def _route(scope: dict, root_path: str) -> str:
+    route = scope.get("route")  # set by the router on a match
+    if route is not None:
+        return route.path
+    mounted = scope.get("root_path", "")[len(root_path):]  # e.g. /storage for the mounted static files
+    return f"{mounted}/{{path}}" if mounted else UNMATCHED_ROUTE
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording request count, latency, response size and in-flight requests."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        start = time.perf_counter()
+        root_path = scope.get("root_path", "")
+        status, size = 500, 0
+
+        async def send_wrapper(message):
+            nonlocal status, size
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif message["type"] == "http.response.body":
+                size += len(message.get("body", b""))
+            await send(message)
+
+        IN_FLIGHT.inc()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            IN_FLIGHT.dec()
+            method = scope["method"] if scope["method"] in _METHODS else "other"
+            route = _route(scope, root_path)
+            REQUESTS.labels(method, route, str(status)).inc()
+            REQUEST_DURATION.labels(method, route).observe(time.perf_counter() - start)
+            RESPONSE_SIZE.labels(method, route).observe(size)
+
+
+def render() -> tuple[bytes, str]:
+    """Current metrics in the Prometheus text format, and its content type."""
+    if settings.PROMETHEUS_MULTIPROC_DIR:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+    return generate_latest(REGISTRY), CONTENT_TYPE_LATEST
+
+
+def worker_stopped() -> None:
+    """Drop this process's in-flight and pool gauges from the shared directory (call on shutdown)."""
+    if settings.PROMETHEUS_MULTIPROC_DIR:
+        multiprocess.mark_process_dead(os.getpid())
@@ -0,0 +1,114 @@
+"""Live connection pool statistics (GET /internal/pool).
+
+The engines in app.database use these QueuePool subclasses, which time every
+checkout (pre-ping included): the wait for a free connection when the pool and
+its overflow are exhausted, or opening a new one. Together with the pool's own
+counters this shows whether requests are queueing for connections and how
+close the pool runs to its limits. The same figures are exported to Prometheus (app.core.metrics),
+labelled with the engine's pool name.
+"""
+import threading
+import time
+from collections import deque
+
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+from app.core import metrics
+
+# Recent checkout waits kept for percentiles
+WINDOW = 1000
+
+
+class PoolMetrics:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._waits: deque[float] = deque(maxlen=WINDOW)
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+    def record(self, seconds: float, timed_out: bool = False) -> None:
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+            else:
+                self.checkouts += 1
+            self.wait_total += seconds
+            self.wait_max = max(self.wait_max, seconds)
+            self._waits.append(seconds)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            waits = sorted(self._waits)
+            attempts = self.checkouts + self.timeouts
+
+            def pct(p: float) -> float:
+                return round(waits[min(len(waits) - 1, int(len(waits) * p))] * 1000, 3) if waits else 0.0
+
+            return {
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "wait_ms_avg": round(self.wait_total / attempts * 1000, 3) if attempts else 0.0,
+                "wait_ms_p95": pct(0.95),
+                "wait_ms_max": round(self.wait_max * 1000, 3),
+            }
+
+
+class _InstrumentedMixin:
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.metrics = PoolMetrics()
+        name = self.logging_name or "default"  # make_engine(name=...)
+        metrics.POOL_SIZE.labels(name).set(self.size())
+        metrics.POOL_MAX_OVERFLOW.labels(name).set(self._max_overflow)
+        self._prom_wait = metrics.POOL_CHECKOUT_WAIT.labels(name)
+        self._prom_timeouts = metrics.POOL_TIMEOUTS.labels(name)
+        self._prom_checked_out = metrics.POOL_CHECKED_OUT.labels(name)
+
+    # Timed at connect(), not _do_get(): QueuePool._do_get calls itself again when it
+    # loses a race for an overflow slot, which would count one checkout twice
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            conn = super().connect()
+        except exc.TimeoutError:
+            self.metrics.record(time.perf_counter() - start, timed_out=True)
+            self._prom_timeouts.inc()
+            raise
+        waited = time.perf_counter() - start
+        self.metrics.record(waited)
+        self._prom_wait.observe(waited)
+        self._prom_checked_out.set(self.checkedout())
+        return conn
+
+    def _do_return_conn(self, record) -> None:
+        super()._do_return_conn(record)
+        # Read back from the pool rather than counted up and down, so it cannot drift
+        self._prom_checked_out.set(self.checkedout())
+
+
+class InstrumentedQueuePool(_InstrumentedMixin, QueuePool):
+    pass
+
+
+class InstrumentedAsyncQueuePool(_InstrumentedMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+def pool_stats(pool) -> dict:
+    """Configured limits, current usage and checkout wait times of `pool`."""
+    stats = {
+        "size": pool.size(),
+        "max_overflow": pool._max_overflow,
+        "timeout_seconds": pool.timeout(),
+        "checked_out": pool.checkedout(),
+        "checked_in": pool.checkedin(),
+        # Connections opened beyond `size`; negative while the pool is still filling up
+        "overflow": pool.overflow(),
+    }
+    metrics = getattr(pool, "metrics", None)
+    if metrics is not None:
+        stats.update(metrics.snapshot())
+    return stats
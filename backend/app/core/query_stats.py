@@ -0,0 +1,191 @@
+"""Per-request SQL statement counting, per-endpoint query budgets and the SQL profiler.
+
+Endpoints declare how many statements one request may issue with
+@query_budget(n). QueryBudgetMiddleware counts statements executed while a
+request is in flight, up to the last chunk of a streamed body, and logs (or,
+with QUERY_BUDGET_STRICT, raises) when an endpoint goes over budget, so a
+regression back to N+1 loading fails CI.
+
+With SQL_PROFILE the statements are also timed: each request gets a log line
+with its query count, total DB time and slowest statements; statements over
+SQL_SLOW_QUERY_MS are logged with their route as they finish; and outside
+production responses carry `X-Query-Count` and `Server-Timing: db;dur=<ms>`.
+Off by default, and free when off: the timing listeners are not installed.
+"""
+import heapq
+import logging
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Slowest statements kept per request for the profile log line
+SLOWEST_KEPT = 3
+_STATEMENT_LOG_CHARS = 300
+
+
+class RequestQueryStats:
+    __slots__ = ("count", "seconds", "slowest", "scope")
+
+    def __init__(self, scope: Optional[dict] = None) -> None:
+        self.count = 0
+        self.seconds = 0.0
+        self.slowest: list[tuple[float, str]] = []  # min-heap of (seconds, statement)
+        self.scope = scope
+
+    @property
+    def route(self) -> str:
+        if self.scope is None:
+            return "-"
+        route = self.scope.get("route")
+        return f"{self.scope['method']} {route.path if route is not None else self.scope['path']}"
+
+    def record(self, seconds: float, statement: str) -> None:
+        self.seconds += seconds
+        if len(self.slowest) < SLOWEST_KEPT:
+            heapq.heappush(self.slowest, (seconds, statement))
+        elif seconds > self.slowest[0][0]:
+            heapq.heapreplace(self.slowest, (seconds, statement))
+
+
+_current: ContextVar[Optional[RequestQueryStats]] = ContextVar("request_query_stats", default=None)
+
+
+class QueryBudgetExceeded(RuntimeError):
+    pass
+
+
+def current_stats() -> Optional[RequestQueryStats]:
+    return _current.get()
+
+
+@contextmanager
+def uncounted():
+    """Run housekeeping statements (e.g. health checks) without charging them to the request in flight."""
+    token = _current.set(None)
+    try:
+        yield
+    finally:
+        _current.reset(token)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _current.get()
+    if stats is not None:
+        stats.count += 1
+
+
+def _short(statement: str) -> str:
+    statement = " ".join(statement.split())
+    return statement if len(statement) <= _STATEMENT_LOG_CHARS else statement[:_STATEMENT_LOG_CHARS] + "..."
+
+
+def _start_timer(conn, cursor, statement, parameters, context, executemany):
+    context._query_started = time.perf_counter()
+
+
+def _stop_timer(conn, cursor, statement, parameters, context, executemany):
+    started = getattr(context, "_query_started", None)
+    stats = _current.get()
+    if started is None or stats is None:
+        return
+    seconds = time.perf_counter() - started
+    stats.record(seconds, statement)
+    threshold = settings.SQL_SLOW_QUERY_MS
+    if threshold > 0 and seconds * 1000 >= threshold:
+        logger.warning("Slow query (%.1f ms) in %s: %s", seconds * 1000, stats.route, _short(statement))
+
+
+def install(engine: Engine, profile: bool = False) -> None:
+    """Count statements run on `engine` against the request in flight; with `profile`, time them too."""
+    listeners = [("before_cursor_execute", _before_cursor_execute)]
+    if profile:
+        listeners += [("before_cursor_execute", _start_timer), ("after_cursor_execute", _stop_timer)]
+    for name, fn in listeners:
+        if not event.contains(engine, name, fn):
+            event.listen(engine, name, fn)
+
+
+def query_budget(max_queries: int):
+    """Declare the maximum number of SQL statements an endpoint may issue per request."""
+    def decorator(fn):
+        fn.query_budget = max_queries
+        return fn
+    return decorator
+
+
+def _show_profile_log() -> None:
+    # uvicorn configures only its own loggers; unless the app's logging is set up, INFO lines would be dropped
+    if logger.getEffectiveLevel() > logging.INFO:
+        logger.setLevel(logging.INFO)
+    if not logger.handlers and not logging.getLogger().handlers:
+        handler = logging.StreamHandler()
+        handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+        logger.addHandler(handler)
+
+
+def _log_profile(stats: RequestQueryStats) -> None:
+    slowest = sorted(stats.slowest, reverse=True)
+    logger.info(
+        "%s: %d queries, %.1f ms in DB%s", stats.route, stats.count, stats.seconds * 1000,
+        "".join(f"\n  {seconds * 1000:8.1f} ms  {_short(statement)}" for seconds, statement in slowest),
+    )
+
+
+class QueryBudgetMiddleware:
+    """ASGI middleware enforcing @query_budget limits and reporting the SQL profile (see module docstring)."""
+
+    def __init__(self, app, strict: bool = False, profile: bool = False, timing_headers: bool = False):
+        self.app = app
+        self.strict = strict
+        self.profile = profile
+        self.timing_headers = profile and timing_headers
+        if profile:
+            _show_profile_log()
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        stats = RequestQueryStats(scope)
+        token = _current.set(stats)
+        reported = False
+
+        def check_budget() -> None:
+            nonlocal reported
+            budget = getattr(scope.get("endpoint"), "query_budget", None)
+            if reported or budget is None or stats.count <= budget:
+                return
+            reported = True
+            msg = f"{scope['method']} {scope['path']} issued {stats.count} queries (budget {budget})"
+            if self.strict:
+                raise QueryBudgetExceeded(msg)
+            logger.warning(msg)
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                check_budget()
+                if self.timing_headers:
+                    # Statements issued while a body streams come after this; they show in the log line only
+                    message["headers"] = list(message.get("headers", [])) + [
+                        (b"x-query-count", str(stats.count).encode()),
+                        (b"server-timing", f'db;dur={stats.seconds * 1000:.1f};desc="{stats.count} queries"'.encode()),
+                    ]
+            elif message["type"] == "http.response.body" and not message.get("more_body", False):
+                # A streamed body (e.g. the export) runs its statements after the headers went out
+                check_budget()
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _current.reset(token)
+            if self.profile and stats.count:
+                _log_profile(stats)
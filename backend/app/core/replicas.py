@@ -0,0 +1,194 @@
+"""Read-replica routing for public, read-only endpoints.
+
+get_read_db hands out an AsyncSession on one of DATABASE_REPLICA_URLS (round
+robin) instead of the primary. A replica is used only while its last health
+check passed: it answered, and (when it is a streaming standby that has not
+caught up) its replay lag was within REPLICA_MAX_LAG_SECONDS. Checks run every
+REPLICA_HEALTH_CHECK_SECONDS in a background task started with the app
+(ReplicaSet.start), never on a request. A replica that fails a query
+mid-request is taken out until the next check and that read is retried once on
+the primary. With no healthy replica, or none configured, reads go to the primary.
+
+Read-your-writes: a successful write (POST/PUT/PATCH/DELETE) sets a short-lived
+cookie (READ_PRIMARY_AFTER_WRITE_SECONDS); requests carrying it, or an
+`X-Read-Primary: 1` header (for clients without a cookie jar), read from the
+primary, so a client sees its own change even while replicas lag.
+"""
+import asyncio
+import contextlib
+import itertools
+import logging
+from typing import Optional
+
+from fastapi import Request
+from sqlalchemy import exc, make_url, text
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+
+from app.core.config import settings
+from app.core.pool_metrics import pool_stats
+from app.database import AsyncSessionLocal, make_async_engine
+
+logger = logging.getLogger(__name__)
+
+READ_PRIMARY_COOKIE = "read_primary"
+READ_PRIMARY_HEADER = "x-read-primary"
+CHECK_TIMEOUT_SECONDS = 2.0
+_UNSAFE_METHODS = {"POST", "PUT", "PATCH", "DELETE"}
+
+# Seconds the standby is behind; 0 when it has replayed everything it received, NULL on a primary
+_LAG_SQL = text(
+    "SELECT CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0"
+    " ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()) END"
+)
+
+
+class Replica:
+    def __init__(self, url: str) -> None:
+        parsed = make_url(url)
+        self.engine: AsyncEngine = make_async_engine(url, name=f"replica {parsed.host}:{parsed.port or 5432}")
+        self.sessions = async_sessionmaker(self.engine, autoflush=False, expire_on_commit=False)
+        self.name = self.engine.url.render_as_string(hide_password=True)
+        self.healthy = False
+        self.lag_seconds: Optional[float] = None
+        self.error: Optional[str] = None
+
+    async def _lag(self) -> Optional[float]:
+        async with self.engine.connect() as conn:
+            return (await conn.execute(_LAG_SQL)).scalar()
+
+    async def check(self) -> None:
+        try:
+            # Bounded, connect included: an unreachable host must not stall the request running the check
+            lag = await asyncio.wait_for(self._lag(), CHECK_TIMEOUT_SECONDS)
+        except (exc.SQLAlchemyError, OSError, asyncio.TimeoutError) as e:
+            self.mark_down(f"{type(e).__name__}: {e}".splitlines()[0])
+            return
+        self.lag_seconds = float(lag) if lag is not None else None
+        max_lag = settings.REPLICA_MAX_LAG_SECONDS
+        if max_lag > 0 and self.lag_seconds is not None and self.lag_seconds > max_lag:
+            self.mark_down(f"lag {self.lag_seconds:.1f}s > {max_lag:g}s")
+            return
+        if not self.healthy:
+            logger.info("Replica %s is up", self.name)
+        self.healthy, self.error = True, None
+
+    def mark_down(self, reason: str) -> None:
+        if self.healthy or self.error is None:
+            logger.warning("Replica %s is down: %s", self.name, reason)
+        self.healthy, self.error = False, reason
+
+
+class ReplicaSet:
+    def __init__(self, urls: list[str]) -> None:
+        self.replicas = [Replica(url) for url in urls]
+        self._next = itertools.count()
+        self._task: Optional[asyncio.Task] = None
+
+    async def check(self) -> None:
+        await asyncio.gather(*(r.check() for r in self.replicas))
+
+    async def _check_forever(self) -> None:
+        while True:
+            await asyncio.sleep(settings.REPLICA_HEALTH_CHECK_SECONDS)
+            try:
+                await self.check()
+            except Exception:  # keep checking; Replica.check already handles connection errors
+                logger.exception("Replica health check failed")
+
+    async def start(self) -> None:
+        """Check once (so replicas serve from the first request), then keep checking in the background."""
+        if not self.replicas or self._task is not None:
+            return
+        await self.check()
+        self._task = asyncio.create_task(self._check_forever())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await self._task
+        self._task = None
+
+    def pick(self) -> Optional[Replica]:
+        healthy = [r for r in self.replicas if r.healthy]
+        return healthy[next(self._next) % len(healthy)] if healthy else None
+
+    def stats(self) -> list[dict]:
+        return [
+            {"url": r.name, "healthy": r.healthy, "lag_seconds": r.lag_seconds, "error": r.error,
+             "pool": pool_stats(r.engine.pool)}
+            for r in self.replicas
+        ]
+
+
+replicas = ReplicaSet(settings.DATABASE_REPLICA_URLS)
+
+
+def wants_primary(request: Request) -> bool:
+    return READ_PRIMARY_COOKIE in request.cookies or request.headers.get(READ_PRIMARY_HEADER) == "1"
+
+
+class ReplicaSession:
+    """Session on a replica whose run_sync falls back to the primary.
+
+    Read endpoints do all their queries through run_sync. When one fails with a
+    connection-level error the replica is marked down and that call, and every
+    later one in the request, runs on a primary session instead; reads are safe
+    to repeat. Everything else is delegated to the current session.
+    """
+
+    def __init__(self, replica: Replica) -> None:
+        self.replica = replica
+        self.session: AsyncSession = replica.sessions()
+        self.on_primary = False
+
+    async def run_sync(self, fn, *args, **kwargs):
+        try:
+            return await self.session.run_sync(fn, *args, **kwargs)
+        except (exc.OperationalError, exc.InterfaceError) as e:
+            if self.on_primary:
+                raise
+            self.replica.mark_down(f"query failed: {type(e).__name__}")
+            logger.warning("Read on replica %s failed, retrying on the primary", self.replica.name)
+            await self.session.close()
+            self.session, self.on_primary = AsyncSessionLocal(), True
+            return await self.session.run_sync(fn, *args, **kwargs)
+
+    def __getattr__(self, name):
+        return getattr(self.session, name)
+
+
+async def get_read_db(request: Request):
+    """AsyncSession for a read-only request: a healthy replica (with fallback), else the primary."""
+    replica = None if wants_primary(request) else replicas.pick()
+    if replica is None:
+        async with AsyncSessionLocal() as db:
+            yield db
+        return
+    db = ReplicaSession(replica)
+    try:
+        yield db
+    finally:
+        await db.session.close()
+
+
+class ReadYourWritesMiddleware:
+    """Mark clients that just wrote so their next reads skip the replicas (ASGI middleware)."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        max_age = settings.READ_PRIMARY_AFTER_WRITE_SECONDS
+        if scope["type"] != "http" or scope["method"] not in _UNSAFE_METHODS or not replicas.replicas or max_age <= 0:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start" and 200 <= message["status"] < 300:
+                cookie = f"{READ_PRIMARY_COOKIE}=1; Max-Age={max_age}; Path=/; HttpOnly; SameSite=Lax"
+                message["headers"] = list(message.get("headers", [])) + [(b"set-cookie", cookie.encode("latin-1"))]
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
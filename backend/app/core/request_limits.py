@@ -0,0 +1,54 @@
+"""Request body size limit, enforced before the body is parsed.
+
+Starlette reads a multipart body in full (spooling file parts to disk) before a
+route sees any UploadFile, so a size check in the route comes after the whole
+upload has been received and written. BodySizeLimitMiddleware answers 413 up
+front when Content-Length is over MAX_REQUEST_BODY_MB, and counts the bytes of
+bodies without one (chunked) as they arrive, failing the request as soon as
+they pass the limit.
+"""
+import json
+
+from fastapi import HTTPException, status
+
+MESSAGE = "Request body too large"
+
+
+class BodySizeLimitMiddleware:
+    def __init__(self, app, max_bytes: int):
+        self.app = app
+        self.max_bytes = max_bytes
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or self.max_bytes <= 0:
+            await self.app(scope, receive, send)
+            return
+        length = dict(scope["headers"]).get(b"content-length")
+        if length is not None and length.isdigit() and int(length) > self.max_bytes:
+            await _too_large(send)
+            return
+
+        received = 0
+
+        async def limited_receive():
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_bytes:
+                    # FastAPI re-raises an HTTPException from body parsing, so this becomes the 413
+                    raise HTTPException(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail=MESSAGE)
+            return message
+
+        await self.app(scope, limited_receive, send)
+
+
+async def _too_large(send) -> None:
+    body = json.dumps({"detail": MESSAGE}).encode("utf-8")
+    await send({
+        "type": "http.response.start",
+        "status": status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+        "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode("latin-1")),
+                    (b"connection", b"close")],
+    })
+    await send({"type": "http.response.body", "body": body})
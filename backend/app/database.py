@@ -1,34 +1,54 @@
 """
 Database connection for PostgreSQL (mobile database).
-Reads DATABASE_URL from .env, or builds from DB_HOST/DB_PORT/DB_NAME/DB_USER/DB_PASSWORD.
+The URL comes from settings.DATABASE_URL (DATABASE_URL in .env, or DB_HOST/DB_PORT/DB_NAME/DB_USER/DB_PASSWORD).
+Every engine is built by make_engine, so pool settings live in one place (DB_POOL_* in app.core.config).
 """
-import os
 from datetime import datetime, timezone
+from typing import Optional
+
 from sqlalchemy import Column, Integer, DateTime, ForeignKey, create_engine, text
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, declarative_base
-from dotenv import load_dotenv
 
-load_dotenv()
+from app.core.config import settings
+from app.core.pool_metrics import InstrumentedAsyncQueuePool, InstrumentedQueuePool
+
+DATABASE_URL = settings.DATABASE_URL
+
+
+def engine_options(**overrides) -> dict:
+    """create_engine keyword arguments from settings; `overrides` win (e.g. pool_size for a script)."""
+    options = {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+        "query_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+        "connect_args": {"prepare_threshold": settings.DB_PREPARE_THRESHOLD},
+    }
+    options.update(overrides)
+    return options
 
 
-def _get_database_url() -> str:
-    url = os.getenv("DATABASE_URL")
-    if url:
-        if "psycopg2" in url:
-            url = url.replace("psycopg2", "psycopg", 1)
-        return url
-    host = os.getenv("DB_HOST", "localhost")
-    port = os.getenv("DB_PORT", "5432")
-    name = os.getenv("DB_NAME", "mobile")
-    user = os.getenv("DB_USER", "systemiser")
-    password = os.getenv("DB_PASSWORD", "systemiser")
-    return f"postgresql+psycopg://{user}:{password}@{host}:{port}/{name}"
+def make_engine(url: Optional[str] = None, name: Optional[str] = None, **overrides):
+    """Sync engine with the configured, instrumented pool; `name` labels its pool metrics."""
+    return create_engine(url or DATABASE_URL, poolclass=InstrumentedQueuePool, pool_logging_name=name,
+                         **engine_options(**overrides))
 
 
-DATABASE_URL = _get_database_url()
+def make_async_engine(url: Optional[str] = None, name: Optional[str] = None, **overrides) -> AsyncEngine:
+    """Async (psycopg async driver) engine with the configured, instrumented pool."""
+    return create_async_engine(url or DATABASE_URL, poolclass=InstrumentedAsyncQueuePool, pool_logging_name=name,
+                               **engine_options(**overrides))
 
-engine = create_engine(DATABASE_URL)
+
+engine = make_engine(name="primary")
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# Same database through psycopg's async driver, for async def routes (no threadpool thread held while waiting)
+async_engine = make_async_engine(name="primary_async")
+# No expiry on commit: attribute access after a commit must not trigger implicit (sync) IO
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
 Base = declarative_base()
 
 
@@ -53,6 +73,11 @@ def get_db():
         db.close()
 
 
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
 def check_connection():
     try:
         with engine.connect() as conn:
@@ -0,0 +1 @@
+# Background jobs: durable Postgres-backed queue (enqueue in the request, run in app.jobs.worker)
@@ -0,0 +1,28 @@
+"""Job model: one row per unit of deferred work."""
+from sqlalchemy import BigInteger, Column, DateTime, Index, Integer, String, Text, func
+from sqlalchemy.dialects.postgresql import JSONB
+
+from app.database import Base
+
+
+class Job(Base):
+    __tablename__ = "jobs"
+
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    kind = Column(String(100), nullable=False)  # handler name, e.g. "images.build_variants"
+    payload = Column(JSONB, nullable=False, default=dict)
+    status = Column(String(20), nullable=False, default="queued")  # queued, running, done, dead
+    attempts = Column(Integer, nullable=False, default=0)
+    max_attempts = Column(Integer, nullable=False)
+    run_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())  # not before
+    locked_at = Column(DateTime(timezone=True))  # start of the current / last attempt
+    locked_by = Column(String(100))
+    last_error = Column(Text)
+    created_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    finished_at = Column(DateTime(timezone=True))
+
+
+# Claim query: next due queued jobs; stale running jobs (crashed worker) - see alembic 007_jobs
+Index("ix_jobs_queued_run_at", Job.run_at, Job.id, postgresql_where=Job.status == "queued")
+Index("ix_jobs_running_locked_at", Job.locked_at, postgresql_where=Job.status == "running")
+Index("ix_jobs_finished_at", Job.finished_at, postgresql_where=Job.status == "done")
@@ -0,0 +1,175 @@
+"""Durable job queue on the jobs table.
+
+Routes call enqueue() inside their own transaction, so a job exists exactly when
+the change that needs it is committed. Workers (app.jobs.worker) claim due jobs
+with SELECT ... FOR UPDATE SKIP LOCKED, so any number of them can poll the same
+table without blocking each other or running a job twice. A failed job is
+retried with exponential backoff and moved to status "dead" after max_attempts;
+a job whose worker died is reclaimed once its lock is older than
+JOB_LOCK_TIMEOUT_SECONDS. Handlers must therefore be idempotent.
+"""
+import logging
+import random
+import traceback
+from datetime import timedelta
+from typing import Callable, NamedTuple
+
+from sqlalchemy import and_, delete, func, or_, select, update
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.jobs.models import Job
+
+logger = logging.getLogger(__name__)
+
+QUEUED, RUNNING, DONE, DEAD = "queued", "running", "done", "dead"
+
+# kind -> handler(db, payload); register with @handler(kind)
+_handlers: dict[str, Callable[[Session, dict], None]] = {}
+
+
+class ClaimedJob(NamedTuple):
+    id: int
+    kind: str
+    payload: dict
+    attempts: int
+    max_attempts: int
+
+
+def handler(kind: str):
+    """Register a function(db, payload) to run jobs of `kind`. The runner commits after it returns."""
+    def register(fn):
+        _handlers[kind] = fn
+        return fn
+    return register
+
+
+def enqueue(db: Session, kind: str, payload: dict, delay_seconds: float = 0, max_attempts: int | None = None) -> Job:
+    """Add a job to the caller's transaction; it becomes visible to workers on commit."""
+    job = Job(kind=kind, payload=payload, status=QUEUED, max_attempts=max_attempts or settings.JOB_MAX_ATTEMPTS)
+    if delay_seconds:
+        job.run_at = func.now() + timedelta(seconds=delay_seconds)
+    db.add(job)
+    return job
+
+
+def backoff_seconds(attempts: int) -> float:
+    """Delay before retry number `attempts` (1-based): exponential, capped, with jitter."""
+    delay = min(settings.JOB_BACKOFF_MAX_SECONDS, settings.JOB_BACKOFF_BASE_SECONDS * 2 ** (attempts - 1))
+    return delay * random.uniform(0.5, 1.0)
+
+
+def claim(db: Session, worker_id: str, limit: int) -> list[ClaimedJob]:
+    """Lock up to `limit` due jobs for this worker and commit; returns them oldest first."""
+    stale = func.now() - timedelta(seconds=settings.JOB_LOCK_TIMEOUT_SECONDS)
+    due = (
+        select(Job.id)
+        .where(or_(
+            and_(Job.status == QUEUED, Job.run_at <= func.now()),
+            and_(Job.status == RUNNING, Job.locked_at < stale),
+        ))
+        .order_by(Job.run_at, Job.id)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+    )
+    stmt = (
+        update(Job)
+        .where(Job.id.in_(due.scalar_subquery()))
+        .values(status=RUNNING, locked_at=func.now(), locked_by=worker_id, attempts=Job.attempts + 1)
+        .returning(Job.id, Job.kind, Job.payload, Job.attempts, Job.max_attempts)
+        .execution_options(synchronize_session=False)
+    )
+    rows = db.execute(stmt).all()
+    db.commit()
+    return sorted((ClaimedJob(*row) for row in rows), key=lambda job: job.id)
+
+
+def _finish(db: Session, job_id: int, **values) -> None:
+    db.execute(
+        update(Job).where(Job.id == job_id).values(**values).execution_options(synchronize_session=False)
+    )
+    db.commit()
+
+
+def run(db: Session, job: ClaimedJob) -> bool:
+    """Run one claimed job and record the outcome; True if it succeeded."""
+    fn = _handlers.get(job.kind)
+    if fn is None or job.attempts > job.max_attempts:
+        reason = f"No handler for job kind {job.kind!r}" if fn is None else "Attempts exhausted (worker lost)"
+        logger.error("Job %s dead: %s", job.id, reason)
+        _finish(db, job.id, status=DEAD, finished_at=func.now(), last_error=reason)
+        return False
+    try:
+        fn(db, job.payload)
+        db.commit()
+    except Exception:
+        db.rollback()
+        error = traceback.format_exc(limit=5)
+        if job.attempts >= job.max_attempts:
+            logger.exception("Job %s (%s) failed permanently after %d attempts", job.id, job.kind, job.attempts)
+            _finish(db, job.id, status=DEAD, finished_at=func.now(), last_error=error)
+        else:
+            delay = backoff_seconds(job.attempts)
+            logger.warning("Job %s (%s) failed (attempt %d), retrying in %.0fs", job.id, job.kind, job.attempts, delay)
+            _finish(db, job.id, status=QUEUED, run_at=func.now() + timedelta(seconds=delay), last_error=error)
+        return False
+    _finish(db, job.id, status=DONE, finished_at=func.now())
+    return True
+
+
+def run_once(db: Session, worker_id: str, limit: int = 10) -> int:
+    """Claim and run one batch of due jobs; return how many were claimed (0 = queue idle)."""
+    jobs = claim(db, worker_id, limit)
+    for job in jobs:
+        run(db, job)
+    return len(jobs)
+
+
+def purge_done(db: Session) -> int:
+    """Delete finished jobs older than JOB_RETENTION_HOURS; dead jobs are kept for inspection."""
+    cutoff = func.now() - timedelta(hours=settings.JOB_RETENTION_HOURS)
+    result = db.execute(delete(Job).where(Job.status == DONE, Job.finished_at < cutoff))
+    db.commit()
+    return result.rowcount
+
+
+def stats(db: Session) -> dict:
+    """Queue depth per kind/status and latency of jobs finished in the last hour."""
+    depth = db.execute(
+        select(
+            Job.kind,
+            Job.status,
+            func.count(),
+            func.extract("epoch", func.now() - func.min(Job.created_at)),
+        )
+        .where(Job.status != DONE)
+        .group_by(Job.kind, Job.status)
+    ).all()
+    latency = func.extract("epoch", Job.finished_at - Job.created_at)
+    finished = db.execute(
+        select(
+            Job.kind,
+            func.count(),
+            func.percentile_cont(0.5).within_group(latency),
+            func.percentile_cont(0.95).within_group(latency),
+            func.max(latency),
+        )
+        .where(Job.status == DONE, Job.finished_at > func.now() - timedelta(hours=1))
+        .group_by(Job.kind)
+    ).all()
+    return {
+        "depth": [
+            {"kind": kind, "status": status, "count": count, "oldest_age_seconds": round(float(age), 3)}
+            for kind, status, count, age in depth
+        ],
+        "latency_last_hour": [
+            {
+                "kind": kind,
+                "done": count,
+                "p50_seconds": round(p50, 3),
+                "p95_seconds": round(p95, 3),
+                "max_seconds": round(float(worst), 3),
+            }
+            for kind, count, p50, p95, worst in finished
+        ],
+    }
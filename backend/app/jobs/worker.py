@@ -0,0 +1,83 @@
+"""
+Job worker process: claims due jobs from the jobs table and runs their handlers.
+Run from project root: python -m app.jobs.worker [--batch 10] [--once]
+
+Start as many worker processes as needed (e.g. one per core); they coordinate
+through row locks only. SIGTERM/SIGINT stop the worker after the current job.
+A failing poll (e.g. the database is unreachable) is logged and retried after a
+growing pause instead of ending the process; with --once it is raised.
+"""
+import argparse
+import importlib
+import logging
+import os
+import signal
+import socket
+import time
+
+from app.core.config import settings
+from app.database import SessionLocal
+from app.jobs import queue
+
+logger = logging.getLogger("app.jobs.worker")
+
+# Modules whose @queue.handler functions this worker runs
+HANDLER_MODULES = ["app.vehicles.images"]
+
+PURGE_INTERVAL_SECONDS = 600
+ERROR_BACKOFF_MAX_SECONDS = 60
+
+
+class Worker:
+    def __init__(self, batch: int):
+        self.batch = batch
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}"
+        self.stopping = False
+
+    def stop(self, *_) -> None:
+        logger.info("Worker %s stopping after the current job", self.worker_id)
+        self.stopping = True
+
+    def run(self, once: bool = False) -> None:
+        for module in HANDLER_MODULES:
+            importlib.import_module(module)
+        logger.info("Worker %s started", self.worker_id)
+        last_purge = 0.0
+        failures = 0
+        db = SessionLocal()
+        try:
+            while not self.stopping:
+                try:
+                    claimed = queue.run_once(db, self.worker_id, self.batch)
+                    if time.monotonic() - last_purge > PURGE_INTERVAL_SECONDS:
+                        queue.purge_done(db)
+                        last_purge = time.monotonic()
+                except Exception:
+                    if once:
+                        raise
+                    failures += 1
+                    delay = min(ERROR_BACKOFF_MAX_SECONDS, settings.JOB_POLL_INTERVAL_SECONDS * 2 ** failures)
+                    logger.exception("Worker %s poll failed (%d in a row), retrying in %.0fs",
+                                     self.worker_id, failures, delay)
+                    db.close()  # drop the transaction and a broken connection; the session reconnects on next use
+                    time.sleep(delay)
+                    continue
+                failures = 0
+                if once and not claimed:
+                    break
+                if not claimed:
+                    time.sleep(settings.JOB_POLL_INTERVAL_SECONDS)
+        finally:
+            db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run background jobs")
+    parser.add_argument("--batch", type=int, default=10, help="jobs claimed per poll")
+    parser.add_argument("--once", action="store_true", help="exit when no job is due (tests, cron)")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    worker = Worker(args.batch)
+    signal.signal(signal.SIGTERM, worker.stop)
+    signal.signal(signal.SIGINT, worker.stop)
+    worker.run(once=args.once)
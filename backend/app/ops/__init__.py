@@ -0,0 +1 @@
+# Operational endpoints: cache statistics and other internal diagnostics
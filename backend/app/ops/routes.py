@@ -0,0 +1,42 @@
+"""Internal diagnostics API (not used by the mobile app); platform operators only.
+
+Every account has its own Administrator role, and these endpoints show
+process-wide state (all accounts' jobs, pools, caches), so they require
+users.is_superuser rather than any account role.
+"""
+from fastapi import APIRouter, Depends
+from sqlalchemy.orm import Session
+
+from app.auth.dependencies import superuser_required
+from app.core.pool_metrics import pool_stats
+from app.core.replicas import replicas
+from app.database import async_engine, engine, get_db
+from app.jobs import queue
+from app.vehicles import counts, page_cache, response_cache
+
+router = APIRouter(prefix="/internal", tags=["Internal"], dependencies=[Depends(superuser_required)])
+
+
+@router.get("/cache-stats")
+def cache_stats() -> dict:
+    """Size and hit/miss counters of this worker's in-process caches."""
+    return {
+        "browse_pages": response_cache.stats(),
+        "list_totals": counts.stats(),
+        "share_pages": page_cache.stats(),
+    }
+
+
+@router.get("/jobs")
+def job_stats(db: Session = Depends(get_db)) -> dict:
+    """Background job queue depth (queued/running/dead per kind) and recent latency."""
+    return queue.stats(db)
+
+
+@router.get("/pool")
+def connection_pools() -> dict:
+    """This worker's database connection pools: limits, connections in use, overflow and checkout waits.
+
+    `replicas` also shows each read replica's health, replay lag and last error.
+    """
+    return {"sync": pool_stats(engine.pool), "async": pool_stats(async_engine.pool), "replicas": replicas.stats()}
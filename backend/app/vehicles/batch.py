@@ -0,0 +1,79 @@
+"""Set-based batch update and delete of an account's vehicles (PATCH/DELETE /vehicles/batch).
+
+A batch is one UPDATE (or one DELETE per table) scoped by account_id, whatever
+the number of vehicles, instead of a load-modify-commit round trip each. The
+statements return what the caller needs afterwards: the affected ids and
+whether any of them was an active listing (for cache invalidation), and for
+deletes the image files to release, queued as a single job.
+"""
+from datetime import datetime, timezone
+from typing import Optional
+
+from sqlalchemy import and_, delete, select, update
+from sqlalchemy.orm import Session
+
+from app.vehicles import images as image_variants
+from app.vehicles.models import Vehicle, VehicleImage
+from app.vehicles.schemas import VehicleSelection
+
+
+class EmptyPatch(ValueError):
+    pass
+
+
+def _where(account_id: int, selection: VehicleSelection):
+    clauses = [Vehicle.account_id == account_id]
+    if selection.ids is not None:
+        clauses.append(Vehicle.id.in_(selection.ids))
+    f = selection.filter
+    if f is not None:
+        if f.product:
+            clauses.append(Vehicle.product == f.product)
+        if f.status:
+            clauses.append(Vehicle.status == f.status)
+        if f.posted_before:
+            clauses.append(Vehicle.posting_date < f.posted_before)
+        if f.created_before:
+            clauses.append(Vehicle.created_at < f.created_before)
+    return and_(*clauses)
+
+
+def update_vehicles(db: Session, account_id: int, selection: VehicleSelection, data: dict) -> tuple[list[int], bool]:
+    """Apply `data` (VehicleUpdate fields) to the selected vehicles; return (ids, any active before or after)."""
+    if not data:
+        raise EmptyPatch("Nothing to update")
+    # Old status comes from a locked snapshot of the same rows, so one statement reports both sides
+    before = select(Vehicle.id, Vehicle.status).where(_where(account_id, selection)).with_for_update().subquery()
+    stmt = (
+        update(Vehicle)
+        .where(Vehicle.id == before.c.id)
+        .values(**data, updated_at=datetime.now(timezone.utc))
+        .returning(Vehicle.id, before.c.status, Vehicle.status)
+        .execution_options(synchronize_session=False)
+    )
+    rows = db.execute(stmt).all()
+    active = any("active" in (old, new) for _, old, new in rows)
+    return sorted(r[0] for r in rows), active
+
+
+def delete_vehicles(db: Session, account_id: int, selection: VehicleSelection) -> tuple[list[int], bool]:
+    """Delete the selected vehicles and queue release of their image files; return (ids, any active)."""
+    selected = select(Vehicle.id).where(_where(account_id, selection))
+    image_rows = db.execute(
+        delete(VehicleImage)
+        .where(VehicleImage.vehicle_id.in_(selected))
+        .returning(VehicleImage.image_path, VehicleImage.variants)
+        .execution_options(synchronize_session=False)
+    ).all()
+    rows = db.execute(
+        delete(Vehicle)
+        .where(_where(account_id, selection))
+        .returning(Vehicle.id, Vehicle.status)
+        .execution_options(synchronize_session=False)
+    ).all()
+    # Listings may share files (content-addressed storage); release each path once
+    files: dict[str, Optional[dict]] = {}
+    for path, variants in image_rows:
+        files[path] = files.get(path) or variants
+    image_variants.enqueue_release(db, list(files.items()))
+    return sorted(r[0] for r in rows), any(status == "active" for _, status in rows)
@@ -0,0 +1,71 @@
+"""Listing changes made outside the API processes (background jobs), relayed to their caches.
+
+The browse page and share page caches live in each API worker's memory, so a
+job that changes a listing (image variants becoming ready) cannot drop them
+itself. It calls notify() in its transaction instead; Postgres delivers the
+NOTIFY on commit to every API process, whose listener (started from the app
+lifespan with start()) drops the browse pages and the vehicles' share pages.
+After losing its connection a listener drops everything, since notifications
+sent meanwhile are lost.
+"""
+import asyncio
+import contextlib
+import logging
+from typing import Iterable, Optional
+
+import psycopg
+from sqlalchemy import func, make_url, select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.vehicles import page_cache, response_cache
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = "vehicle_listings_changed"
+RECONNECT_SECONDS = 5.0
+
+_task: Optional[asyncio.Task] = None
+
+
+def notify(db: Session, vehicle_ids: Iterable[int]) -> None:
+    """Tell every API process that these vehicles changed; sent when `db` commits."""
+    ids = sorted(set(vehicle_ids))
+    if ids:
+        db.execute(select(func.pg_notify(CHANNEL, ",".join(map(str, ids)))))
+
+
+def _changed(payload: str) -> None:
+    response_cache.invalidate()
+    page_cache.invalidate(*(int(i) for i in payload.split(",") if i))
+
+
+async def _listen_forever() -> None:
+    conninfo = make_url(settings.DATABASE_URL).set(drivername="postgresql").render_as_string(hide_password=False)
+    while True:
+        try:
+            async with await psycopg.AsyncConnection.connect(conninfo, autocommit=True) as conn:
+                await conn.execute(f"LISTEN {CHANNEL}")
+                async for note in conn.notifies():
+                    _changed(note.payload)
+        except (psycopg.Error, OSError) as e:
+            logger.warning("Listing change listener disconnected (%s); retrying in %gs", e, RECONNECT_SECONDS)
+        response_cache.invalidate()
+        page_cache.clear()
+        await asyncio.sleep(RECONNECT_SECONDS)
+
+
+def start() -> None:
+    global _task
+    if _task is None:
+        _task = asyncio.create_task(_listen_forever())
+
+
+async def stop() -> None:
+    global _task
+    if _task is None:
+        return
+    _task.cancel()
+    with contextlib.suppress(asyncio.CancelledError):
+        await _task
+    _task = None
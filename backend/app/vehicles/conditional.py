@@ -0,0 +1,104 @@
+"""Conditional GET (ETag / Last-Modified) for vehicle detail JSON and the share page.
+
+A listing's version is read with one aggregate query over the vehicle row and its
+image ids, without loading ORM objects, so a revalidation that ends in 304 Not
+Modified costs a single cheap lookup.
+"""
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import NamedTuple, Optional
+
+from fastapi import Request, Response, status
+from sqlalchemy import func, select
+from sqlalchemy.dialects.postgresql import aggregate_order_by
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.vehicles.models import Vehicle, VehicleImage
+
+
+class VehicleVersion(NamedTuple):
+    vehicle_id: int
+    account_id: int
+    status: str
+    updated_at: Optional[datetime]
+    image_ids: tuple
+    # Latest image row change (e.g. variants generated after upload)
+    images_updated_at: Optional[datetime]
+
+    @property
+    def last_modified(self) -> Optional[datetime]:
+        stamps = [t for t in (self.updated_at, self.images_updated_at) if t]
+        return max(stamps) if stamps else None
+
+    def etag(self, representation: str) -> str:
+        """Strong ETag; differs per representation (e.g. "json", "html") of the same version."""
+        stamp = self.updated_at.isoformat() if self.updated_at else ""
+        images_stamp = self.images_updated_at.isoformat() if self.images_updated_at else ""
+        images = ",".join(str(i) for i in self.image_ids)
+        raw = f"{representation}:{self.vehicle_id}:{stamp}:{images}:{images_stamp}"
+        return '"' + hashlib.sha1(raw.encode("utf-8")).hexdigest() + '"'
+
+    @classmethod
+    def of(cls, vehicle: Vehicle) -> "VehicleVersion":
+        """Version of an already-loaded vehicle (with images)."""
+        image_ids = tuple(sorted(img.id for img in vehicle.images))
+        images_updated_at = max((img.updated_at for img in vehicle.images if img.updated_at), default=None)
+        return cls(vehicle.id, vehicle.account_id, vehicle.status, vehicle.updated_at, image_ids, images_updated_at)
+
+
+def get_vehicle_version(db: Session, vehicle_id: int) -> Optional[VehicleVersion]:
+    stmt = (
+        select(
+            Vehicle.account_id,
+            Vehicle.status,
+            Vehicle.updated_at,
+            func.array_remove(func.array_agg(aggregate_order_by(VehicleImage.id, VehicleImage.id)), None),
+            func.max(VehicleImage.updated_at),
+        )
+        .outerjoin(VehicleImage, VehicleImage.vehicle_id == Vehicle.id)
+        .where(Vehicle.id == vehicle_id)
+        .group_by(Vehicle.id)
+    )
+    row = db.execute(stmt).first()
+    if row is None:
+        return None
+    return VehicleVersion(vehicle_id, row[0], row[1], row[2], tuple(row[3] or ()), row[4])
+
+
+def _parse_http_date(value: str) -> Optional[datetime]:
+    try:
+        return parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def is_not_modified(request: Request, etag: str, last_modified: Optional[datetime]) -> bool:
+    """Evaluate If-None-Match (preferred) or If-Modified-Since against the current version."""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        if if_none_match.strip() == "*":
+            return True
+        tags = [t.strip().removeprefix("W/") for t in if_none_match.split(",")]
+        return etag in tags
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and last_modified:
+        since = _parse_http_date(if_modified_since)
+        return since is not None and last_modified.replace(microsecond=0) <= since
+    return False
+
+
+def cache_headers(etag: str, last_modified: Optional[datetime], public: bool) -> dict:
+    if public:
+        cache_control = f"public, max-age={settings.PUBLIC_CACHE_MAX_AGE}, must-revalidate"
+    else:
+        cache_control = "private, no-cache"
+    headers = {"ETag": etag, "Cache-Control": cache_control}
+    if last_modified:
+        headers["Last-Modified"] = format_datetime(last_modified.astimezone(timezone.utc), usegmt=True)
+    return headers
+
+
+def not_modified_response(headers: dict) -> Response:
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
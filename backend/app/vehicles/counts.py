@@ -0,0 +1,56 @@
+"""Cached and estimated totals for vehicle listings.
+
+An exact COUNT over the filtered set is the most expensive query on the browse
+screens, so totals are cached per listing scope for COUNT_CACHE_TTL_SECONDS and
+dropped whenever a vehicle in that scope changes. Scopes are tuples:
+
+    ("browse", product, ...)                 public listing of active vehicles
+    ("account", account_id, product, ...)    a tenant's own listing
+
+When the planner expects at least COUNT_ESTIMATE_THRESHOLD rows the planner's
+estimate is returned instead of counting, and flagged as not exact.
+"""
+from typing import Hashable
+
+from sqlalchemy.orm import Query, Session
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+
+_totals = TTLCache(maxsize=settings.COUNT_CACHE_SIZE, ttl=settings.COUNT_CACHE_TTL_SECONDS)
+
+
+def estimate_rows(db: Session, q: Query) -> int:
+    """Planner row estimate for `q` (EXPLAIN only; the query is not executed)."""
+    # Connect first: until an engine's first connection its dialect assumes backslash escapes and
+    # would render LIKE ... ESCAPE '\\' as a two-character escape string
+    conn = db.connection()
+    compiled = q.statement.compile(dialect=conn.dialect)
+    row = conn.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {compiled}", compiled.params).first()
+    return int(row[0][0]["Plan"]["Plan Rows"])
+
+
+def count_total(db: Session, q: Query, scope: Hashable) -> tuple[int, bool]:
+    """Return (total, exact) for the rows matched by `q`."""
+    cached = _totals.get(scope)
+    if cached is not None:
+        return cached
+    threshold = settings.COUNT_ESTIMATE_THRESHOLD
+    result = None
+    if threshold > 0:
+        estimate = estimate_rows(db, q)
+        if estimate >= threshold:
+            result = (estimate, False)
+    if result is None:
+        result = (q.count(), True)
+    _totals.set(scope, result)
+    return result
+
+
+def invalidate(account_id: int) -> None:
+    """Forget totals that a change to one of `account_id`'s vehicles can affect."""
+    _totals.invalidate(lambda k: k[0] == "browse" or (k[0] == "account" and k[1] == account_id))
+
+
+def stats() -> dict:
+    return _totals.stats()
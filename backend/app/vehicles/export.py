@@ -0,0 +1,95 @@
+"""Streaming export of an account's vehicles (GET /vehicles/export) as NDJSON or CSV.
+
+Vehicles and their images are read with one outer-join query through a
+server-side cursor, EXPORT_YIELD_PER rows at a time, and grouped per vehicle as
+they arrive; output is flushed in ~64 KB chunks. Neither the result set nor the
+response body is ever held in full, so memory does not grow with the inventory.
+
+The response body is produced after the endpoint returns, when the request's
+session is already closed, so the export opens its own session.
+"""
+import csv
+import io
+import itertools
+from typing import Iterator, Optional
+
+from sqlalchemy import select
+
+from app.core.config import settings
+from app.database import SessionLocal
+from app.vehicles.models import Vehicle, VehicleImage
+from app.vehicles.schemas import VehicleImageOut, VehicleOut
+
+FORMATS = {"ndjson": "application/x-ndjson", "csv": "text/csv; charset=utf-8"}
+# Same names as the import columns, so an exported CSV can be imported again
+CSV_COLUMNS = [
+    "id", "name", "description", "product", "amount", "mileage", "location", "posting_date",
+    "model_year", "status", "created_at", "updated_at", "images",
+]
+CHUNK_SIZE = 64 * 1024
+
+_VEHICLE_COLUMNS = [c for c in Vehicle.__table__.columns if c.key != "search_vector"]
+
+
+def _statement(account_id: int, product: Optional[str], status: Optional[str]):
+    stmt = (
+        select(*_VEHICLE_COLUMNS, VehicleImage.id.label("image_id"), VehicleImage.image_path, VehicleImage.variants)
+        .outerjoin(VehicleImage, VehicleImage.vehicle_id == Vehicle.id)
+        .where(Vehicle.account_id == account_id)
+        # Newest first, as GET /vehicles; served by the ix_vehicles_account_* indexes
+        .order_by(Vehicle.created_at.desc(), Vehicle.id.desc(), VehicleImage.id)
+    )
+    if product:
+        stmt = stmt.where(Vehicle.product == product)
+    if status:
+        stmt = stmt.where(Vehicle.status == status)
+    return stmt.execution_options(yield_per=settings.EXPORT_YIELD_PER)
+
+
+def _vehicles(rows) -> Iterator[VehicleOut]:
+    for _, group in itertools.groupby(rows, key=lambda r: r.id):
+        group = list(group)
+        first = group[0]
+        images = [
+            VehicleImageOut(id=r.image_id, vehicle_id=first.id, image_path=r.image_path, variants=r.variants or {})
+            for r in group
+            if r.image_id is not None
+        ]
+        yield VehicleOut(**{c.key: getattr(first, c.key) for c in _VEHICLE_COLUMNS}, images=images)
+
+
+def _ndjson_lines(vehicles: Iterator[VehicleOut]) -> Iterator[str]:
+    for v in vehicles:
+        yield v.model_dump_json() + "\n"
+
+
+def _csv_lines(vehicles: Iterator[VehicleOut]) -> Iterator[str]:
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    writer.writerow(CSV_COLUMNS)
+    for v in vehicles:
+        row = v.model_dump(include=set(CSV_COLUMNS) - {"images"}, mode="json")
+        row["images"] = " ".join(img.image_path for img in v.images)
+        writer.writerow([row.get(c) for c in CSV_COLUMNS])
+        yield buf.getvalue()
+        buf.seek(0)
+        buf.truncate()
+
+
+def stream(account_id: int, fmt: str, product: Optional[str] = None, status: Optional[str] = None) -> Iterator[bytes]:
+    """Response body chunks for the export; runs (and closes) its own session."""
+    db = SessionLocal()
+    try:
+        rows = db.execute(_statement(account_id, product, status))
+        lines = (_csv_lines if fmt == "csv" else _ndjson_lines)(_vehicles(rows))
+        chunk, size = [], 0
+        for line in lines:
+            chunk.append(line)
+            size += len(line)
+            if size >= CHUNK_SIZE:
+                yield "".join(chunk).encode("utf-8")
+                chunk, size = [], 0
+        if chunk:
+            yield "".join(chunk).encode("utf-8")
+    finally:
+        db.close()
@@ -0,0 +1,80 @@
+"""Facet counts (per product, price band and model-year band) for browse listings.
+
+Each facet is counted with every filter except its own: with product=car
+selected, the product facet still shows how many bikes and EVs the other
+filters leave, so the chips say what choosing them would give. All three facets
+and the listing total come from one GROUPING SETS query with a FILTER (WHERE ...)
+aggregate per facet, so the filter UI gets every count in a single round-trip
+and the browse endpoint needs no separate COUNT.
+"""
+from decimal import Decimal
+
+from sqlalchemy import and_, case, func, select, true
+from sqlalchemy.orm import Query, Session
+
+from app.vehicles.models import Vehicle
+from app.vehicles.schemas import FacetBucket, VehicleFacets
+
+# Price band boundaries (INR); bands are [lower, upper), the last one is open-ended
+PRICE_BOUNDS = [Decimal(b) for b in (100000, 250000, 500000, 1000000, 2500000)]
+YEAR_BUCKET_SIZE = 5
+FACETS = ("product", "price", "model_year")
+
+
+def _price_band():
+    return case(
+        *[(Vehicle.amount < bound, i) for i, bound in enumerate(PRICE_BOUNDS)],
+        else_=len(PRICE_BOUNDS),
+    )
+
+
+def _price_bucket(band: int, count: int) -> FacetBucket:
+    lower = PRICE_BOUNDS[band - 1] if band > 0 else Decimal(0)
+    upper = PRICE_BOUNDS[band] if band < len(PRICE_BOUNDS) else None
+    return FacetBucket(min=lower, max=upper, count=count)
+
+
+def compute_facets(db: Session, query: Query, filters: dict[str, list]) -> tuple[VehicleFacets, int]:
+    """Facet counts and the listing total.
+
+    `query` holds the filters shared by every facet (no ordering or paging);
+    `filters` maps a name in FACETS to the conditions on that facet's own column
+    (product, amount or model-year bounds). The listing is `query` with all of
+    them applied.
+    """
+    matched = {name: and_(true(), *filters.get(name, ())).label(f"in_{name}") for name in FACETS}
+    rows = query.with_entities(
+        Vehicle.product.label("product"),
+        _price_band().label("price_band"),
+        ((Vehicle.model_year // YEAR_BUCKET_SIZE) * YEAR_BUCKET_SIZE).label("year_band"),
+        *matched.values(),
+    ).subquery()
+
+    def count_matching(*names: str):
+        return func.count().filter(and_(*(rows.c[f"in_{name}"] for name in names)))
+
+    stmt = select(
+        rows.c.product,
+        rows.c.price_band,
+        rows.c.year_band,
+        func.grouping(rows.c.product),
+        func.grouping(rows.c.price_band),
+        count_matching("price", "model_year"),
+        count_matching("product", "model_year"),
+        count_matching("product", "price"),
+        count_matching(*FACETS),
+    ).group_by(func.grouping_sets(rows.c.product, rows.c.price_band, rows.c.year_band))
+    facets, total = VehicleFacets(), 0
+    for prod, band, year_start, g_product, g_price, n_product, n_price, n_year, n_all in db.execute(stmt).all():
+        if not g_product:
+            total += n_all  # the product sets partition the rows, so these add up to the listing total
+            if n_product:
+                facets.product[prod] = n_product
+        elif not g_price:
+            if n_price:
+                facets.price.append(_price_bucket(band, n_price))
+        elif n_year:
+            facets.model_year.append(FacetBucket(min=year_start, max=year_start + YEAR_BUCKET_SIZE, count=n_year))
+    facets.price.sort(key=lambda b: b.min)
+    facets.model_year.sort(key=lambda b: b.min)
+    return facets, total
@@ -0,0 +1,172 @@
+"""Resized, re-encoded variants of uploaded vehicle images.
+
+Uploading routes enqueue an "images.build_variants" job (app.jobs) in the same
+transaction as the new VehicleImage rows; a worker then writes VARIANTS next to
+the original (vehicles/<name>_<variant>.<ext>) and records their paths in
+VehicleImage.variants, then tells the API processes to drop their cached pages
+of the vehicles (app.vehicles.cache_events). Until that finishes, or when the original cannot be
+decoded, clients fall back to image_path. Variants of a content-addressed
+original are shared by every image row pointing at it.
+
+Deleting routes enqueue "images.release_files" for the files of removed rows,
+so unlinking (and the reference check) happens after the delete is committed,
+outside the request.
+"""
+import logging
+import os
+import time
+import uuid
+from pathlib import Path
+from typing import NamedTuple, Optional
+
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.jobs import queue
+from app.vehicles import cache_events
+from app.vehicles.models import VehicleImage
+
+try:
+    from PIL import Image, ImageOps
+except ImportError:  # optional: without Pillow only the originals are served
+    Image = ImageOps = None
+
+logger = logging.getLogger(__name__)
+
+
+class Variant(NamedTuple):
+    max_side: int
+    format: str  # Pillow format name
+    ext: str
+    quality: int
+
+
+# thumb: list/browse cards; detail: share page carousel and the app's detail screen
+VARIANTS = {
+    "detail": Variant(1280, "JPEG", "jpg", 82),
+    "detail_webp": Variant(1280, "WEBP", "webp", 78),
+    "thumb": Variant(400, "JPEG", "jpg", 78),
+    "thumb_webp": Variant(400, "WEBP", "webp", 72),
+}
+
+
+def variant_path(image_path: str, name: str) -> str:
+    stem = image_path.rsplit(".", 1)[0]
+    return f"{stem}_{name}.{VARIANTS[name].ext}"
+
+
+def variant_source_stem(path: str) -> Optional[str]:
+    """For a variant file path, the original's path without extension; None if `path` is not a variant."""
+    stem, _, ext = path.rpartition(".")
+    for name, spec in VARIANTS.items():
+        if ext == spec.ext and stem.endswith(f"_{name}"):
+            return stem[: -len(name) - 1]
+    return None
+
+
+def build_variants(image_path: str) -> dict:
+    """Write every variant of the stored file `image_path`; return {variant: relative path}."""
+    root = Path(settings.STORAGE_DIR)
+    paths = {name: variant_path(image_path, name) for name in VARIANTS}
+    if all((root / rel).exists() for rel in paths.values()):
+        return paths  # built for an earlier upload of the same file
+    largest = max(v.max_side for v in VARIANTS.values())
+    with Image.open(root / image_path) as original:
+        # Let the JPEG decoder downscale while decoding instead of inflating the full image
+        original.draft("RGB", (largest, largest))
+        source = ImageOps.exif_transpose(original)
+        if source.mode not in ("RGB", "L"):
+            source = source.convert("RGB")
+        resized = {}
+        # Largest first, so each smaller size is resampled from the previous one
+        for name, spec in sorted(VARIANTS.items(), key=lambda item: -item[1].max_side):
+            if spec.max_side not in resized:
+                image = source.copy()
+                image.thumbnail((spec.max_side, spec.max_side), Image.Resampling.LANCZOS)  # never upscales
+                resized[spec.max_side] = source = image
+            rel = paths[name]
+            tmp = root / f"{rel}.{uuid.uuid4().hex}.tmp"  # unique: another upload of the same file may be writing too
+            resized[spec.max_side].save(tmp, spec.format, quality=spec.quality)
+            os.replace(tmp, root / rel)
+    return paths
+
+
+def delete_files(image_path: str, variants: Optional[dict]) -> None:
+    """Unlink an image's original and its variants from storage (missing files are ignored)."""
+    root = Path(settings.STORAGE_DIR)
+    for rel in [image_path, *(variants or {}).values()]:
+        (root / rel).unlink(missing_ok=True)
+
+
+def _recently_stored(image_path: str) -> bool:
+    try:
+        mtime = (Path(settings.STORAGE_DIR) / image_path).stat().st_mtime
+    except FileNotFoundError:
+        return False
+    return mtime > time.time() - settings.STORAGE_GRACE_MINUTES * 60
+
+
+def release(db: Session, removed: list[tuple[str, Optional[dict]]]) -> None:
+    """Delete the files of removed images (image_path, variants) that no image row references any more.
+
+    Call after the rows are deleted and committed; one query covers all paths.
+    A file stored or re-uploaded within STORAGE_GRACE_MINUTES is kept: an upload
+    of the same bytes only refreshes its mtime and has no row until it commits.
+    scripts.gc_storage collects it later if it stays unreferenced.
+    """
+    if not removed:
+        return
+    paths = {path for path, _ in removed}
+    still_used = {
+        path for (path,) in db.query(VehicleImage.image_path).filter(VehicleImage.image_path.in_(paths)).distinct()
+    }
+    for path, variants in removed:
+        if path in still_used:
+            continue
+        if _recently_stored(path):
+            logger.info("Keeping %s: stored within the grace period; left to gc_storage", path)
+            continue
+        delete_files(path, variants)
+
+
+def enqueue_variants(db: Session, image_paths: list[str]) -> None:
+    """Queue variant generation for newly added images (commit with the image rows)."""
+    if image_paths:
+        queue.enqueue(db, "images.build_variants", {"paths": sorted(set(image_paths))})
+
+
+def enqueue_release(db: Session, removed: list[tuple[str, Optional[dict]]]) -> None:
+    """Queue deletion of the files of removed images (commit with the row deletes)."""
+    if removed:
+        queue.enqueue(db, "images.release_files", {"files": [[path, variants] for path, variants in removed]})
+
+
+@queue.handler("images.build_variants")
+def _build_variants_job(db: Session, payload: dict) -> None:
+    if Image is None:
+        logger.warning("Pillow is not installed; skipping variants for %d images", len(payload["paths"]))
+        return
+    for image_path in payload["paths"]:
+        try:
+            paths = build_variants(image_path)
+        except (OSError, Image.DecompressionBombError) as e:  # UnidentifiedImageError is an OSError
+            # Uploads are only checked by extension; one bad file must not hold up the others
+            logger.warning("Cannot build variants of %s: %s", image_path, e)
+            paths = {}
+        vehicle_ids = db.execute(
+            update(VehicleImage)
+            .where(VehicleImage.image_path == image_path, VehicleImage.variants.is_(None))
+            .values(variants=paths)
+            .returning(VehicleImage.vehicle_id)
+            .execution_options(synchronize_session=False)
+        ).scalars().all()
+        cache_events.notify(db, vehicle_ids)
+        db.commit()
+        if not vehicle_ids and paths:  # image removed while its variants were being built
+            release(db, [(image_path, paths)])
+
+
+@queue.handler("images.release_files")
+def _release_files_job(db: Session, payload: dict) -> None:
+    release(db, [(path, variants) for path, variants in payload["files"]])
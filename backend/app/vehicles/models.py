@@ -1,7 +1,8 @@
 """Vehicle and VehicleImage models."""
-from datetime import date, datetime
-from sqlalchemy import Column, Integer, String, Text, Numeric, Date, ForeignKey
-from sqlalchemy.orm import relationship
+from datetime import date, datetime, timezone
+from sqlalchemy import Column, DateTime, Integer, String, Text, Numeric, Date, ForeignKey, Index
+from sqlalchemy.dialects.postgresql import JSONB, TSVECTOR
+from sqlalchemy.orm import relationship, deferred, query_expression
 
 from app.database import Base, PKMixin, TimestampMixin
 
@@ -19,6 +20,12 @@ class Vehicle(PKMixin, TimestampMixin, Base):
     posting_date = Column(Date)
     model_year = Column(Integer, nullable=False)
     status = Column(String(20), nullable=False, default="active")  # active, sold, inactive
+    # NOT NULL (alembic 008), unlike TimestampMixin's: keyset pages on it need no IS NULL branch
+    created_at = Column(DateTime(timezone=True), nullable=False, default=lambda: datetime.now(timezone.utc))
+    # Weighted name/location/description document, maintained by a DB trigger (alembic 004_vehicle_search)
+    search_vector = deferred(Column(TSVECTOR))
+    # Populated by search queries (ts_rank_cd of search_vector against the query)
+    search_rank = query_expression()
 
     images = relationship("VehicleImage", back_populates="vehicle", cascade="all, delete-orphan")
 
@@ -28,5 +35,25 @@ class VehicleImage(PKMixin, TimestampMixin, Base):
 
     vehicle_id = Column(Integer, ForeignKey("vehicles.id", ondelete="CASCADE"), nullable=False)
     image_path = Column(String(500), nullable=False)
+    # Resized/re-encoded copies, {variant name: storage path}; filled in after upload (app.vehicles.images)
+    variants = Column(JSONB)
 
     vehicle = relationship("Vehicle", back_populates="images")
+
+
+# Composite / partial indexes matching the list queries (see alembic 003_vehicle_query_indexes).
+_active = Vehicle.status == "active"
+Index("ix_vehicles_active_created", Vehicle.created_at.desc(), Vehicle.id.desc(), postgresql_where=_active)
+Index("ix_vehicles_active_product_created", Vehicle.product, Vehicle.created_at.desc(), Vehicle.id.desc(), postgresql_where=_active)
+Index("ix_vehicles_active_amount", Vehicle.amount, Vehicle.id, postgresql_where=_active)
+Index("ix_vehicles_active_model_year", Vehicle.model_year, Vehicle.id, postgresql_where=_active)
+Index("ix_vehicles_active_mileage", Vehicle.mileage, Vehicle.id, postgresql_where=_active)
+Index("ix_vehicles_account_created", Vehicle.account_id, Vehicle.created_at.desc(), Vehicle.id.desc())
+Index("ix_vehicles_account_product_created", Vehicle.account_id, Vehicle.product, Vehicle.created_at.desc(), Vehicle.id.desc())
+Index("ix_vehicles_account_status_created", Vehicle.account_id, Vehicle.status, Vehicle.created_at.desc(), Vehicle.id.desc())
+
+# Shared-file reference checks on image delete (see alembic 006_vehicle_image_path_index).
+Index("ix_vehicle_images_image_path", VehicleImage.image_path)
+
+# Full-text search (see alembic 004_vehicle_search).
+Index("ix_vehicles_search_vector", Vehicle.search_vector, postgresql_using="gin")
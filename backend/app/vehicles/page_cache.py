@@ -0,0 +1,68 @@
+"""Cache of rendered /v/{vehicle_id} share pages.
+
+A listing shared on WhatsApp is opened by many people within minutes, so the
+rendered HTML and a gzip-compressed copy are kept per (vehicle_id, HTML ETag,
+base URL). The ETag changes with every edit or image change, so a stale page is
+never served even by a worker that missed the invalidation; invalidate() only
+frees the memory early.
+"""
+import gzip
+from typing import NamedTuple, Optional
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+
+_pages = TTLCache(maxsize=settings.SHARE_PAGE_CACHE_SIZE, ttl=settings.SHARE_PAGE_CACHE_TTL_SECONDS)
+
+
+class RenderedPage(NamedTuple):
+    html: bytes
+    gzipped: bytes
+
+
+def enabled() -> bool:
+    return settings.SHARE_PAGE_CACHE_TTL_SECONDS > 0
+
+
+def render(html: str) -> RenderedPage:
+    body = html.encode("utf-8")
+    return RenderedPage(body, gzip.compress(body, compresslevel=9, mtime=0))
+
+
+def get(vehicle_id: int, etag: str, base_url: str) -> Optional[RenderedPage]:
+    return _pages.get((vehicle_id, etag, base_url))
+
+
+def put(vehicle_id: int, etag: str, base_url: str, page: RenderedPage) -> None:
+    _pages.set((vehicle_id, etag, base_url), page)
+
+
+def invalidate(*vehicle_ids: int) -> None:
+    ids = set(vehicle_ids)
+    _pages.invalidate(lambda key: key[0] in ids)
+
+
+def clear() -> None:
+    _pages.clear()
+
+
+def encoded_etag(etag: str, gzip: bool) -> str:
+    """ETag of the gzip body: a strong validator must differ between the encodings of a page."""
+    return etag[:-1] + '-gz"' if gzip else etag
+
+
+def accepts_gzip(accept_encoding: Optional[str]) -> bool:
+    """True if the Accept-Encoding header allows gzip (a q=0 entry refuses it)."""
+    for part in (accept_encoding or "").lower().split(","):
+        coding, _, params = part.strip().partition(";")
+        if coding.strip() in ("gzip", "*"):
+            q = params.strip().removeprefix("q=")
+            try:
+                return float(q) > 0 if q else True
+            except ValueError:
+                return True
+    return False
+
+
+def stats() -> dict:
+    return _pages.stats()
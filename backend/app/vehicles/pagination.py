@@ -0,0 +1,141 @@
+"""Keyset (cursor) pagination for vehicle listings.
+
+A cursor is an opaque, URL-safe token holding the sort name and the sort key
+(value, id) of the last row on a page; relevance cursors also hold a hash of
+the search text, since ranks only mean something for that query. The next page is fetched with a range
+predicate on that key instead of OFFSET, so deep pages cost the same as the
+first one.
+"""
+import base64
+import hashlib
+import json
+from datetime import datetime
+from decimal import Decimal
+
+from sqlalchemy import and_, tuple_
+
+from app.vehicles.models import Vehicle
+
+# sort name -> (column, descending). Vehicle.id is always the tie-breaker.
+# "relevance" (search results only) orders by the search rank, highest first.
+RELEVANCE = "relevance"
+SORTS = {
+    "newest": (Vehicle.created_at, True),
+    "oldest": (Vehicle.created_at, False),
+    "price_asc": (Vehicle.amount, False),
+    "price_desc": (Vehicle.amount, True),
+    "year_desc": (Vehicle.model_year, True),
+    "year_asc": (Vehicle.model_year, False),
+    "mileage_asc": (Vehicle.mileage, False),
+}
+DEFAULT_SORT = "newest"
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def resolve_sort(sort: str | None, searching: bool = False) -> str:
+    name = sort or (RELEVANCE if searching else DEFAULT_SORT)
+    if name == RELEVANCE and searching:
+        return name
+    if name not in SORTS:
+        raise ValueError(f"Invalid sort. Allowed: {', '.join(SORTS)}" + (f", {RELEVANCE}" if searching else ""))
+    return name
+
+
+def _sort_key(sort: str, rank=None):
+    """(expression, descending, Vehicle attribute holding the loaded value)."""
+    if sort == RELEVANCE:
+        if rank is None:
+            raise InvalidCursor("Relevance sort requires a search query")
+        return rank, True, "search_rank"
+    col, desc = SORTS[sort]
+    return col, desc, col.key
+
+
+def order_by(sort: str, rank=None) -> list:
+    col, desc, _ = _sort_key(sort, rank)
+    if desc:
+        return [col.desc(), Vehicle.id.desc()]
+    return [col.asc(), Vehicle.id.asc()]
+
+
+def _dump_value(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    return value
+
+
+def _load_value(sort: str, raw):
+    if raw is None:
+        return None
+    if sort == RELEVANCE:
+        return float(raw)
+    python_type = SORTS[sort][0].type.python_type
+    if python_type is datetime:
+        return datetime.fromisoformat(raw)
+    return python_type(raw)
+
+
+def _search_hash(search_text: str | None) -> str:
+    return hashlib.sha256((search_text or "").encode("utf-8")).hexdigest()[:16]
+
+
+def encode_cursor(sort: str, vehicle: Vehicle, search_text: str | None = None) -> str:
+    attr = "search_rank" if sort == RELEVANCE else SORTS[sort][0].key
+    data = {"s": sort, "k": _dump_value(getattr(vehicle, attr)), "id": vehicle.id}
+    if sort == RELEVANCE:
+        data["q"] = _search_hash(search_text)
+    raw = json.dumps(data, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, search_text: str | None = None) -> tuple[str, object, int]:
+    """Return (sort, key value, id) from a cursor produced by encode_cursor.
+
+    A relevance cursor is only valid with the search text it was made for.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        data = json.loads(raw)
+        sort = data["s"]
+        if sort != RELEVANCE and sort not in SORTS:
+            raise KeyError(sort)
+        decoded = sort, _load_value(sort, data["k"]), int(data["id"])
+        query_hash = data.get("q")
+    except Exception:
+        raise InvalidCursor("Invalid cursor")
+    if sort == RELEVANCE and (not search_text or query_hash != _search_hash(search_text)):
+        raise InvalidCursor("Cursor does not match the search query")
+    return decoded
+
+
+def after_cursor(sort: str, value, last_id: int, rank=None):
+    """WHERE clause selecting the rows after (value, last_id) in `sort` order, within its NULL/non-NULL section.
+
+    Postgres sorts NULLs last for ASC and first for DESC. Each clause is a plain
+    index range, never ORed with the other section (which would make Postgres
+    walk the index from the start and filter); rows of the following section
+    come from next_section().
+    """
+    col, desc, _ = _sort_key(sort, rank)
+    if value is None:
+        return and_(col.is_(None), Vehicle.id < last_id if desc else Vehicle.id > last_id)
+    if desc:
+        return tuple_(col, Vehicle.id) < tuple_(value, last_id)
+    return tuple_(col, Vehicle.id) > tuple_(value, last_id)
+
+
+def next_section(sort: str, value, rank=None):
+    """WHERE clause for the section following the cursor's (non-NULL values after NULLs for DESC, NULLs after
+    non-NULL values for ASC); None when there is none. Used to fill a page that after_cursor() left short.
+    """
+    col, desc, _ = _sort_key(sort, rank)
+    if not getattr(col, "nullable", False):
+        return None
+    if desc:
+        return col.isnot(None) if value is None else None
+    return col.is_(None) if value is not None else None
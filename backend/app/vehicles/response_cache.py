@@ -0,0 +1,33 @@
+"""Cache of serialized public browse pages.
+
+Guest traffic hits the first few pages of /vehicles/browse (per product) over and
+over, so their JSON bodies are kept in a bounded LRU with a short TTL. Any write
+that can change an active listing drops the whole cache; the TTL bounds how long
+other workers may keep serving a page this worker has invalidated.
+"""
+from typing import Hashable, Optional
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+
+_pages = TTLCache(maxsize=settings.BROWSE_CACHE_SIZE, ttl=settings.BROWSE_CACHE_TTL_SECONDS)
+
+
+def cacheable(page: int, cursor: Optional[str]) -> bool:
+    return settings.BROWSE_CACHE_TTL_SECONDS > 0 and not cursor and page <= settings.BROWSE_CACHE_MAX_PAGE
+
+
+def get(key: Hashable) -> Optional[bytes]:
+    return _pages.get(key)
+
+
+def put(key: Hashable, body: bytes) -> None:
+    _pages.set(key, body)
+
+
+def invalidate() -> None:
+    _pages.clear()
+
+
+def stats() -> dict:
+    return _pages.stats()
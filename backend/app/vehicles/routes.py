@@ -1,55 +1,63 @@
 """Vehicle CRUD API with multi-tenant and image upload."""
-import os
-import uuid
-from pathlib import Path
+import logging
+import math
+import time
+from datetime import datetime, timezone
+from decimal import Decimal
 
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Form
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status, UploadFile, File, Form
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, selectinload, with_expression
 
-from app.database import get_db
-from app.auth.dependencies import get_current_user
+from app.database import get_async_db, get_db
+from app.auth.dependencies import get_current_user, get_current_user_async
 from app.auth.models import User
 from app.core.config import settings
+from app.core.query_stats import query_budget
+from app.core.replicas import get_read_db
 from app.vehicles.models import Vehicle, VehicleImage
+from app.vehicles import batch, bulk_import, counts, export, images as image_variants, page_cache, pagination, response_cache, search, storage
+from app.vehicles.conditional import (
+    VehicleVersion,
+    cache_headers,
+    get_vehicle_version,
+    is_not_modified,
+    not_modified_response,
+)
+from app.vehicles.facets import compute_facets
+from app.vehicles.service import get_vehicle_with_images
 from app.vehicles.schemas import (
     VehicleCreate,
     VehicleUpdate,
     VehicleOut,
     VehicleListOut,
     VehicleImageOut,
+    VehicleImportOut,
+    VehicleBatchUpdate,
+    VehicleBatchOut,
+    VehicleSelection,
     ImageIdsToRemove,
 )
 
-router = APIRouter(prefix="/vehicles", tags=["Vehicles"])
-
-ALLOWED_EXTENSIONS = {"jpeg", "jpg", "png", "webp"}
-MAX_FILE_SIZE = 5 * 1024 * 1024  # 5MB
+logger = logging.getLogger(__name__)
 
-
-def _ensure_upload_dir() -> Path:
-    base = Path(settings.STORAGE_DIR) / "vehicles"
-    base.mkdir(parents=True, exist_ok=True)
-    return base
+router = APIRouter(prefix="/vehicles", tags=["Vehicles"])
 
 
-def _save_image(file: UploadFile) -> str:
-    ext = file.filename.split(".")[-1].lower() if file.filename else "jpg"
-    if ext not in ALLOWED_EXTENSIONS:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Invalid image type. Allowed: {', '.join(ALLOWED_EXTENSIONS)}",
-        )
-    content = file.file.read()
-    if len(content) > MAX_FILE_SIZE:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Image too large. Max 5MB.",
-        )
-    base = _ensure_upload_dir()
-    name = f"{uuid.uuid4().hex}.{ext}"
-    path = base / name
-    path.write_bytes(content)
-    return f"vehicles/{name}"
+def _save_images(files: list[UploadFile]) -> list[str]:
+    """Store the uploaded images in parallel; return their storage paths in upload order."""
+    files = [f for f in files if f.filename]
+    start = time.perf_counter()
+    try:
+        # Check every file type before writing anything
+        uploads = [(f.file, storage.extension(f.filename), f.size) for f in files]
+        paths = storage.save_all(uploads)
+    except storage.UploadRejected as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    if paths:
+        logger.info("Saved %d images in %.1f ms", len(paths), (time.perf_counter() - start) * 1000)
+    return paths
 
 
 def _vehicle_to_out(v: Vehicle) -> VehicleOut:
@@ -65,20 +73,115 @@ def _vehicle_to_out(v: Vehicle) -> VehicleOut:
         posting_date=v.posting_date,
         model_year=v.model_year,
         status=v.status,
-        images=[VehicleImageOut(id=img.id, vehicle_id=img.vehicle_id, image_path=img.image_path) for img in v.images],
+        images=[
+            VehicleImageOut(id=img.id, vehicle_id=img.vehicle_id, image_path=img.image_path, variants=img.variants or {})
+            for img in v.images
+        ],
         created_at=v.created_at,
         updated_at=v.updated_at,
     )
 
 
+def _listings_changed(account_id: int, active: bool, *vehicle_ids: int) -> None:
+    """Drop cached totals for the account, cached browse pages if an active listing
+    changed, and the vehicles' rendered share pages."""
+    counts.invalidate(account_id)
+    if active:
+        response_cache.invalidate()
+    if vehicle_ids:
+        page_cache.invalidate(*vehicle_ids)
+
+
+def _clamp_per_page(per_page: int) -> int:
+    return max(1, min(per_page, settings.MAX_PAGE_SIZE))
+
+
+def _page_out(
+    db: Session,
+    query,
+    count_scope: tuple,
+    page: int,
+    per_page: int,
+    sort: str | None,
+    cursor: str | None,
+    search_text: str | None = None,
+    with_facets: bool = False,
+    facet_filters: dict[str, list] | None = None,
+) -> VehicleListOut:
+    """Count and fetch one page of `query`, by cursor when given, else by page number.
+
+    With `search_text`, results are limited to full-text matches and default to
+    relevance order. `facet_filters` are further conditions on the faceted columns
+    (see compute_facets); the listing is `query` with all of them applied, and
+    `count_scope` must identify every filter. With `with_facets`, facet counts
+    are returned and also supply the exact total.
+    """
+    per_page = _clamp_per_page(per_page)
+    page = max(1, page)
+    try:
+        if cursor:
+            sort_name, value, last_id = pagination.decode_cursor(cursor, search_text)
+            if sort and sort != sort_name:
+                raise ValueError("Cursor does not match sort")
+        else:
+            sort_name = pagination.resolve_sort(sort, searching=bool(search_text))
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    rank = None
+    if search_text:
+        query, rank = search.apply_search(query, search_text)
+    facet_filters = facet_filters or {}
+    facet_counts = None
+    if with_facets:
+        facet_counts, total = compute_facets(db, query, facet_filters)
+        total_exact = True
+    query = query.filter(*(cond for conds in facet_filters.values() for cond in conds))
+    if not with_facets:
+        total, total_exact = counts.count_total(db, query, count_scope)
+    ordering = pagination.order_by(sort_name, rank)
+    query = query.order_by(*ordering)
+    if cursor:
+        after = query.filter(pagination.after_cursor(sort_name, value, last_id, rank)).limit(per_page + 1)
+        rest = pagination.next_section(sort_name, value, rank)
+        if rest is None:
+            query = after
+        else:
+            # Nullable sort key: the page may run on into the NULLs (or, for DESC, out of them). Each
+            # leg is an index range; the outer sort only merges their 2 * (per_page + 1) rows.
+            query = after.union_all(query.filter(rest).limit(per_page + 1)).order_by(*ordering)
+    else:
+        query = query.offset((page - 1) * per_page)
+    if rank is not None:
+        query = query.options(with_expression(Vehicle.search_rank, rank))
+    items = query.options(selectinload(Vehicle.images)).limit(per_page + 1).all()
+    next_cursor = None
+    if len(items) > per_page:
+        items = items[:per_page]
+        next_cursor = pagination.encode_cursor(sort_name, items[-1], search_text)
+    return VehicleListOut(
+        total=total,
+        total_exact=total_exact,
+        page=page,
+        per_page=per_page,
+        items=[_vehicle_to_out(v) for v in items],
+        next_cursor=next_cursor,
+        facets=facet_counts,
+    )
+
+
+def _escape_like(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
 def _get_vehicle_or_404(db: Session, vehicle_id: int, account_id: int) -> Vehicle:
-    v = db.get(Vehicle, vehicle_id)
+    v = get_vehicle_with_images(db, vehicle_id)
     if not v or v.account_id != account_id:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Vehicle not found")
     return v
 
 
 @router.post("", status_code=status.HTTP_201_CREATED)
+@query_budget(6)
 def create_vehicle(
     name: str = Form(...),
     description: str | None = Form(None),
@@ -111,10 +214,11 @@ def create_vehicle(
         posting_date=posting_d,
         model_year=model_year,
     )
+    account_id = user.account_id
     vehicle = Vehicle(
         name=payload.name,
         description=payload.description,
-        account_id=user.account_id,
+        account_id=account_id,
         product=payload.product,
         amount=payload.amount,
         mileage=payload.mileage,
@@ -125,85 +229,256 @@ def create_vehicle(
     )
     db.add(vehicle)
     db.flush()
-    for img in (images or []):
-        if img.filename:
-            path = _save_image(img)
-            db.add(VehicleImage(vehicle_id=vehicle.id, image_path=path))
+    vehicle_id = vehicle.id
+    paths = _save_images(images or [])
+    for path in paths:
+        db.add(VehicleImage(vehicle_id=vehicle_id, image_path=path))
+    image_variants.enqueue_variants(db, paths)
+    db.commit()
+    _listings_changed(account_id, active=True)
+    return _vehicle_to_out(get_vehicle_with_images(db, vehicle_id))
+
+
+@router.post("/import", response_model=VehicleImportOut)
+# Auth lookups plus one INSERT per full batch
+@query_budget(3 + math.ceil(settings.IMPORT_MAX_ROWS / settings.IMPORT_BATCH_SIZE))
+def import_vehicles(
+    file: UploadFile = File(...),
+    file_format: str | None = Query(None, alias="format", description="csv or ndjson; default from the file name or content type"),
+    user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    """Create many vehicles (no images) from a CSV or NDJSON file; columns/keys as in POST /vehicles.
+
+    Valid rows are created as active listings; invalid ones are skipped and listed in `errors`.
+    """
+    start = time.perf_counter()
+    try:
+        fmt = bulk_import.detect_format(file_format, file.filename, file.content_type)
+        result = bulk_import.import_vehicles(db, user.account_id, bulk_import.read_rows(file.file, fmt))
+    except bulk_import.ImportRejected as e:
+        db.rollback()
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    db.commit()
+    if result.inserted:
+        _listings_changed(user.account_id, active=True)
+    logger.info(
+        "Imported %d vehicles (%d rejected) in %.1f ms",
+        result.inserted, result.failed, (time.perf_counter() - start) * 1000,
+    )
+    return result
+
+
+@router.get("/export")
+# Auth lookups plus the one streamed SELECT, which runs after the endpoint returns (counted up to the last chunk)
+@query_budget(3)
+def export_vehicles(
+    file_format: str = Query("ndjson", alias="format", description="ndjson or csv"),
+    product: str | None = None,
+    status_filter: str | None = None,
+    user: User = Depends(get_current_user),
+):
+    """Stream every vehicle of the account (newest first, images included) as NDJSON or CSV."""
+    if file_format not in export.FORMATS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid format. Allowed: {', '.join(export.FORMATS)}",
+        )
+    if product not in ("car", "bike", "ev"):
+        product = None
+    if status_filter not in ("active", "sold", "inactive"):
+        status_filter = None
+    filename = f"vehicles-{datetime.now(timezone.utc):%Y%m%d}.{file_format}"
+    return StreamingResponse(
+        export.stream(user.account_id, file_format, product, status_filter),
+        media_type=export.FORMATS[file_format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+@router.patch("/batch", response_model=VehicleBatchOut)
+@query_budget(3)
+def update_vehicles_batch(
+    payload: VehicleBatchUpdate,
+    user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    """Apply one patch to many vehicles, selected by `ids` and/or `filter`, in a single UPDATE."""
+    account_id = user.account_id
+    try:
+        ids, active = batch.update_vehicles(db, account_id, payload, payload.patch.model_dump(exclude_unset=True))
+    except batch.EmptyPatch as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
     db.commit()
-    db.refresh(vehicle)
-    return _vehicle_to_out(vehicle)
+    if ids:
+        _listings_changed(account_id, active, *ids)
+    return VehicleBatchOut(matched=len(ids), ids=ids)
+
+
+@router.delete("/batch", response_model=VehicleBatchOut)
+@query_budget(5)
+def delete_vehicles_batch(
+    payload: VehicleSelection,
+    user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    """Delete many vehicles, selected by `ids` and/or `filter`; their image files are released in one job."""
+    account_id = user.account_id
+    ids, active = batch.delete_vehicles(db, account_id, payload)
+    db.commit()
+    if ids:
+        _listings_changed(account_id, active, *ids)
+    return VehicleBatchOut(matched=len(ids), ids=ids)
 
 
 @router.get("/browse", response_model=VehicleListOut)
-def browse_vehicles(
+@query_budget(4)
+async def browse_vehicles(
     page: int = 1,
     per_page: int = 20,
     product: str | None = None,
-    db: Session = Depends(get_db),
+    q: str | None = None,
+    min_amount: Decimal | None = Query(None, ge=0),
+    max_amount: Decimal | None = Query(None, ge=0),
+    min_year: int | None = None,
+    max_year: int | None = None,
+    max_mileage: int | None = Query(None, ge=0),
+    location: str | None = None,
+    facets: bool = False,
+    sort: str | None = None,
+    cursor: str | None = None,
+    db: AsyncSession = Depends(get_read_db),
 ):
-    """Public: browse all active vehicles (for mobile app home/guest users)."""
-    q = db.query(Vehicle).filter(Vehicle.status == "active")
-    if product and product in ("car", "bike", "ev"):
-        q = q.filter(Vehicle.product == product)
-    total = q.count()
-    items = q.order_by(Vehicle.created_at.desc()).offset((page - 1) * per_page).limit(per_page).all()
-    return VehicleListOut(
-        total=total,
-        page=page,
-        per_page=per_page,
-        items=[_vehicle_to_out(v) for v in items],
-    )
+    """Public: browse all active vehicles (for mobile app home/guest users).
+
+    `q` searches name, location and description (ranked by relevance unless `sort`
+    is given). Amount, model year and mileage take inclusive range bounds and
+    `location` matches case-insensitively anywhere in the location. `facets=true`
+    adds counts per product, price band and model-year band, each under every
+    filter except its own.
+    Pass `next_cursor` from the previous response as `cursor` for keyset paging;
+    `page` is still honoured for older clients. The first BROWSE_CACHE_MAX_PAGE
+    pages are served from an in-process cache of serialized responses.
+    """
+    if product not in ("car", "bike", "ev"):
+        product = None
+    q = search.normalize(q)
+    location = search.normalize(location)
+    scope = ("browse", product, q, min_amount, max_amount, min_year, max_year, max_mileage, location)
+    cache_key = scope + (facets, sort, max(1, page), _clamp_per_page(per_page))
+    use_cache = response_cache.cacheable(page, cursor)
+    if use_cache:
+        body = response_cache.get(cache_key)
+        if body is not None:
+            return Response(content=body, media_type="application/json")
+
+    def fetch(sync_db: Session) -> VehicleListOut:
+        query = sync_db.query(Vehicle).filter(Vehicle.status == "active")
+        # Filters on a faceted column are kept apart: each facet is counted without its own
+        facet_filters = {"product": [], "price": [], "model_year": []}
+        if product:
+            facet_filters["product"].append(Vehicle.product == product)
+        if min_amount is not None:
+            facet_filters["price"].append(Vehicle.amount >= min_amount)
+        if max_amount is not None:
+            facet_filters["price"].append(Vehicle.amount <= max_amount)
+        if min_year is not None:
+            facet_filters["model_year"].append(Vehicle.model_year >= min_year)
+        if max_year is not None:
+            facet_filters["model_year"].append(Vehicle.model_year <= max_year)
+        if max_mileage is not None:
+            query = query.filter(Vehicle.mileage <= max_mileage)
+        if location:
+            query = query.filter(Vehicle.location.ilike(f"%{_escape_like(location)}%", escape="\\"))
+        return _page_out(sync_db, query, scope, page, per_page, sort, cursor, search_text=q, with_facets=facets,
+                         facet_filters=facet_filters)
+
+    # The listing queries are shared with the sync routes; run_sync runs them over the async connection
+    out = await db.run_sync(fetch)
+    body = out.model_dump_json().encode("utf-8")
+    if use_cache:
+        response_cache.put(cache_key, body)
+    return Response(content=body, media_type="application/json")
 
 
 @router.get("", response_model=VehicleListOut)
+@query_budget(6)
 def list_vehicles(
     page: int = 1,
     per_page: int = 20,
     product: str | None = None,
     status_filter: str | None = None,
+    q: str | None = None,
+    sort: str | None = None,
+    cursor: str | None = None,
     user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
-    """List vehicles for the logged-in user's account. Filter by product and status."""
-    q = db.query(Vehicle).filter(Vehicle.account_id == user.account_id)
-    if product and product in ("car", "bike", "ev"):
-        q = q.filter(Vehicle.product == product)
-    if status_filter and status_filter in ("active", "sold", "inactive"):
-        q = q.filter(Vehicle.status == status_filter)
-    total = q.count()
-    items = q.order_by(Vehicle.created_at.desc()).offset((page - 1) * per_page).limit(per_page).all()
-    return VehicleListOut(
-        total=total,
-        page=page,
-        per_page=per_page,
-        items=[_vehicle_to_out(v) for v in items],
-    )
+    """List vehicles for the logged-in user's account. Filter by product and status, search with `q`."""
+    if product not in ("car", "bike", "ev"):
+        product = None
+    if status_filter not in ("active", "sold", "inactive"):
+        status_filter = None
+    q = search.normalize(q)
+    query = db.query(Vehicle).filter(Vehicle.account_id == user.account_id)
+    if product:
+        query = query.filter(Vehicle.product == product)
+    if status_filter:
+        query = query.filter(Vehicle.status == status_filter)
+    scope = ("account", user.account_id, product, status_filter, q)
+    return _page_out(db, query, scope, page, per_page, sort, cursor, search_text=q)
 
 
 @router.get("/browse/{vehicle_id}", response_model=VehicleOut)
-def get_vehicle_public(
+@query_budget(2)
+async def get_vehicle_public(
     vehicle_id: int,
-    db: Session = Depends(get_db),
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_read_db),
 ):
-    """Public: get a single active vehicle by ID (for detail page)."""
-    v = db.get(Vehicle, vehicle_id)
+    """Public: get a single active vehicle by ID (for detail page).
+
+    Sends ETag/Last-Modified; a matching If-None-Match or If-Modified-Since gets
+    304 Not Modified without loading the vehicle.
+    """
+    version = await db.run_sync(get_vehicle_version, vehicle_id)
+    if not version or version.status != "active":
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Vehicle not found")
+    if is_not_modified(request, version.etag("json"), version.last_modified):
+        return not_modified_response(cache_headers(version.etag("json"), version.last_modified, public=True))
+    v = await db.run_sync(get_vehicle_with_images, vehicle_id)
     if not v or v.status != "active":
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Vehicle not found")
+    version = VehicleVersion.of(v)
+    response.headers.update(cache_headers(version.etag("json"), version.last_modified, public=True))
     return _vehicle_to_out(v)
 
 
 @router.get("/{vehicle_id}", response_model=VehicleOut)
-def get_vehicle(
+@query_budget(4)
+async def get_vehicle(
     vehicle_id: int,
-    user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    request: Request,
+    response: Response,
+    user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db),
 ):
-    """Get a single vehicle by ID."""
-    v = _get_vehicle_or_404(db, vehicle_id, user.account_id)
+    """Get a single vehicle by ID. Supports conditional GET like the public detail endpoint."""
+    account_id = user.account_id
+    version = await db.run_sync(get_vehicle_version, vehicle_id)
+    if not version or version.account_id != account_id:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Vehicle not found")
+    if is_not_modified(request, version.etag("json"), version.last_modified):
+        return not_modified_response(cache_headers(version.etag("json"), version.last_modified, public=False))
+    v = await db.run_sync(_get_vehicle_or_404, vehicle_id, account_id)
+    version = VehicleVersion.of(v)
+    response.headers.update(cache_headers(version.etag("json"), version.last_modified, public=False))
     return _vehicle_to_out(v)
 
 
 @router.patch("/{vehicle_id}", response_model=VehicleOut)
+@query_budget(5)
 def update_vehicle(
     vehicle_id: int,
     payload: VehicleUpdate,
@@ -211,16 +486,20 @@ def update_vehicle(
     db: Session = Depends(get_db),
 ):
     """Update vehicle. Use separate endpoints to add/remove images."""
-    v = _get_vehicle_or_404(db, vehicle_id, user.account_id)
+    account_id = user.account_id
+    v = _get_vehicle_or_404(db, vehicle_id, account_id)
     data = payload.model_dump(exclude_unset=True)
+    was_active = v.status == "active"
     for k, val in data.items():
         setattr(v, k, val)
+    active = was_active or v.status == "active"
     db.commit()
-    db.refresh(v)
-    return _vehicle_to_out(v)
+    _listings_changed(account_id, active, vehicle_id)
+    return _vehicle_to_out(get_vehicle_with_images(db, vehicle_id))
 
 
 @router.post("/{vehicle_id}/images")
+@query_budget(7)
 def add_vehicle_images(
     vehicle_id: int,
     images: list[UploadFile] = File(...),
@@ -228,17 +507,21 @@ def add_vehicle_images(
     db: Session = Depends(get_db),
 ):
     """Add images to an existing vehicle."""
-    v = _get_vehicle_or_404(db, vehicle_id, user.account_id)
-    for img in images:
-        if img.filename:
-            path = _save_image(img)
-            db.add(VehicleImage(vehicle_id=v.id, image_path=path))
+    account_id = user.account_id
+    v = _get_vehicle_or_404(db, vehicle_id, account_id)
+    active = v.status == "active"
+    paths = _save_images(images)
+    for path in paths:
+        db.add(VehicleImage(vehicle_id=vehicle_id, image_path=path))
+    image_variants.enqueue_variants(db, paths)
+    v.updated_at = datetime.now(timezone.utc)  # image set changed: new ETag / Last-Modified
     db.commit()
-    db.refresh(v)
-    return _vehicle_to_out(v)
+    _listings_changed(account_id, active, vehicle_id)
+    return _vehicle_to_out(get_vehicle_with_images(db, vehicle_id))
 
 
 @router.delete("/{vehicle_id}/images")
+@query_budget(7)
 def remove_vehicle_images(
     vehicle_id: int,
     payload: ImageIdsToRemove,
@@ -246,31 +529,34 @@ def remove_vehicle_images(
     db: Session = Depends(get_db),
 ):
     """Remove specific images from a vehicle."""
-    v = _get_vehicle_or_404(db, vehicle_id, user.account_id)
-    storage_root = Path(settings.STORAGE_DIR)
+    account_id = user.account_id
+    v = _get_vehicle_or_404(db, vehicle_id, account_id)
+    active = v.status == "active"
+    removed = []
     for img in v.images:
         if img.id in payload.image_ids:
-            full_path = storage_root / img.image_path
-            if full_path.exists():
-                full_path.unlink()
+            removed.append((img.image_path, img.variants))
             db.delete(img)
+    image_variants.enqueue_release(db, removed)
+    v.updated_at = datetime.now(timezone.utc)  # image set changed: new ETag / Last-Modified
     db.commit()
-    db.refresh(v)
-    return _vehicle_to_out(v)
+    _listings_changed(account_id, active, vehicle_id)
+    return _vehicle_to_out(get_vehicle_with_images(db, vehicle_id))
 
 
 @router.delete("/{vehicle_id}", status_code=status.HTTP_204_NO_CONTENT)
+@query_budget(6)
 def delete_vehicle(
     vehicle_id: int,
     user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
     """Delete vehicle and its images."""
-    v = _get_vehicle_or_404(db, vehicle_id, user.account_id)
-    storage_root = Path(settings.STORAGE_DIR)
-    for img in v.images:
-        full_path = storage_root / img.image_path
-        if full_path.exists():
-            full_path.unlink()
+    account_id = user.account_id
+    v = _get_vehicle_or_404(db, vehicle_id, account_id)
+    active = v.status == "active"
+    removed = [(img.image_path, img.variants) for img in v.images]
     db.delete(v)
+    image_variants.enqueue_release(db, removed)
     db.commit()
+    _listings_changed(account_id, active, vehicle_id)
@@ -1,15 +1,17 @@
 """Pydantic schemas for Vehicle API."""
 from datetime import date, datetime
 from decimal import Decimal
-from typing import Optional
+from typing import Optional, Union
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, model_validator
 
 
 class VehicleImageOut(BaseModel):
     id: int
     vehicle_id: int
     image_path: str
+    # e.g. {"thumb": "vehicles/<name>_thumb.jpg", "detail_webp": ...}; empty until generated
+    variants: dict[str, str] = {}
 
     class Config:
         from_attributes = True
@@ -58,12 +60,66 @@ class VehicleOut(BaseModel):
         from_attributes = True
 
 
+class FacetBucket(BaseModel):
+    min: Union[int, Decimal]
+    max: Optional[Union[int, Decimal]] = None  # exclusive; None for the open-ended top bucket
+    count: int
+
+
+class VehicleFacets(BaseModel):
+    product: dict[str, int] = Field(default_factory=dict)
+    price: list[FacetBucket] = Field(default_factory=list)
+    model_year: list[FacetBucket] = Field(default_factory=list)
+
+
 class VehicleListOut(BaseModel):
     total: int
+    total_exact: bool = True  # False when `total` is a planner estimate
     page: int
     per_page: int
     items: list[VehicleOut]
+    next_cursor: Optional[str] = None
+    facets: Optional[VehicleFacets] = None
 
 
 class ImageIdsToRemove(BaseModel):
     image_ids: list[int] = Field(default_factory=list)
+
+
+class ImportRowError(BaseModel):
+    row: int  # line number in the uploaded file (CSV: header is line 1)
+    errors: list[str]
+
+
+class VehicleImportOut(BaseModel):
+    inserted: int = 0
+    failed: int = 0
+    errors: list[ImportRowError] = Field(default_factory=list)
+
+
+class VehicleBatchFilter(BaseModel):
+    product: Optional[str] = Field(None, pattern="^(car|bike|ev)$")
+    status: Optional[str] = Field(None, pattern="^(active|sold|inactive)$")
+    posted_before: Optional[date] = None  # posting_date earlier than this (listings without one never match)
+    created_before: Optional[datetime] = None
+
+
+class VehicleSelection(BaseModel):
+    """Vehicles of the caller's account: by `ids`, by `filter`, or both (ANDed). One is required."""
+    ids: Optional[list[int]] = Field(None, min_length=1, max_length=1000)
+    filter: Optional[VehicleBatchFilter] = None
+
+    @model_validator(mode="after")
+    def _require_selection(self):
+        if self.ids is None and (self.filter is None or not self.filter.model_dump(exclude_none=True)):
+            raise ValueError("Give ids or a non-empty filter")
+        return self
+
+
+class VehicleBatchUpdate(VehicleSelection):
+    patch: VehicleUpdate
+
+
+class VehicleBatchOut(BaseModel):
+    matched: int
+    ids: list[int]  # vehicles updated or deleted
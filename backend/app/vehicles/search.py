@@ -0,0 +1,30 @@
+"""Full-text search over vehicle name, location and description.
+
+Vehicle.search_vector is maintained by a database trigger (alembic
+004_vehicle_search) and served by a GIN index; matches are ranked with
+ts_rank_cd, so name hits outrank location hits, which outrank description hits.
+"""
+from sqlalchemy import Double, cast, func
+from sqlalchemy.orm import Query
+
+from app.vehicles.models import Vehicle
+
+# Text search configuration; must match the trigger in alembic 004_vehicle_search
+SEARCH_CONFIG = "english"
+
+
+def normalize(text: str | None) -> str | None:
+    """Collapse whitespace; return None for an empty search."""
+    text = " ".join((text or "").split())
+    return text or None
+
+
+def apply_search(query: Query, text: str):
+    """Filter `query` to vehicles matching `text`; return (query, rank expression).
+
+    Load the rank into Vehicle.search_rank with with_expression() when fetching.
+    """
+    tsquery = func.websearch_to_tsquery(SEARCH_CONFIG, text)
+    # ts_rank_cd returns real; as double the value survives a JSON cursor round-trip exactly
+    rank = cast(func.ts_rank_cd(Vehicle.search_vector, tsquery), Double)
+    return query.filter(Vehicle.search_vector.op("@@")(tsquery)), rank
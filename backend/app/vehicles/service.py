@@ -0,0 +1,16 @@
+"""Vehicle data access helpers shared by the API routes and the share page."""
+from typing import Optional
+
+from sqlalchemy.orm import Session, joinedload
+
+from app.vehicles.models import Vehicle
+
+
+def get_vehicle_with_images(db: Session, vehicle_id: int) -> Optional[Vehicle]:
+    """Load a vehicle and its images in one round-trip (refreshing any stale copy)."""
+    return db.get(
+        Vehicle,
+        vehicle_id,
+        options=[joinedload(Vehicle.images)],
+        populate_existing=True,
+    )
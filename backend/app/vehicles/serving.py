@@ -0,0 +1,89 @@
+"""Serving STORAGE_DIR (uploaded images and their variants) at /storage.
+
+Content-addressed files (vehicles/ab/cd/<sha256>[_<variant>].<ext>, see
+app.vehicles.storage) never change, so they are sent with a long "immutable"
+Cache-Control and an ETag taken from the name: the tag stays the same when a
+re-upload touches the file's mtime. Older, non-hashed names revalidate on every use.
+
+With STORAGE_SENDFILE set, the app only resolves and checks the path and answers
+conditional requests; the file body (including Range requests) is delivered by
+the front proxy via X-Accel-Redirect (nginx) or X-Sendfile (Apache, lighttpd).
+"""
+import os
+import re
+from typing import Optional
+
+from fastapi.staticfiles import StaticFiles
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse, Response
+from starlette.staticfiles import NotModifiedResponse
+from starlette.types import Scope
+
+from app.core.config import settings
+from app.vehicles.storage import TEMP_SUFFIXES
+
+SENDFILE_MODES = {"", "x-accel-redirect", "x-sendfile"}
+REVALIDATE = "public, no-cache"
+
+# <64 hex digest>[_<variant name>].<ext>
+_HASHED_NAME = re.compile(r"^([0-9a-f]{64}(?:_[a-z_]+)?)\.[a-z0-9]+$")
+
+
+def content_etag(path: str) -> Optional[str]:
+    """Strong ETag for a content-addressed file name, or None for other files."""
+    match = _HASHED_NAME.match(os.path.basename(path))
+    return f'"{match.group(1)}"' if match else None
+
+
+class _StorageFileResponse(FileResponse):
+    def _should_use_range(self, http_if_range: str, stat_result: os.stat_result) -> bool:
+        # Compare If-Range with the ETag actually sent, not Starlette's mtime-based one
+        if http_if_range == self.headers.get("etag"):
+            return True
+        return super()._should_use_range(http_if_range, stat_result)
+
+
+class StorageFiles(StaticFiles):
+    def __init__(self, *, directory: str, sendfile: str = "", accel_prefix: str = "/_storage/",
+                 max_age: int = 31536000) -> None:
+        if sendfile not in SENDFILE_MODES:
+            raise ValueError(f"Invalid STORAGE_SENDFILE {sendfile!r}. Allowed: x-accel-redirect, x-sendfile")
+        super().__init__(directory=directory)
+        self.sendfile = sendfile
+        self.accel_prefix = accel_prefix.rstrip("/") + "/"
+        self.immutable = f"public, max-age={max_age}, immutable" if max_age > 0 else REVALIDATE
+
+    def file_response(self, full_path, stat_result: os.stat_result, scope: Scope, status_code: int = 200) -> Response:
+        path = os.fspath(full_path)
+        if path.endswith(TEMP_SUFFIXES):
+            # Upload or variant still being written
+            return Response(status_code=404)
+        etag = content_etag(path)
+        headers = {"Cache-Control": self.immutable if etag else REVALIDATE}
+        if etag:
+            headers["ETag"] = etag
+        response = _StorageFileResponse(path, status_code=status_code, stat_result=stat_result, headers=headers)
+        if self.is_not_modified(response.headers, Headers(scope=scope)):
+            return NotModifiedResponse(response.headers)
+        if self.sendfile:
+            return self._offload(path, response)
+        return response
+
+    def _offload(self, path: str, response: FileResponse) -> Response:
+        """Empty response telling the proxy which file to send, with our caching headers."""
+        headers = {k: v for k, v in response.headers.items() if k in ("cache-control", "etag", "last-modified")}
+        if self.sendfile == "x-accel-redirect":
+            relative = os.path.relpath(path, os.path.realpath(self.directory)).replace(os.sep, "/")
+            headers["X-Accel-Redirect"] = self.accel_prefix + relative
+        else:
+            headers["X-Sendfile"] = path
+        return Response(status_code=response.status_code, headers=headers, media_type=response.media_type)
+
+
+def storage_files(directory: str) -> StorageFiles:
+    return StorageFiles(
+        directory=directory,
+        sendfile=settings.STORAGE_SENDFILE,
+        accel_prefix=settings.STORAGE_ACCEL_PREFIX,
+        max_age=settings.STORAGE_CACHE_MAX_AGE,
+    )
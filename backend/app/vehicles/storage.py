@@ -0,0 +1,116 @@
+"""Writing uploaded vehicle images to STORAGE_DIR.
+
+Uploads are copied in fixed-size chunks to a temp file in the destination
+directory and renamed into place once complete, so memory per upload is
+constant, a file over MAX_FILE_SIZE stops being copied as soon as it crosses
+the limit, and a half-written file is never visible under its final name.
+Starlette has already received and spooled the whole multipart body by the time
+it gets here; the request as a whole is capped while it arrives by
+app.core.request_limits (MAX_REQUEST_BODY_MB).
+
+Files are content-addressed (vehicles/<sha256>.<ext>): identical uploads, from
+any vehicle or account, share one file, and a stored file never changes, so it
+can be cached forever. Several VehicleImage rows may therefore point at the
+same path; app.vehicles.images.release() only unlinks unreferenced files.
+
+The hash's first two byte pairs shard the files into vehicles/ab/cd/, so no
+directory grows past a few thousand entries. Older flat paths
+(vehicles/<name>.<ext>) keep working; scripts.migrate_storage_layout moves them
+and scripts.gc_storage removes files no image row references.
+"""
+import hashlib
+import os
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor, wait
+from pathlib import Path
+from typing import BinaryIO, Optional
+
+from app.core.config import settings
+
+ALLOWED_EXTENSIONS = {"jpeg", "jpg", "png", "webp"}
+TEMP_SUFFIXES = (".part", ".tmp")  # in-flight writes; see scripts.gc_storage
+MAX_FILE_SIZE = 5 * 1024 * 1024  # 5MB
+CHUNK_SIZE = 64 * 1024
+
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+class UploadRejected(ValueError):
+    pass
+
+
+def _pool() -> ThreadPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=settings.UPLOAD_WORKERS, thread_name_prefix="upload")
+        return _executor
+
+
+def upload_dir() -> Path:
+    base = Path(settings.STORAGE_DIR) / "vehicles"
+    base.mkdir(parents=True, exist_ok=True)
+    return base
+
+
+def extension(filename: str | None) -> str:
+    ext = filename.split(".")[-1].lower() if filename else "jpg"
+    if ext not in ALLOWED_EXTENSIONS:
+        raise UploadRejected(f"Invalid image type. Allowed: {', '.join(ALLOWED_EXTENSIONS)}")
+    return "jpg" if ext == "jpeg" else ext
+
+
+def content_path(digest: str, ext: str) -> str:
+    """Storage path (relative to STORAGE_DIR) of the file with sha256 hex `digest`."""
+    return f"vehicles/{digest[:2]}/{digest[2:4]}/{digest}.{ext}"
+
+
+def save_stream(src: BinaryIO, ext: str, size_hint: int | None = None) -> str:
+    """Copy `src` into storage; return the path relative to STORAGE_DIR."""
+    if size_hint is not None and size_hint > MAX_FILE_SIZE:
+        raise UploadRejected("Image too large. Max 5MB.")
+    base = upload_dir()
+    tmp = base / f".{uuid.uuid4().hex}.part"
+    digest = hashlib.sha256()
+    written = 0
+    try:
+        with open(tmp, "wb") as dst:
+            while chunk := src.read(CHUNK_SIZE):
+                written += len(chunk)
+                if written > MAX_FILE_SIZE:
+                    raise UploadRejected("Image too large. Max 5MB.")
+                digest.update(chunk)
+                dst.write(chunk)
+            # A stored hash name is trusted forever (dedup), so it must never point at a torn file
+            dst.flush()
+            os.fsync(dst.fileno())
+        rel = content_path(digest.hexdigest(), ext)
+        final = Path(settings.STORAGE_DIR) / rel
+        try:
+            # Same bytes already stored; a fresh mtime keeps gc_storage's grace period from collecting it
+            os.utime(final)
+            tmp.unlink()
+        except FileNotFoundError:
+            final.parent.mkdir(parents=True, exist_ok=True)
+            os.replace(tmp, final)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+    return rel
+
+
+def save_all(uploads: list[tuple[BinaryIO, str, int | None]]) -> list[str]:
+    """save_stream(src, ext, size_hint) for each upload on the shared UPLOAD_WORKERS pool.
+
+    Returns paths in input order. Every upload is finished (or failed) before the
+    first error, if any, is raised, so no write is still running afterwards.
+    """
+    if len(uploads) <= 1 or settings.UPLOAD_WORKERS <= 1:
+        return [save_stream(*upload) for upload in uploads]
+    pool = _pool()
+    futures = [pool.submit(save_stream, *upload) for upload in uploads]
+    wait(futures)
+    return [f.result() for f in futures]
@@ -2,29 +2,49 @@
 FastAPI app for Rathinam (mobile DB + JWT auth).
 Run: uvicorn main:app --reload --host 0.0.0.0
 """
+from contextlib import asynccontextmanager
 from pathlib import Path
 
 from fastapi import FastAPI, Depends, Request, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import HTMLResponse
-from fastapi.staticfiles import StaticFiles
+from fastapi.responses import HTMLResponse, Response
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.database import get_db, check_connection
-from app.vehicles.models import Vehicle
+from app.database import async_engine, check_connection, engine, get_db
 from app.core.config import settings
+from app.core import metrics, query_stats, replicas, request_limits
+from app.vehicles.service import get_vehicle_with_images
+from app.vehicles import cache_events, page_cache, serving
+from app.vehicles.conditional import (
+    VehicleVersion,
+    cache_headers,
+    get_vehicle_version,
+    is_not_modified,
+    not_modified_response,
+)
 from app.auth.routes import router as auth_router
 from app.vehicles.routes import router as vehicles_router
+from app.ops.routes import router as ops_router
+from view import assets
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Replica health is checked in the background, never on the request path
+    await replicas.replicas.start()
+    cache_events.start()
+    yield
+    await cache_events.stop()
+    await replicas.replicas.stop()
+    # A stopped worker's gauges must not linger in PROMETHEUS_MULTIPROC_DIR
+    metrics.worker_stopped()
+
 
 app = FastAPI(
     title="Rathinam API",
     description="FastAPI + PostgreSQL (mobile) with JWT auth for mobile app",
-)
-
-app.mount(
-    "/storage",
-    StaticFiles(directory="storage"),
-    name="storage"
+    lifespan=lifespan,
 )
 
 # CORS - required for Expo Web and mobile app to connect
@@ -36,8 +56,28 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Count SQL statements per request; endpoints over their @query_budget are logged (or fail when strict).
+# SQL_PROFILE also times them (profile and slow-query logs, timing headers outside production)
+query_stats.install(engine, profile=settings.SQL_PROFILE)
+query_stats.install(async_engine.sync_engine, profile=settings.SQL_PROFILE)
+for replica in replicas.replicas.replicas:
+    query_stats.install(replica.engine.sync_engine, profile=settings.SQL_PROFILE)
+app.add_middleware(
+    query_stats.QueryBudgetMiddleware,
+    strict=settings.QUERY_BUDGET_STRICT,
+    profile=settings.SQL_PROFILE,
+    timing_headers=settings.ENVIRONMENT != "production",
+)
+# Oversized uploads get a 413 before Starlette spools them to disk
+app.add_middleware(request_limits.BodySizeLimitMiddleware, max_bytes=int(settings.MAX_REQUEST_BODY_MB * 1024 * 1024))
+# After a write, the client's reads go to the primary for a while (only when replicas are configured)
+app.add_middleware(replicas.ReadYourWritesMiddleware)
+# Outermost: request count/latency/size per route template for /metrics
+app.add_middleware(metrics.MetricsMiddleware)
+
 app.include_router(auth_router)
 app.include_router(vehicles_router)
+app.include_router(ops_router)
 
 
 @app.get("/")
@@ -50,6 +90,12 @@ def health():
     return {"status": "ok"}
 
 
+@app.get("/metrics", include_in_schema=False)
+def prometheus_metrics():
+    body, content_type = metrics.render()
+    return Response(body, media_type=content_type)
+
+
 @app.get("/db-check")
 def db_check():
     ok, error = check_connection()
@@ -70,21 +116,56 @@ def db_session_test(db: Session = Depends(get_db)):
 
 
 @app.get("/v/{vehicle_id}", response_class=HTMLResponse)
-def vehicle_share_page(vehicle_id: int, request: Request, db: Session = Depends(get_db)):
+@query_stats.query_budget(2)
+async def vehicle_share_page(vehicle_id: int, request: Request, db: AsyncSession = Depends(replicas.get_read_db)):
     """Public shareable page: view vehicle details in browser (for WhatsApp link)."""
-    from view.product import render_product_page
+    from view.product import PAGE_REVISION, render_product_page
 
-    v = db.get(Vehicle, vehicle_id)
-    if not v or v.status != "active":
+    version = await db.run_sync(get_vehicle_version, vehicle_id)
+    if not version or version.status != "active":
         raise HTTPException(status_code=404, detail="Vehicle not found")
     base = str(request.base_url).rstrip("/")
-    img_urls = [f"{base}/storage/{img.image_path}" for img in v.images] if v.images else []
-    html_content = render_product_page(v, base, img_urls)
-    return HTMLResponse(html_content)
+    gzip = page_cache.accepts_gzip(request.headers.get("accept-encoding"))
+    # The page embeds the base URL, and the gzip body is a representation of its own with its own ETag
+    representation = f"html:{PAGE_REVISION}:{base}"
+    etag = version.etag(representation)
+    sent_etag = page_cache.encoded_etag(etag, gzip)
+    # Vary goes on the 304 too: caches must keep the gzip and plain variants apart either way
+    headers = {**cache_headers(sent_etag, version.last_modified, public=True), "Vary": "Accept-Encoding"}
+    if is_not_modified(request, sent_etag, version.last_modified):
+        return not_modified_response(headers)
+    page = page_cache.get(vehicle_id, etag, base) if page_cache.enabled() else None
+    if page is None:
+        v = await db.run_sync(get_vehicle_with_images, vehicle_id)
+        if not v or v.status != "active":
+            raise HTTPException(status_code=404, detail="Vehicle not found")
+        version = VehicleVersion.of(v)
+        etag = version.etag(representation)
+        sent_etag = page_cache.encoded_etag(etag, gzip)
+        headers = {**cache_headers(sent_etag, version.last_modified, public=True), "Vary": "Accept-Encoding"}
+        variants = [img.variants or {} for img in v.images]
+        img_urls = [f"{base}/storage/{vs.get('detail', img.image_path)}" for img, vs in zip(v.images, variants)]
+        webp_urls = [f"{base}/storage/{vs['detail_webp']}" if "detail_webp" in vs else None for vs in variants]
+        page = page_cache.render(render_product_page(v, base, img_urls, webp_urls))
+        if page_cache.enabled():
+            page_cache.put(vehicle_id, etag, base, page)
+    if gzip:
+        headers["Content-Encoding"] = "gzip"
+        return Response(page.gzipped, media_type="text/html; charset=utf-8", headers=headers)
+    return Response(page.html, media_type="text/html; charset=utf-8", headers=headers)
+
+
+@app.get(assets.URL_PREFIX + "/{filename}", include_in_schema=False)
+def static_asset(filename: str):
+    """Fingerprinted CSS/JS for server-rendered pages; the URL changes with the content."""
+    asset = assets.lookup(filename)
+    if asset is None:
+        raise HTTPException(status_code=404, detail="Not found")
+    return Response(asset.content, media_type=asset.media_type, headers={"Cache-Control": assets.CACHE_CONTROL})
 
 
 # Serve uploaded vehicle images (mount last so it doesn't shadow other routes)
-storage_path = Path(__file__).resolve().parent / settings.STORAGE_DIR
+storage_path = Path(settings.STORAGE_DIR)
 storage_path.mkdir(parents=True, exist_ok=True)
 (storage_path / "vehicles").mkdir(parents=True, exist_ok=True)
-app.mount("/storage", StaticFiles(directory=str(storage_path)), name="storage")
+app.mount("/storage", serving.storage_files(str(storage_path)), name="storage")
@@ -0,0 +1,180 @@
+"""
+Side-by-side load test of the same read endpoint as a sync (threadpool) and an async route.
+Run from project root: python -m scripts.bench_async_load [--concurrency 10,50,200] [--db-latency-ms 20]
+
+Both routes do what GET /vehicles/browse/{id} does (version lookup, then the
+vehicle with its images), plus an optional pg_sleep standing in for a slower
+database or network. They are served by one uvicorn process with the same
+pool size, so the only difference is a threadpool thread (at most 40 in
+Starlette) held per in-flight sync request vs an await in the async route.
+"""
+import argparse
+import asyncio
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+
+_project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, _project_root)
+
+
+def build_app(pool_size: int, db_latency_ms: float):
+    from fastapi import Depends, FastAPI, HTTPException
+    from sqlalchemy import text
+    from sqlalchemy.ext.asyncio import async_sessionmaker
+    from sqlalchemy.orm import Session, sessionmaker
+
+    import app.auth.models  # noqa: F401 (mapper configuration)
+    from app.database import make_async_engine, make_engine
+    from app.vehicles.conditional import get_vehicle_version
+    from app.vehicles.service import get_vehicle_with_images
+
+    pool = {"pool_size": pool_size, "max_overflow": 0}
+    sync_sessions = sessionmaker(bind=make_engine(**pool))
+    async_sessions = async_sessionmaker(make_async_engine(**pool), expire_on_commit=False)
+
+    def load(db: Session, vehicle_id: int) -> dict:
+        if db_latency_ms:
+            db.execute(text("SELECT pg_sleep(:s)"), {"s": db_latency_ms / 1000})
+        version = get_vehicle_version(db, vehicle_id)
+        v = get_vehicle_with_images(db, vehicle_id) if version else None
+        if v is None:
+            raise HTTPException(status_code=404)
+        return {"id": v.id, "name": v.name, "images": [img.image_path for img in v.images]}
+
+    def sync_db():
+        db = sync_sessions()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    async def async_db():
+        async with async_sessions() as db:
+            yield db
+
+    bench = FastAPI()
+
+    @bench.get("/sync/{vehicle_id}")
+    def sync_route(vehicle_id: int, db: Session = Depends(sync_db)):
+        return load(db, vehicle_id)
+
+    @bench.get("/async/{vehicle_id}")
+    async def async_route(vehicle_id: int, db=Depends(async_db)):
+        return await db.run_sync(load, vehicle_id)
+
+    return bench
+
+
+async def _drive(url: str, concurrency: int, duration: float) -> tuple[list[float], int]:
+    import httpx
+
+    latencies: list[float] = []
+    errors = 0
+    deadline = time.perf_counter() + duration
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(limits=limits, timeout=60) as client:
+        async def user():
+            nonlocal errors
+            while time.perf_counter() < deadline:
+                start = time.perf_counter()
+                try:
+                    r = await client.get(url)
+                    ok = r.status_code == 200
+                except httpx.HTTPError:
+                    ok = False
+                if ok:
+                    latencies.append((time.perf_counter() - start) * 1000)
+                else:
+                    errors += 1
+
+        await asyncio.gather(*(user() for _ in range(concurrency)))
+    return latencies, errors
+
+
+def _pct(values: list[float], p: float) -> float:
+    return statistics.quantiles(values, n=100)[int(p) - 1] if len(values) > 1 else (values[0] if values else 0.0)
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _wait_for(port: int, timeout: float = 30) -> None:
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=0.5).close()
+            return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError("uvicorn did not start")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--concurrency", default="10,50,200", help="comma-separated simultaneous clients")
+    parser.add_argument("--duration", type=float, default=10, help="seconds per run")
+    parser.add_argument("--db-latency-ms", type=float, default=20, help="extra pg_sleep per request (0 = none)")
+    parser.add_argument("--pool-size", type=int, default=40, help="connections per engine (no overflow)")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn worker processes")
+    parser.add_argument("--vehicle-id", type=int, help="vehicle to fetch (default: newest active)")
+    parser.add_argument("--serve", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.serve:
+        import uvicorn
+
+        port = int(os.environ["BENCH_PORT"])
+        uvicorn.run("scripts.bench_async_load:app_factory", factory=True, port=port, workers=args.workers,
+                    log_level="warning")
+        return
+
+    vehicle_id = args.vehicle_id
+    if vehicle_id is None:
+        from sqlalchemy import select
+
+        import app.auth.models  # noqa: F401
+        from app.database import SessionLocal
+        from app.vehicles.models import Vehicle
+
+        with SessionLocal() as db:
+            vehicle_id = db.execute(
+                select(Vehicle.id).where(Vehicle.status == "active").order_by(Vehicle.id.desc()).limit(1)
+            ).scalar_one()
+
+    port = _free_port()
+    env = dict(os.environ, BENCH_PORT=str(port), BENCH_POOL_SIZE=str(args.pool_size),
+               BENCH_DB_LATENCY_MS=str(args.db_latency_ms))
+    server = subprocess.Popen(
+        [sys.executable, "-m", "scripts.bench_async_load", "--serve", "--workers", str(args.workers)],
+        cwd=_project_root, env=env,
+    )
+    try:
+        _wait_for(port)
+        print(f"{args.workers} worker(s), pool {args.pool_size}, +{args.db_latency_ms:g} ms DB latency, "
+              f"{args.duration:g}s per run")
+        print(f"{'route':>6} {'clients':>7} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'errors':>6}")
+        for concurrency in (int(c) for c in args.concurrency.split(",")):
+            for kind in ("sync", "async"):
+                url = f"http://127.0.0.1:{port}/{kind}/{vehicle_id}"
+                asyncio.run(_drive(url, min(concurrency, 5), 1))  # warm up the pool
+                latencies, errors = asyncio.run(_drive(url, concurrency, args.duration))
+                print(f"{kind:>6} {concurrency:>7} {len(latencies) / args.duration:8.0f} {_pct(latencies, 50):8.1f} "
+                      f"{_pct(latencies, 95):8.1f} {_pct(latencies, 99):8.1f} {errors:>6}")
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def app_factory():
+    return build_app(int(os.environ["BENCH_POOL_SIZE"]), float(os.environ["BENCH_DB_LATENCY_MS"]))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Peak memory of GET /vehicles/export for growing inventories.
+Run from project root: python -m scripts.bench_export_memory [--sizes 1000,10000,100000] [--format ndjson]
+
+A throwaway account is filled with the given number of vehicles (one image
+row each) and exported once per size in a fresh child process, so the
+reported extra peak RSS is the export's own. The account is deleted at the end.
+"""
+import argparse
+import os
+import resource
+import subprocess
+import sys
+import time
+import uuid
+
+_project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, _project_root)
+
+
+def _fill(db, account_id: int, count: int, have: int) -> None:
+    from sqlalchemy import insert, select
+
+    from app.vehicles.models import Vehicle, VehicleImage
+
+    for start in range(have, count, 5000):
+        rows = [
+            {"account_id": account_id, "name": f"Export {i}", "product": "car", "amount": 100000 + i,
+             "model_year": 2015, "status": "active", "description": "x" * 200}
+            for i in range(start, min(count, start + 5000))
+        ]
+        db.execute(insert(Vehicle), rows)
+    new_ids = db.execute(
+        select(Vehicle.id).where(Vehicle.account_id == account_id).order_by(Vehicle.id).offset(have)
+    ).scalars().all()
+    for i in range(0, len(new_ids), 5000):
+        db.execute(insert(VehicleImage), [{"vehicle_id": vid, "image_path": f"vehicles/bench/{vid}.jpg"}
+                                          for vid in new_ids[i:i + 5000]])
+    db.commit()
+
+
+def _child(account_id: int, fmt: str) -> None:
+    from app.vehicles import export
+
+    before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.perf_counter()
+    total = sum(len(chunk) for chunk in export.stream(account_id, fmt))
+    elapsed = time.perf_counter() - start
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is KiB on Linux
+    print(f"{total / 1024 / 1024:8.1f} MB out in {elapsed:6.2f}s, +{(peak - before) / 1024:.1f} MB peak RSS")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", default="1000,10000,100000", help="comma-separated vehicle counts")
+    parser.add_argument("--format", choices=["ndjson", "csv"], default="ndjson")
+    parser.add_argument("--child", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        _child(args.child, args.format)
+        return
+
+    import app.auth.models  # noqa: F401 (mapper configuration)
+    from app.auth.models import Account
+    from app.database import SessionLocal
+
+    db = SessionLocal()
+    account = Account(name="Export benchmark", slug=f"bench-export-{uuid.uuid4().hex[:8]}")
+    db.add(account)
+    db.commit()
+    have = 0
+    try:
+        for size in sorted(int(s) for s in args.sizes.split(",")):
+            _fill(db, account.id, size, have)
+            have = size
+            print(f"{size:>9} vehicles: ", end="", flush=True)
+            cmd = [sys.executable, "-m", "scripts.bench_export_memory", "--child", str(account.id), "--format", args.format]
+            subprocess.run(cmd, cwd=_project_root, check=True)
+    finally:
+        db.delete(account)
+        db.commit()
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+Rows/sec of the bulk import vs creating the same vehicles one at a time.
+Run from project root: python -m scripts.bench_import [--rows 2000] [--format csv|ndjson]
+
+"One at a time" repeats what POST /vehicles does per listing (insert, flush,
+commit, reload); the import parses the generated file and inserts in
+IMPORT_BATCH_SIZE batches. Both run against the default account and the
+inserted rows are deleted afterwards.
+"""
+import argparse
+import io
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import delete, select
+
+from app.auth.models import Account
+from app.core.config import settings
+from app.database import SessionLocal
+from app.vehicles import bulk_import
+from app.vehicles.models import Vehicle
+from app.vehicles.service import get_vehicle_with_images
+
+MARKER = "bench-import"
+
+
+def _rows(count: int) -> list[dict]:
+    return [
+        {"name": f"Bench {i}", "product": ("car", "bike", "ev")[i % 3], "amount": str(100000 + i),
+         "model_year": 2010 + i % 15, "mileage": i * 7, "location": MARKER}
+        for i in range(count)
+    ]
+
+
+def _file(rows: list[dict], fmt: str) -> io.BytesIO:
+    if fmt == "ndjson":
+        return io.BytesIO("".join(json.dumps(r) + "\n" for r in rows).encode())
+    header = list(rows[0])
+    lines = [",".join(header)] + [",".join(str(r[k]) for k in header) for r in rows]
+    return io.BytesIO(("\n".join(lines) + "\n").encode())
+
+
+def _one_at_a_time(db, account_id: int, rows: list[dict]) -> float:
+    start = time.perf_counter()
+    for row in rows:
+        vehicle = Vehicle(**row, account_id=account_id, status="active")
+        db.add(vehicle)
+        db.flush()
+        db.commit()
+        get_vehicle_with_images(db, vehicle.id)
+    return time.perf_counter() - start
+
+
+def _bulk(db, account_id: int, rows: list[dict], fmt: str) -> float:
+    src = _file(rows, fmt)
+    start = time.perf_counter()
+    result = bulk_import.import_vehicles(db, account_id, bulk_import.read_rows(src, fmt))
+    db.commit()
+    elapsed = time.perf_counter() - start
+    assert result.inserted == len(rows), result.errors[:3]
+    return elapsed
+
+
+def _cleanup(db) -> None:
+    db.execute(delete(Vehicle).where(Vehicle.location == MARKER))
+    db.commit()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=2000)
+    parser.add_argument("--format", choices=sorted(bulk_import.FORMATS), default="csv")
+    args = parser.parse_args()
+    settings.IMPORT_MAX_ROWS = max(settings.IMPORT_MAX_ROWS, args.rows)
+    rows = _rows(args.rows)
+
+    db = SessionLocal()
+    try:
+        account_id = db.execute(select(Account.id).where(Account.slug == settings.DEFAULT_ACCOUNT_SLUG)).scalar_one()
+        single = _one_at_a_time(db, account_id, rows)
+        _cleanup(db)
+        bulk = _bulk(db, account_id, rows, args.format)
+        _cleanup(db)
+    finally:
+        db.close()
+
+    print(f"{args.rows} rows, batch size {settings.IMPORT_BATCH_SIZE}, {args.format}")
+    print(f"one at a time: {single:7.2f} s  {args.rows / single:9.0f} rows/s")
+    print(f"bulk import:   {bulk:7.2f} s  {args.rows / bulk:9.0f} rows/s  ({single / bulk:.0f}x)")
+
+
+if __name__ == "__main__":
+    main()
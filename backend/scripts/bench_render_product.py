@@ -0,0 +1,85 @@
+"""
+Microbenchmark: share page render time and response size, inline-CSS renderer vs template + assets.
+Run from project root: python -m scripts.bench_render_product [--baseline REV] [--number 20000]
+
+The baseline renderer is loaded from git (by default the view/product.py that
+predates view/static), so this needs a git checkout. No database is used.
+"""
+import argparse
+import gzip
+import os
+import subprocess
+import sys
+import timeit
+import types
+from datetime import datetime, timezone
+from decimal import Decimal
+
+_project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, _project_root)
+
+from app.vehicles import page_cache
+from view import product
+
+BASE_URL = "https://example.com"
+
+
+def _git(*args) -> str:
+    return subprocess.run(["git", *args], cwd=_project_root, check=True, capture_output=True, text=True).stdout
+
+
+def _baseline_rev() -> str:
+    added = _git("log", "--diff-filter=A", "--format=%H", "--", "view/static/product.css").split()
+    if not added:
+        sys.exit("view/static/product.css is not committed yet; pass --baseline REV")
+    return added[-1] + "^"
+
+
+def _load_baseline(rev: str) -> types.ModuleType:
+    source = _git("show", f"{rev}:./view/product.py")
+    module = types.ModuleType("product_baseline")
+    exec(compile(source, f"{rev}:view/product.py", "exec"), module.__dict__)
+    return module
+
+
+def _sample_vehicle():
+    return types.SimpleNamespace(
+        id=12345,
+        name="Honda City VX CVT",
+        amount=Decimal("845000"),
+        description="Single owner, company serviced.\nNew tyres, insurance till 2027.",
+        location="Coimbatore",
+        mileage=42000,
+        model_year=2021,
+        product="car",
+        updated_at=datetime(2026, 10, 1, 9, 30, tzinfo=timezone.utc),
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--baseline", help="git revision of the old renderer")
+    parser.add_argument("--number", type=int, default=20000)
+    parser.add_argument("--images", type=int, default=6)
+    args = parser.parse_args()
+
+    rev = args.baseline or _baseline_rev()
+    vehicle = _sample_vehicle()
+    img_urls = [f"{BASE_URL}/storage/vehicles/{i:032x}.jpg" for i in range(args.images)]
+    for label, render in (("baseline", _load_baseline(rev).render_product_page), ("current", product.render_product_page)):
+        html = render(vehicle, BASE_URL, img_urls).encode("utf-8")
+        seconds = min(timeit.repeat(lambda: render(vehicle, BASE_URL, img_urls), number=args.number, repeat=5))
+        # What a share page cache miss costs: render plus the pre-compressed variant
+        page_seconds = min(timeit.repeat(
+            lambda: page_cache.render(render(vehicle, BASE_URL, img_urls)), number=args.number // 10, repeat=5
+        ))
+        print(
+            f"{label:>8}: {seconds / args.number * 1e6:.1f} us/render, "
+            f"{page_seconds / (args.number // 10) * 1e6:.1f} us/render+gzip, "
+            f"{len(html)} bytes ({len(gzip.compress(html))} gzipped)"
+        )
+    print(f"baseline = {rev}")
+
+
+if __name__ == "__main__":
+    main()
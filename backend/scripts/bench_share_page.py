@@ -0,0 +1,71 @@
+"""
+Burst benchmark for the /v/{vehicle_id} share page, with and without the page cache.
+Run from project root: python -m scripts.bench_share_page [--requests 2000] [--concurrency 32] [--vehicle-id N]
+
+Requests go through the ASGI app in-process (TestClient), so the numbers cover
+routing, the database round-trips and rendering, but not the network.
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.testclient import TestClient
+
+from app.core.config import settings
+from app.database import SessionLocal
+from app.vehicles.models import Vehicle
+from main import app
+
+
+def _pick_vehicle() -> int:
+    db = SessionLocal()
+    try:
+        vehicle = db.query(Vehicle).filter(Vehicle.status == "active").order_by(Vehicle.id.desc()).first()
+        if vehicle is None:
+            sys.exit("No active vehicle to benchmark; create one first.")
+        return vehicle.id
+    finally:
+        db.close()
+
+
+def _burst(client: TestClient, url: str, requests: int, concurrency: int) -> list:
+    def one(_):
+        start = time.perf_counter()
+        r = client.get(url, headers={"Accept-Encoding": "gzip"})
+        r.raise_for_status()
+        return (time.perf_counter() - start) * 1000
+
+    client.get(url)  # warm up (fills the cache when enabled)
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        return list(pool.map(one, range(requests)))
+
+
+def _report(label: str, samples: list) -> None:
+    q = statistics.quantiles(samples, n=100)
+    print(f"{label:>10}: n={len(samples)} p50={q[49]:.2f}ms p95={q[94]:.2f}ms p99={q[98]:.2f}ms max={max(samples):.2f}ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--vehicle-id", type=int)
+    args = parser.parse_args()
+
+    url = f"/v/{args.vehicle_id or _pick_vehicle()}"
+    ttl = settings.SHARE_PAGE_CACHE_TTL_SECONDS
+    with TestClient(app) as client:
+        settings.SHARE_PAGE_CACHE_TTL_SECONDS = 0
+        _report("uncached", _burst(client, url, args.requests, args.concurrency))
+        settings.SHARE_PAGE_CACHE_TTL_SECONDS = ttl or 300
+        _report("cached", _burst(client, url, args.requests, args.concurrency))
+    settings.SHARE_PAGE_CACHE_TTL_SECONDS = ttl
+
+
+if __name__ == "__main__":
+    main()
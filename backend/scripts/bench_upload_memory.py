@@ -0,0 +1,86 @@
+"""
+Peak memory of concurrent multi-image uploads: whole-file read (previous behaviour) vs chunked streaming.
+Run from project root: python -m scripts.bench_upload_memory [--concurrency 8] [--images 10] [--size-mb 4.5]
+
+Each mode runs in a fresh child process with STORAGE_DIR pointed at a temp dir.
+Uploads are pre-spooled to disk the way Starlette hands them to the route
+(SpooledTemporaryFile, 1 MB in memory), so the number reported is the extra
+peak RSS caused by saving them.
+"""
+import argparse
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+_project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, _project_root)
+
+
+def _save_read_all(src, ext: str) -> str:
+    """The pre-streaming implementation: read everything, check the size, write."""
+    from app.vehicles import storage
+
+    content = src.read()
+    if len(content) > storage.MAX_FILE_SIZE:
+        raise storage.UploadRejected("Image too large. Max 5MB.")
+    name = f"{uuid.uuid4().hex}.{ext}"
+    (storage.upload_dir() / name).write_bytes(content)
+    return f"vehicles/{name}"
+
+
+def _child(mode: str, concurrency: int, images: int, size: int) -> None:
+    from app.vehicles import storage
+
+    save = storage.save_stream if mode == "stream" else _save_read_all
+    payload = os.urandom(size)
+    uploads = []
+    for _ in range(concurrency):
+        files = []
+        for _ in range(images):
+            f = tempfile.SpooledTemporaryFile(max_size=1024 * 1024)
+            f.write(payload)
+            f.seek(0)
+            files.append(f)
+        uploads.append(files)
+    del payload
+    before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.perf_counter()
+
+    def request(files):
+        for f in files:
+            save(f, "jpg")
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(request, uploads))
+    elapsed = time.perf_counter() - start
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is KiB on Linux
+    print(f"{mode:>8}: +{(peak - before) / 1024:.1f} MB peak RSS, {elapsed:.2f}s for {concurrency * images} files")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--concurrency", type=int, default=8, help="simultaneous upload requests")
+    parser.add_argument("--images", type=int, default=10, help="images per request")
+    parser.add_argument("--size-mb", type=float, default=4.5, help="size of each image")
+    parser.add_argument("--child", choices=["read", "stream"], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    size = int(args.size_mb * 1024 * 1024)
+    if args.child:
+        _child(args.child, args.concurrency, args.images, size)
+        return
+    for mode in ("read", "stream"):
+        with tempfile.TemporaryDirectory() as storage_dir:
+            env = dict(os.environ, STORAGE_DIR=storage_dir)
+            cmd = [sys.executable, "-m", "scripts.bench_upload_memory", "--child", mode,
+                   "--concurrency", str(args.concurrency), "--images", str(args.images), "--size-mb", str(args.size_mb)]
+            subprocess.run(cmd, cwd=_project_root, env=env, check=True)
+
+
+if __name__ == "__main__":
+    main()
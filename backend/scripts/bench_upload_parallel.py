@@ -0,0 +1,60 @@
+"""
+Time saving a multi-image listing serially vs on the UPLOAD_WORKERS pool.
+Run from project root: python -m scripts.bench_upload_parallel [--size-mb 3] [--repeat 5]
+
+Uploads are pre-spooled like Starlette's (SpooledTemporaryFile) and written to a
+temp STORAGE_DIR; each run uses fresh random bytes so deduplication does not
+skip the writes.
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.config import settings
+from app.vehicles import storage
+
+
+def _uploads(count: int, size: int) -> list:
+    uploads = []
+    for _ in range(count):
+        f = tempfile.SpooledTemporaryFile(max_size=1024 * 1024)
+        f.write(os.urandom(size))
+        f.seek(0)
+        uploads.append((f, "jpg", size))
+    return uploads
+
+
+def _time(workers: int, count: int, size: int, repeat: int) -> float:
+    settings.UPLOAD_WORKERS = workers
+    samples = []
+    for _ in range(repeat):
+        uploads = _uploads(count, size)
+        start = time.perf_counter()
+        storage.save_all(uploads)
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--size-mb", type=float, default=3.0)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--dir", help="parent of the temp storage dir (default: system temp; use the real storage disk)")
+    args = parser.parse_args()
+    size = int(args.size_mb * 1024 * 1024)
+    workers = settings.UPLOAD_WORKERS
+    with tempfile.TemporaryDirectory(dir=args.dir) as storage_dir:
+        settings.STORAGE_DIR = os.path.abspath(storage_dir)
+        for count in (5, 10, 15):
+            serial = _time(1, count, size, args.repeat)
+            parallel = _time(workers, count, size, args.repeat)
+            print(f"{count:>2} images: serial {serial:.0f} ms, {workers} workers {parallel:.0f} ms ({serial / parallel:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""
+Build missing thumbnail/detail/WebP variants for existing vehicle images.
+Run from project root after `alembic upgrade head`: python -m scripts.build_image_variants [--batch 200]
+"""
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.database import SessionLocal
+from app.vehicles import images
+from app.vehicles.models import VehicleImage
+
+
+def build_missing(batch: int) -> tuple[int, int]:
+    """Return (built, failed)."""
+    built = failed = 0
+    last_id = 0
+    db = SessionLocal()
+    try:
+        while True:
+            rows = (
+                db.query(VehicleImage.id, VehicleImage.image_path)
+                .filter(VehicleImage.variants.is_(None), VehicleImage.id > last_id)
+                .order_by(VehicleImage.id)
+                .limit(batch)
+                .all()
+            )
+            if not rows:
+                break
+            for image_id, image_path in rows:
+                last_id = image_id
+                try:
+                    paths = images.build_variants(image_path)
+                except Exception as e:
+                    failed += 1
+                    print(f"FAIL image {image_id} ({image_path}): {e}")
+                    continue
+                db.query(VehicleImage).filter(VehicleImage.id == image_id).update({"variants": paths})
+                built += 1
+            db.commit()
+    finally:
+        db.close()
+    return built, failed
+
+
+if __name__ == "__main__":
+    if images.Image is None:
+        sys.exit("Pillow is not installed (pip install -r requirements.txt)")
+    parser = argparse.ArgumentParser(description="Build missing vehicle image variants")
+    parser.add_argument("--batch", type=int, default=200)
+    built, failed = build_missing(parser.parse_args().batch)
+    print(f"Built variants for {built} images, {failed} failed")
+    sys.exit(1 if failed else 0)
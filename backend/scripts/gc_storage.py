@@ -0,0 +1,97 @@
+"""
+Delete image files that no vehicle_images row references (orphans), e.g. from
+uploads whose request failed after the files were written.
+Run from project root: python -m scripts.gc_storage [--dry-run] [--batch 500] [--pause 0.2] [--grace-minutes N]
+
+Walks STORAGE_DIR/vehicles in batches, checks each batch with one indexed query
+and sleeps between batches to limit disk and database load. A variant file is
+kept while its original is referenced. Files younger than the grace period
+(default STORAGE_GRACE_MINUTES) are never touched, so uploads that have not committed yet are safe (re-uploading a
+stored file refreshes its mtime). Leftover .part/.tmp files past the grace
+period are removed too.
+"""
+import argparse
+import os
+import sys
+import time
+from itertools import islice
+from pathlib import Path
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.config import settings
+from app.database import SessionLocal
+from app.vehicles import images, storage
+from app.vehicles.models import VehicleImage
+
+
+def _walk(directory: Path):
+    """Yield files under `directory` without building the full listing in memory."""
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                yield from _walk(Path(entry.path))
+            elif entry.is_file(follow_symlinks=False):
+                yield entry
+
+
+def _candidates(rel: str) -> set:
+    """Paths that, if referenced by an image row, keep file `rel` alive."""
+    stem = images.variant_source_stem(rel)
+    if stem is None:
+        return {rel}
+    return {f"{stem}.{ext}" for ext in storage.ALLOWED_EXTENSIONS}
+
+
+def collect(batch: int, pause: float, grace_minutes: float, dry_run: bool) -> tuple[int, int, int]:
+    """Return (files checked, orphans deleted or found, bytes)."""
+    root = Path(settings.STORAGE_DIR)
+    cutoff = time.time() - grace_minutes * 60
+    checked = orphans = freed = 0
+    files = _walk(root / "vehicles")
+    db = SessionLocal()
+    try:
+        while chunk := list(islice(files, batch)):
+            doomed = []
+            pending = {}
+            for entry in chunk:
+                checked += 1
+                stat = entry.stat(follow_symlinks=False)
+                if stat.st_mtime > cutoff:
+                    continue
+                rel = Path(entry.path).relative_to(root).as_posix()
+                if entry.name.endswith(storage.TEMP_SUFFIXES):
+                    doomed.append((rel, stat.st_size))
+                else:
+                    pending[rel] = (_candidates(rel), stat.st_size)
+            if pending:
+                wanted = set().union(*(c for c, _ in pending.values()))
+                referenced = {
+                    p for (p,) in db.query(VehicleImage.image_path).filter(VehicleImage.image_path.in_(wanted)).distinct()
+                }
+                db.rollback()  # end the read transaction between batches
+                doomed += [(rel, size) for rel, (c, size) in pending.items() if not c & referenced]
+            for rel, size in doomed:
+                orphans += 1
+                freed += size
+                print(f"{'would delete' if dry_run else 'delete'} {rel}")
+                if not dry_run:
+                    (root / rel).unlink(missing_ok=True)
+            if pause:
+                time.sleep(pause)
+    finally:
+        db.close()
+    return checked, orphans, freed
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Delete unreferenced vehicle image files")
+    parser.add_argument("--batch", type=int, default=500, help="files per reference query")
+    parser.add_argument("--pause", type=float, default=0.2, help="seconds to sleep between batches")
+    parser.add_argument("--grace-minutes", type=float, default=settings.STORAGE_GRACE_MINUTES,
+                        help="never delete files modified more recently")
+    parser.add_argument("--dry-run", action="store_true", help="only print what would be deleted")
+    args = parser.parse_args()
+    checked, orphans, freed = collect(args.batch, args.pause, args.grace_minutes, args.dry_run)
+    verb = "Would delete" if args.dry_run else "Deleted"
+    print(f"Checked {checked} files. {verb} {orphans} orphans ({freed / 1024 / 1024:.1f} MB)")
@@ -0,0 +1,102 @@
+"""
+Move images stored under the old flat layout (vehicles/<name>.<ext>) to the
+content-addressed, sharded layout (vehicles/ab/cd/<sha256>.<ext>) and update
+vehicle_images. Safe to re-run; already-migrated paths are skipped.
+Run from project root: python -m scripts.migrate_storage_layout [--batch 200] [--dry-run]
+
+Per file: hard-link the original and its variants under the new name, commit
+the new paths, then unlink the old names, so an interruption at any point
+leaves every row pointing at an existing file.
+"""
+import argparse
+import hashlib
+import os
+import re
+import sys
+from pathlib import Path
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.config import settings
+from app.database import SessionLocal
+from app.vehicles import images, storage
+from app.vehicles.models import VehicleImage
+
+SHARDED = re.compile(r"^vehicles/[0-9a-f]{2}/[0-9a-f]{2}/[0-9a-f]{64}\.")
+
+
+def _sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(storage.CHUNK_SIZE):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _link(src: Path, dst: Path) -> None:
+    dst.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        os.link(src, dst)
+    except FileExistsError:
+        pass  # same content already stored under the new layout
+
+
+def migrate(batch: int, dry_run: bool) -> tuple[int, int]:
+    """Return (migrated paths, missing files)."""
+    root = Path(settings.STORAGE_DIR)
+    migrated = missing = 0
+    last_path = ""
+    db = SessionLocal()
+    try:
+        while True:
+            old_paths = [
+                p for (p,) in db.query(VehicleImage.image_path)
+                .filter(VehicleImage.image_path > last_path)
+                .distinct()
+                .order_by(VehicleImage.image_path)
+                .limit(batch)
+            ]
+            if not old_paths:
+                break
+            last_path = old_paths[-1]
+            unlink_after_commit = []
+            for old in old_paths:
+                if SHARDED.match(old):
+                    continue
+                src = root / old
+                if not src.is_file():
+                    missing += 1
+                    print(f"MISSING {old}")
+                    continue
+                ext = storage.extension(old)
+                new = storage.content_path(_sha256(src), ext)
+                print(f"{old} -> {new}")
+                migrated += 1
+                if dry_run:
+                    continue
+                _link(src, root / new)
+                unlink_after_commit.append(src)
+                for name in images.VARIANTS:
+                    old_variant = root / images.variant_path(old, name)
+                    if old_variant.is_file():
+                        _link(old_variant, root / images.variant_path(new, name))
+                        unlink_after_commit.append(old_variant)
+                for img in db.query(VehicleImage).filter(VehicleImage.image_path == old):
+                    img.image_path = new
+                    if img.variants:
+                        img.variants = {name: images.variant_path(new, name) for name in img.variants}
+            db.commit()
+            for path in unlink_after_commit:
+                path.unlink(missing_ok=True)
+    finally:
+        db.close()
+    return migrated, missing
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Move flat-layout vehicle images to sharded content-addressed paths")
+    parser.add_argument("--batch", type=int, default=200, help="distinct image paths per transaction")
+    parser.add_argument("--dry-run", action="store_true", help="only print what would move")
+    args = parser.parse_args()
+    migrated, missing = migrate(args.batch, args.dry_run)
+    print(f"{'Would migrate' if args.dry_run else 'Migrated'} {migrated} files; {missing} referenced files missing")
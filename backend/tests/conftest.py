@@ -0,0 +1,97 @@
+"""Shared fixtures.
+
+Tests marked `db` need a migrated PostgreSQL (DATABASE_URL or DB_*, then
+`alembic upgrade head`) and are skipped when it cannot be reached. They run
+with QUERY_BUDGET_STRICT on and the response/count caches off, so every request
+takes its full path and any endpoint over its @query_budget fails its test.
+Use a dedicated database: the tests create (and remove) their own account.
+"""
+import os
+import tempfile
+import uuid
+
+# Settings are read when app modules are first imported, so these must come first
+os.environ["QUERY_BUDGET_STRICT"] = "true"
+for _cache_ttl in ("BROWSE_CACHE_TTL_SECONDS", "COUNT_CACHE_TTL_SECONDS", "SHARE_PAGE_CACHE_TTL_SECONDS"):
+    os.environ[_cache_ttl] = "0"
+os.environ["STORAGE_DIR"] = tempfile.mkdtemp(prefix="rathinam-test-storage-")
+
+import pytest  # noqa: E402
+
+PASSWORD = "secret123"
+
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "db: needs a migrated PostgreSQL database (skipped when unreachable)")
+
+
+@pytest.fixture(scope="session")
+def database():
+    from app.database import check_connection
+
+    ok, error = check_connection()
+    if not ok:
+        pytest.skip(f"PostgreSQL not reachable: {error}")
+
+
+@pytest.fixture(scope="session")
+def client(database):
+    from fastapi.testclient import TestClient
+
+    import main
+
+    with TestClient(main.app) as client:
+        yield client
+
+
+@pytest.fixture(scope="session")
+def account(database):
+    """A throwaway account with one user; deleted (with its vehicles) at the end of the session."""
+    from sqlalchemy import delete
+
+    from app.auth.models import Account, User
+    from app.core.security import hash_password
+    from app.database import SessionLocal
+
+    tag = uuid.uuid4().hex[:8]
+    with SessionLocal() as db:
+        acc = Account(name=f"Test {tag}", slug=f"test-{tag}")
+        db.add(acc)
+        db.flush()
+        user = User(email=f"test-{tag}@example.com", password_hash=hash_password(PASSWORD), is_active=True,
+                    is_staff=False, is_superuser=False, account_id=acc.id)
+        db.add(user)
+        db.commit()
+        ids = {"account_id": acc.id, "email": user.email}
+    yield ids
+    with SessionLocal() as db:
+        db.execute(delete(Account).where(Account.id == ids["account_id"]))
+        db.commit()
+
+
+@pytest.fixture(scope="session")
+def auth_headers(client, account) -> dict:
+    r = client.post("/auth/login", json={"email": account["email"], "password": PASSWORD})
+    assert r.status_code == 200, r.text
+    return {"Authorization": f"Bearer {r.json()['access_token']}"}
+
+
+@pytest.fixture
+def image_file():
+    """Multipart image upload; storage only checks the extension, so content is random (and unique) bytes."""
+    def make(name: str = "photo.jpg") -> tuple:
+        return ("images", (name, b"\xff\xd8\xff" + uuid.uuid4().bytes, "image/jpeg"))
+    return make
+
+
+@pytest.fixture
+def create_vehicle(client, auth_headers, image_file):
+    """POST /vehicles with `images` uploads; returns the created vehicle JSON."""
+    def create(images: int = 2, **fields) -> dict:
+        data = {"name": "Swift VXi", "product": "car", "amount": 450000, "model_year": 2019, "mileage": 42000,
+                "location": "Chennai", **fields}
+        data = {k: v for k, v in data.items() if v is not None}  # a form field cannot be null: leave it out
+        r = client.post("/vehicles", headers=auth_headers, data=data, files=[image_file() for _ in range(images)])
+        assert r.status_code == 201, r.text
+        return r.json()
+    return create
@@ -0,0 +1,77 @@
+"""PATCH/DELETE /vehicles/batch: only the caller's account is ever touched."""
+import uuid
+
+import pytest
+from sqlalchemy import delete
+
+from app.auth.models import Account
+from app.database import SessionLocal
+from app.vehicles.models import Vehicle
+
+pytestmark = pytest.mark.db
+
+
+@pytest.fixture
+def foreign_vehicle(database) -> int:
+    """A sold car of another account; the account is removed afterwards."""
+    tag = uuid.uuid4().hex[:8]
+    with SessionLocal() as db:
+        acc = Account(name=f"Other {tag}", slug=f"other-{tag}")
+        db.add(acc)
+        db.flush()
+        vehicle = Vehicle(name="Their Swift", account_id=acc.id, product="car", amount=1, model_year=2019,
+                          status="sold", location="Madurai")
+        db.add(vehicle)
+        db.commit()
+        account_id, vehicle_id = acc.id, vehicle.id
+    yield vehicle_id
+    with SessionLocal() as db:
+        db.execute(delete(Account).where(Account.id == account_id))
+        db.commit()
+
+
+def _vehicle(vehicle_id: int):
+    with SessionLocal() as db:
+        return db.get(Vehicle, vehicle_id)
+
+
+def test_patch_by_ids_ignores_other_accounts(client, auth_headers, create_vehicle, foreign_vehicle):
+    mine = [create_vehicle(images=0)["id"] for _ in range(2)]
+    r = client.patch("/vehicles/batch", headers=auth_headers,
+                     json={"ids": [*mine, foreign_vehicle], "patch": {"status": "sold", "amount": 99}})
+    assert r.status_code == 200, r.text
+    assert r.json() == {"matched": 2, "ids": sorted(mine)}
+    assert all((_vehicle(i).status, _vehicle(i).amount) == ("sold", 99) for i in mine)
+    theirs = _vehicle(foreign_vehicle)
+    assert (theirs.status, theirs.amount) == ("sold", 1)
+
+
+def test_patch_by_filter_ignores_other_accounts(client, auth_headers, create_vehicle, foreign_vehicle):
+    mine = create_vehicle(images=0)["id"]
+    assert client.patch(f"/vehicles/{mine}", headers=auth_headers, json={"status": "sold"}).status_code == 200
+    location = f"Batch {uuid.uuid4().hex[:8]}"
+    r = client.patch("/vehicles/batch", headers=auth_headers,
+                     json={"filter": {"status": "sold", "product": "car"}, "patch": {"location": location}})
+    assert r.status_code == 200, r.text
+    assert mine in r.json()["ids"] and foreign_vehicle not in r.json()["ids"]
+    assert _vehicle(mine).location == location
+    assert _vehicle(foreign_vehicle).location == "Madurai"
+
+
+def test_patch_needs_a_selection_and_a_change(client, auth_headers, create_vehicle):
+    mine = create_vehicle(images=0)["id"]
+    assert client.patch("/vehicles/batch", headers=auth_headers, json={"ids": [mine], "patch": {}}).status_code == 400
+    assert client.patch("/vehicles/batch", headers=auth_headers,
+                        json={"filter": {}, "patch": {"amount": 1}}).status_code == 422
+
+
+def test_delete_ignores_other_accounts(client, auth_headers, create_vehicle, foreign_vehicle):
+    mine = create_vehicle(images=1)["id"]
+    keep = create_vehicle(images=0, product="bike")["id"]
+    r = client.request("DELETE", "/vehicles/batch", headers=auth_headers,
+                       json={"ids": [mine, keep, foreign_vehicle], "filter": {"product": "car"}})
+    assert r.status_code == 200, r.text
+    assert r.json() == {"matched": 1, "ids": [mine]}
+    assert _vehicle(mine) is None
+    assert _vehicle(keep) is not None and _vehicle(foreign_vehicle) is not None
+    assert client.get(f"/vehicles/{mine}", headers=auth_headers).status_code == 404
@@ -0,0 +1,113 @@
+import io
+import json
+import uuid
+
+import pytest
+
+from app.core.config import settings
+from app.vehicles import bulk_import
+
+CSV = (
+    "\ufeffname,product,amount,model_year,mileage,location\n"
+    "Swift VXi, CAR ,450000,2019,42000, Chennai \n"
+    "No price,car,,2019,,\n"
+    "Pulsar,bike,90000,2021,,\n"
+)
+
+
+class _RecordingSession:
+    """Stands in for the Session: records each executemany's rows."""
+
+    def __init__(self):
+        self.batches = []
+
+    def execute(self, stmt, rows):
+        self.batches.append(list(rows))
+
+
+def _rows(text: str, fmt: str):
+    return bulk_import.read_rows(io.BytesIO(text.encode("utf-8")), fmt)
+
+
+@pytest.mark.parametrize("fmt, filename, content_type, expected", [
+    ("NDJSON", "cars.csv", None, "ndjson"),
+    (None, "Cars.CSV", None, "csv"),
+    (None, "cars.jsonl", "text/csv", "ndjson"),
+    (None, "upload", "text/csv; charset=utf-8", "csv"),
+    (None, None, "application/x-ndjson", "ndjson"),
+])
+def test_detect_format(fmt, filename, content_type, expected):
+    assert bulk_import.detect_format(fmt, filename, content_type) == expected
+
+
+def test_detect_format_rejects():
+    with pytest.raises(bulk_import.ImportRejected, match="Invalid format"):
+        bulk_import.detect_format("xlsx", "cars.csv", None)
+    with pytest.raises(bulk_import.ImportRejected, match="Cannot tell"):
+        bulk_import.detect_format(None, "cars.txt", "text/plain")
+
+
+def test_csv_rows_are_validated_and_normalised():
+    db = _RecordingSession()
+    result = bulk_import.import_vehicles(db, 7, _rows(CSV, "csv"))
+    assert (result.inserted, result.failed) == (2, 1)
+    assert result.errors[0].row == 3
+    assert result.errors[0].errors == ["amount: Field required"]
+    (rows,) = db.batches
+    assert [(r["name"], r["product"], r["location"], r["mileage"]) for r in rows] == [
+        ("Swift VXi", "car", "Chennai", 42000), ("Pulsar", "bike", None, None)]
+    assert all(r["account_id"] == 7 and r["status"] == "active" for r in rows)
+
+
+def test_csv_missing_columns():
+    with pytest.raises(bulk_import.ImportRejected, match="Missing CSV columns: product, amount"):
+        bulk_import.import_vehicles(_RecordingSession(), 7, _rows("name,model_year\nSwift,2019\n", "csv"))
+
+
+def test_ndjson_bad_lines_are_reported_by_line_number():
+    lines = [
+        json.dumps({"name": "Swift", "product": "car", "amount": 1, "model_year": 2019}),
+        "",
+        "{not json",
+        json.dumps(["a", "list"]),
+        json.dumps({"name": "Nexon", "product": "ev", "amount": 2, "model_year": 2030}),
+    ]
+    result = bulk_import.import_vehicles(_RecordingSession(), 7, _rows("\n".join(lines), "ndjson"))
+    assert result.inserted == 2
+    assert [(e.row, e.errors[0]) for e in result.errors] == [
+        (3, "Invalid JSON"), (4, "Input should be a valid dictionary or instance of VehicleCreate")]
+
+
+def test_rows_are_inserted_in_batches(monkeypatch):
+    monkeypatch.setattr(settings, "IMPORT_BATCH_SIZE", 2)
+    lines = "".join(json.dumps({"name": f"V{i}", "product": "car", "amount": i, "model_year": 2020}) + "\n"
+                    for i in range(5))
+    db = _RecordingSession()
+    assert bulk_import.import_vehicles(db, 7, _rows(lines, "ndjson")).inserted == 5
+    assert [len(b) for b in db.batches] == [2, 2, 1]
+
+
+def test_too_many_rows(monkeypatch):
+    monkeypatch.setattr(settings, "IMPORT_MAX_ROWS", 2)
+    with pytest.raises(bulk_import.ImportRejected, match="Too many rows \\(max 2\\)"):
+        bulk_import.import_vehicles(_RecordingSession(), 7, _rows(CSV, "csv"))
+
+
+def test_unreadable_file():
+    with pytest.raises(bulk_import.ImportRejected, match="Unreadable CSV"):
+        list(bulk_import.read_rows(io.BytesIO(b"name,product\n\xff\xfe\n"), "csv"))
+
+
+@pytest.mark.db
+def test_import_endpoint(client, auth_headers):
+    tag = uuid.uuid4().hex[:8]
+    body = CSV.replace("Swift VXi", f"Swift {tag}").replace("Pulsar", f"Pulsar {tag}")
+    r = client.post("/vehicles/import", headers=auth_headers, files={"file": ("stock.csv", body.encode(), "text/csv")})
+    assert r.status_code == 200, r.text
+    assert r.json() == {"inserted": 2, "failed": 1, "errors": [{"row": 3, "errors": ["amount: Field required"]}]}
+    names = {v["name"] for v in client.get("/vehicles", headers=auth_headers, params={"per_page": 100}).json()["items"]}
+    assert {f"Swift {tag}", f"Pulsar {tag}"} <= names
+
+    r = client.post("/vehicles/import", headers=auth_headers, files={"file": ("stock.xlsx", b"...", "application/octet-stream")})
+    assert r.status_code == 400
+    assert "Cannot tell the file format" in r.json()["detail"]
@@ -0,0 +1,60 @@
+import pytest
+
+from app.core import cache
+from app.core.cache import TTLCache
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(cache.time, "monotonic", lambda: now[0])
+    return now
+
+
+def test_get_set_and_counters(clock):
+    c = TTLCache(maxsize=10, ttl=30)
+    assert c.get("a") is None
+    assert c.get("a", "fallback") == "fallback"
+    c.set("a", 1)
+    assert c.get("a") == 1
+    assert c.stats() == {"size": 1, "maxsize": 10, "hits": 1, "misses": 2}
+
+
+def test_entries_expire(clock):
+    c = TTLCache(maxsize=10, ttl=30)
+    c.set("a", 1)
+    c.set("b", 2, ttl=60)
+    clock[0] += 30
+    assert c.get("a") is None  # expires at exactly ttl
+    assert c.get("b") == 2
+    assert c.stats()["size"] == 1
+
+
+def test_zero_ttl_never_hits(clock):
+    c = TTLCache(maxsize=10, ttl=0)
+    c.set("a", 1)
+    assert c.get("a") is None
+
+
+def test_least_recently_used_is_evicted(clock):
+    c = TTLCache(maxsize=2, ttl=30)
+    c.set("a", 1)
+    c.set("b", 2)
+    c.get("a")  # "b" is now the least recently used
+    c.set("c", 3)
+    assert c.get("b") is None
+    assert c.get("a") == 1 and c.get("c") == 3
+
+
+def test_invalidate_pop_and_clear(clock):
+    c = TTLCache(maxsize=10, ttl=30)
+    for key in [("acct", 1, "p1"), ("acct", 1, "p2"), ("acct", 2, "p1")]:
+        c.set(key, "page")
+    assert c.invalidate(lambda k: k[1] == 1) == 2
+    assert c.get(("acct", 2, "p1")) == "page"
+    c.pop(("acct", 2, "p1"))
+    c.pop("missing")
+    assert c.stats()["size"] == 0
+    c.set("x", 1)
+    c.clear()
+    assert c.get("x") is None
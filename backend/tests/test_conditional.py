@@ -0,0 +1,54 @@
+from datetime import datetime, timezone
+
+from starlette.requests import Request
+
+from app.vehicles.conditional import VehicleVersion, cache_headers, is_not_modified
+
+MODIFIED = datetime(2026, 3, 1, 12, 30, 5, 500000, tzinfo=timezone.utc)
+ETAG = '"abc"'
+
+
+def _request(**headers) -> Request:
+    raw = [(name.replace("_", "-").lower().encode(), value.encode()) for name, value in headers.items()]
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": raw})
+
+
+def test_no_validators():
+    assert not is_not_modified(_request(), ETAG, MODIFIED)
+
+
+def test_if_none_match():
+    assert is_not_modified(_request(if_none_match=ETAG), ETAG, MODIFIED)
+    assert is_not_modified(_request(if_none_match=f'"old", W/{ETAG}'), ETAG, MODIFIED)
+    assert is_not_modified(_request(if_none_match="*"), ETAG, MODIFIED)
+    assert not is_not_modified(_request(if_none_match='"old"'), ETAG, MODIFIED)
+
+
+def test_if_none_match_wins_over_if_modified_since():
+    request = _request(if_none_match='"old"', if_modified_since="Sun, 01 Mar 2026 12:30:05 GMT")
+    assert not is_not_modified(request, ETAG, MODIFIED)
+
+
+def test_if_modified_since():
+    # HTTP dates have whole seconds; the sub-second part of last_modified is ignored
+    assert is_not_modified(_request(if_modified_since="Sun, 01 Mar 2026 12:30:05 GMT"), ETAG, MODIFIED)
+    assert is_not_modified(_request(if_modified_since="Mon, 02 Mar 2026 00:00:00 GMT"), ETAG, MODIFIED)
+    assert not is_not_modified(_request(if_modified_since="Sun, 01 Mar 2026 12:30:04 GMT"), ETAG, MODIFIED)
+    assert not is_not_modified(_request(if_modified_since="yesterday"), ETAG, MODIFIED)
+    assert not is_not_modified(_request(if_modified_since="Sun, 01 Mar 2026 12:30:05 GMT"), ETAG, None)
+
+
+def test_etag_changes_with_version_and_representation():
+    version = VehicleVersion(1, 2, "active", MODIFIED, (10, 11), None)
+    assert version.etag("json") != version.etag("html")
+    assert version.etag("json") != version._replace(image_ids=(10,)).etag("json")
+    assert version.etag("json") != version._replace(images_updated_at=MODIFIED).etag("json")
+    assert version.etag("json") == VehicleVersion(1, 2, "active", MODIFIED, (10, 11), None).etag("json")
+
+
+def test_cache_headers():
+    headers = cache_headers(ETAG, MODIFIED, public=True)
+    assert headers["ETag"] == ETAG
+    assert headers["Last-Modified"] == "Sun, 01 Mar 2026 12:30:05 GMT"
+    assert headers["Cache-Control"].startswith("public, max-age=")
+    assert cache_headers(ETAG, None, public=False) == {"ETag": ETAG, "Cache-Control": "private, no-cache"}
@@ -0,0 +1,62 @@
+import pytest
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.database import SessionLocal
+from app.vehicles import counts
+from app.vehicles.models import Vehicle
+
+pytestmark = pytest.mark.db
+
+
+@pytest.fixture
+def totals(monkeypatch):
+    """A live totals cache (the test session runs with COUNT_CACHE_TTL_SECONDS=0)."""
+    cache = TTLCache(maxsize=16, ttl=60)
+    monkeypatch.setattr(counts, "_totals", cache)
+    return cache
+
+
+def _account_query(db, account_id: int):
+    return db.query(Vehicle).filter(Vehicle.account_id == account_id)
+
+
+def test_total_is_cached_until_its_account_changes(totals, account, create_vehicle):
+    account_id = account["account_id"]
+    scope = ("account", account_id, "test-counts")
+    create_vehicle(images=0)
+    with SessionLocal() as db:
+        total, exact = counts.count_total(db, _account_query(db, account_id), scope)
+        assert exact and total == _account_query(db, account_id).count()
+        # Written behind the app's back, so nothing invalidates the cached total
+        db.add(Vehicle(name="Uncounted", product="car", amount=1, model_year=2020, account_id=account_id))
+        db.commit()
+        assert counts.count_total(db, _account_query(db, account_id), scope) == (total, True)  # cached
+        counts.invalidate(account_id + 1_000_000)  # another tenant's change keeps it
+        assert counts.count_total(db, _account_query(db, account_id), scope) == (total, True)
+        counts.invalidate(account_id)
+        assert counts.count_total(db, _account_query(db, account_id), scope) == (total + 1, True)
+
+
+def test_browse_totals_are_dropped_by_any_change(totals):
+    totals.set(("browse", None), (10, True))
+    totals.set(("account", 1, None), (3, True))
+    counts.invalidate(2)
+    assert totals.get(("browse", None)) is None
+    assert totals.get(("account", 1, None)) == (3, True)
+
+
+def test_large_listings_use_the_planner_estimate(totals, monkeypatch, account, create_vehicle):
+    create_vehicle(images=0)
+    monkeypatch.setattr(settings, "COUNT_ESTIMATE_THRESHOLD", 1)
+    with SessionLocal() as db:
+        total, exact = counts.count_total(db, db.query(Vehicle), ("browse", "test-estimate"))
+    assert not exact
+    assert total >= 1
+
+
+def test_browse_reports_an_estimate_as_not_exact(client, monkeypatch):
+    monkeypatch.setattr(settings, "COUNT_ESTIMATE_THRESHOLD", 1)
+    r = client.get("/vehicles/browse", params={"location": "Chennai"})
+    assert r.status_code == 200, r.text
+    assert r.json()["total_exact"] is False
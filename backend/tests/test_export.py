@@ -0,0 +1,36 @@
+import csv
+import io
+import json
+
+import pytest
+
+from app.vehicles import export
+
+pytestmark = pytest.mark.db
+
+
+def test_ndjson_export_streams_the_accounts_vehicles(client, auth_headers, create_vehicle):
+    vehicle = create_vehicle(images=2, product="ev")
+    # Runs under QUERY_BUDGET_STRICT: the streamed SELECT counts against the endpoint's budget
+    r = client.get("/vehicles/export", headers=auth_headers, params={"product": "ev"})
+    assert r.status_code == 200, r.text
+    assert r.headers["content-type"] == "application/x-ndjson"
+    assert r.headers["content-disposition"].startswith('attachment; filename="vehicles-')
+    rows = [json.loads(line) for line in r.text.splitlines()]
+    assert {row["product"] for row in rows} == {"ev"}
+    (exported,) = [row for row in rows if row["id"] == vehicle["id"]]
+    assert len(exported["images"]) == 2
+
+
+def test_csv_export_has_the_import_columns(client, auth_headers, create_vehicle):
+    vehicle = create_vehicle(images=1)
+    r = client.get("/vehicles/export", headers=auth_headers, params={"format": "csv"})
+    assert r.status_code == 200, r.text
+    reader = csv.DictReader(io.StringIO(r.text))
+    assert reader.fieldnames == export.CSV_COLUMNS
+    (row,) = [row for row in reader if row["id"] == str(vehicle["id"])]
+    assert row["name"] == vehicle["name"] and row["images"].startswith("vehicles/")
+
+
+def test_export_rejects_unknown_formats(client, auth_headers):
+    assert client.get("/vehicles/export", headers=auth_headers, params={"format": "xml"}).status_code == 400
@@ -0,0 +1,66 @@
+import io
+import time
+import uuid
+from pathlib import Path
+
+import pytest
+from PIL import Image
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.database import SessionLocal
+from app.vehicles import images, response_cache
+
+pytestmark = pytest.mark.db
+
+
+def _jpeg(width: int = 1600, height: int = 900) -> bytes:
+    out = io.BytesIO()
+    Image.new("RGB", (width, height), (200, 30, 30)).save(out, "JPEG")
+    return out.getvalue()
+
+
+def _browse_variants(client, where: str) -> dict:
+    r = client.get("/vehicles/browse", params={"location": where})
+    assert r.status_code == 200, r.text
+    return r.json()["items"][0]["images"][0]["variants"]
+
+
+def test_variants_are_built_and_reach_cached_pages(client, auth_headers, monkeypatch):
+    monkeypatch.setattr(settings, "BROWSE_CACHE_TTL_SECONDS", 60)
+    monkeypatch.setattr(response_cache, "_pages", TTLCache(maxsize=16, ttl=60))
+    where = f"Varianton {uuid.uuid4().hex[:8]}"
+    data = {"name": "Variant car", "product": "car", "amount": 500000, "model_year": 2020, "location": where}
+    r = client.post("/vehicles", headers=auth_headers, data=data,
+                    files=[("images", ("big.jpg", _jpeg(), "image/jpeg"))])
+    assert r.status_code == 201, r.text
+    image_path = r.json()["images"][0]["image_path"]
+    assert _browse_variants(client, where) == {}  # now cached
+
+    with SessionLocal() as db:  # what the worker does
+        images._build_variants_job(db, {"paths": [image_path]})
+
+    root = Path(settings.STORAGE_DIR)
+    assert set(images.VARIANTS) <= set(_variants_after_notify(client, where))
+    with Image.open(root / images.variant_path(image_path, "thumb")) as thumb:
+        assert max(thumb.size) == images.VARIANTS["thumb"].max_side
+
+
+def _variants_after_notify(client, where: str, timeout: float = 5.0) -> dict:
+    """The job's NOTIFY reaches the app's listener asynchronously."""
+    deadline = time.monotonic() + timeout
+    while True:
+        variants = _browse_variants(client, where)
+        if variants or time.monotonic() > deadline:
+            return variants
+        time.sleep(0.05)
+
+
+def test_undecodable_upload_gets_no_variants(client, create_vehicle):
+    vehicle = create_vehicle(images=1)  # random bytes with a .jpg name
+    image_path = vehicle["images"][0]["image_path"]
+    with SessionLocal() as db:
+        images._build_variants_job(db, {"paths": [image_path]})
+    r = client.get(f"/vehicles/browse/{vehicle['id']}")
+    assert r.json()["images"][0]["variants"] == {}
+    assert (Path(settings.STORAGE_DIR) / image_path).exists()
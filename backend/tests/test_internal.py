@@ -0,0 +1,63 @@
+"""/internal/* is for platform operators (is_superuser), not for any account's Administrator."""
+import uuid
+
+import pytest
+from sqlalchemy import delete
+
+from app.auth.models import Account, Role, User, UserRole
+from app.core.security import hash_password
+from app.database import SessionLocal
+
+pytestmark = pytest.mark.db
+
+PASSWORD = "secret123"
+
+ENDPOINTS = ["/internal/cache-stats", "/internal/jobs", "/internal/pool"]
+
+
+@pytest.fixture(scope="module")
+def users(client) -> dict:
+    """Login headers of an account's Administrator and of a platform operator (no role) in the same account."""
+    tag = uuid.uuid4().hex[:8]
+    with SessionLocal() as db:
+        acc = Account(name=f"Internal {tag}", slug=f"internal-{tag}")
+        db.add(acc)
+        db.flush()
+        role = Role(name="Administrator", account_id=acc.id)
+        admin = User(email=f"admin-{tag}@example.com", password_hash=hash_password(PASSWORD), is_active=True,
+                     is_staff=True, is_superuser=False, account_id=acc.id)
+        operator = User(email=f"ops-{tag}@example.com", password_hash=hash_password(PASSWORD), is_active=True,
+                        is_staff=False, is_superuser=True, account_id=acc.id)
+        db.add_all([role, admin, operator])
+        db.flush()
+        db.add(UserRole(user_id=admin.id, role_id=role.id))
+        db.commit()
+        account_id, emails = acc.id, {"admin": admin.email, "operator": operator.email}
+    headers = {}
+    for name, email in emails.items():
+        r = client.post("/auth/login", json={"email": email, "password": PASSWORD})
+        assert r.status_code == 200, r.text
+        headers[name] = {"Authorization": f"Bearer {r.json()['access_token']}"}
+    yield headers
+    with SessionLocal() as db:
+        db.execute(delete(Account).where(Account.id == account_id))
+        db.commit()
+
+
+@pytest.mark.parametrize("path", ENDPOINTS)
+def test_account_administrator_is_forbidden(client, users, path):
+    assert client.get("/auth/admin/ping", headers=users["admin"]).status_code == 200  # really is an Administrator
+    r = client.get(path, headers=users["admin"])
+    assert r.status_code == 403
+    assert r.json()["detail"] == "Insufficient permissions"
+
+
+@pytest.mark.parametrize("path", ENDPOINTS)
+def test_plain_users_and_anonymous_are_refused(client, auth_headers, path):
+    assert client.get(path, headers=auth_headers).status_code == 403
+    assert client.get(path).status_code == 401
+
+
+@pytest.mark.parametrize("path", ENDPOINTS)
+def test_operator_is_allowed(client, users, path):
+    assert client.get(path, headers=users["operator"]).status_code == 200
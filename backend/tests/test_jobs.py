@@ -0,0 +1,166 @@
+import logging
+import uuid
+from datetime import timedelta
+
+import pytest
+from sqlalchemy import delete, func, text, update
+
+from app.core.config import settings
+from app.database import SessionLocal
+from app.jobs import queue, worker
+from app.jobs.models import Job
+
+# Due a year ago, so claim() takes these ahead of any other job in the table
+OVERDUE = -365 * 24 * 3600
+
+
+@pytest.fixture
+def kind(database):
+    """A job kind of this test only; its jobs (and those of kinds starting with it) are deleted afterwards."""
+    kind = f"test.{uuid.uuid4().hex[:8]}"
+    yield kind
+    with SessionLocal() as db:
+        db.execute(delete(Job).where(Job.kind.startswith(kind)))
+        db.commit()
+
+
+def _enqueue(kind: str, count: int = 1, **kwargs) -> list[int]:
+    with SessionLocal() as db:
+        jobs = [queue.enqueue(db, kind, {"n": n}, delay_seconds=OVERDUE, **kwargs) for n in range(count)]
+        db.commit()
+        return [job.id for job in jobs]
+
+
+def _job(job_id: int) -> Job:
+    with SessionLocal() as db:
+        return db.get(Job, job_id)
+
+
+@pytest.mark.db
+def test_enqueue_is_part_of_the_callers_transaction(kind):
+    with SessionLocal() as db:
+        job = queue.enqueue(db, kind, {"n": 1})
+        db.flush()
+        job_id = job.id
+        db.rollback()
+    assert _job(job_id) is None
+
+
+@pytest.mark.db
+def test_claim_locks_due_jobs_oldest_first(kind):
+    first, second = _enqueue(kind, 2)
+    with SessionLocal() as db:
+        claimed = queue.claim(db, "w1", limit=2)
+    assert [(j.id, j.kind, j.payload, j.attempts) for j in claimed] == [(first, kind, {"n": 0}, 1), (second, kind, {"n": 1}, 1)]
+    job = _job(first)
+    assert (job.status, job.locked_by, job.attempts) == (queue.RUNNING, "w1", 1)
+    assert job.locked_at is not None
+
+
+@pytest.mark.db
+def test_claim_skips_jobs_locked_by_another_worker(kind):
+    first, second = _enqueue(kind, 2)
+    with SessionLocal() as other, SessionLocal() as db:
+        # Another worker is in the middle of claiming `first`
+        other.execute(text("SELECT id FROM jobs WHERE id = :id FOR UPDATE"), {"id": first})
+        db.execute(text("SET LOCAL lock_timeout = '2s'"))  # fail rather than hang if it blocked
+        assert [j.id for j in queue.claim(db, "w1", limit=1)] == [second]
+        other.commit()
+        assert [j.id for j in queue.claim(other, "w2", limit=1)] == [first]
+    assert (_job(first).locked_by, _job(second).locked_by) == ("w2", "w1")
+
+
+@pytest.mark.db
+def test_failed_job_is_retried_with_backoff_then_dead(kind, monkeypatch):
+    calls = []
+
+    def fail(db, payload):
+        calls.append(payload)
+        raise RuntimeError("boom")
+
+    monkeypatch.setitem(queue._handlers, kind, fail)
+    (job_id,) = _enqueue(kind, max_attempts=2)
+    with SessionLocal() as db:
+        (job,) = queue.claim(db, "w1", limit=1)
+        assert queue.run(db, job) is False
+        retry_in = db.scalar(text("SELECT extract(epoch FROM run_at - now()) FROM jobs WHERE id = :id"), {"id": job_id})
+    job = _job(job_id)
+    assert (job.status, job.attempts) == (queue.QUEUED, 1)
+    assert "RuntimeError: boom" in job.last_error
+    assert 0 < retry_in <= settings.JOB_BACKOFF_BASE_SECONDS
+
+    with SessionLocal() as db:
+        # The backoff has passed
+        db.execute(update(Job).where(Job.id == job_id).values(run_at=func.now() + timedelta(seconds=OVERDUE)))
+        db.commit()
+        (job,) = queue.claim(db, "w1", limit=1)
+        assert queue.run(db, job) is False
+    job = _job(job_id)
+    assert (job.status, job.attempts, len(calls)) == (queue.DEAD, 2, 2)
+    assert job.finished_at is not None
+
+
+@pytest.mark.db
+def test_successful_and_unknown_jobs(kind, monkeypatch):
+    ran = []
+    monkeypatch.setitem(queue._handlers, kind, lambda db, payload: ran.append(payload))
+    (done_id,) = _enqueue(kind)
+    (dead_id,) = _enqueue(f"{kind}.unknown")
+    with SessionLocal() as db:
+        assert queue.run_once(db, "w1", limit=2) == 2
+    assert ran == [{"n": 0}]
+    assert _job(done_id).status == queue.DONE
+    assert (_job(dead_id).status, _job(dead_id).last_error) == (queue.DEAD, "No handler for job kind " + repr(f"{kind}.unknown"))
+
+
+def test_backoff_is_exponential_capped_and_jittered(monkeypatch):
+    monkeypatch.setattr(settings, "JOB_BACKOFF_BASE_SECONDS", 5)
+    monkeypatch.setattr(settings, "JOB_BACKOFF_MAX_SECONDS", 60)
+    for attempts, full in [(1, 5), (2, 10), (3, 20), (5, 60), (30, 60)]:
+        delays = [queue.backoff_seconds(attempts) for _ in range(20)]
+        assert all(full / 2 <= d <= full for d in delays)
+
+
+@pytest.mark.db
+def test_purge_done_keeps_recent_and_dead_jobs(kind):
+    old_done, recent_done, old_dead = _enqueue(kind, 3)
+    with SessionLocal() as db:
+        long_ago = func.now() - timedelta(hours=settings.JOB_RETENTION_HOURS + 1)
+        for job_id, status, finished in [(old_done, queue.DONE, long_ago), (recent_done, queue.DONE, func.now()),
+                                         (old_dead, queue.DEAD, long_ago)]:
+            db.execute(update(Job).where(Job.id == job_id).values(status=status, finished_at=finished))
+        db.commit()
+        assert queue.purge_done(db) >= 1
+    assert _job(old_done) is None
+    assert _job(recent_done) is not None and _job(old_dead) is not None
+
+
+def test_worker_survives_poll_errors(monkeypatch, caplog):
+    w = worker.Worker(batch=1)
+    polls = iter([RuntimeError("database down"), RuntimeError("still down"), 0])
+    sleeps = []
+
+    def run_once(db, worker_id, limit):
+        result = next(polls)
+        if isinstance(result, Exception):
+            raise result
+        w.stop()
+        return result
+
+    monkeypatch.setattr(worker.queue, "run_once", run_once)
+    monkeypatch.setattr(worker.queue, "purge_done", lambda db: 0)
+    monkeypatch.setattr(worker.time, "sleep", sleeps.append)
+    monkeypatch.setattr(settings, "JOB_POLL_INTERVAL_SECONDS", 1)
+    with caplog.at_level(logging.ERROR, logger=worker.logger.name):
+        w.run()
+    assert sleeps == [2, 4, 1]  # backs off, then polls normally again
+    assert "still down" in caplog.text
+
+
+def test_worker_once_raises_poll_errors(monkeypatch):
+    def run_once(db, worker_id, limit):
+        raise RuntimeError("database down")
+
+    monkeypatch.setattr(worker.queue, "run_once", run_once)
+    with pytest.raises(RuntimeError):
+        worker.Worker(batch=1).run(once=True)
@@ -0,0 +1,76 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
+from fastapi.testclient import TestClient
+from prometheus_client import REGISTRY
+from starlette.applications import Starlette
+from starlette.routing import Route
+
+from app.core import metrics
+
+
+def _sample(name: str, **labels) -> float:
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+@pytest.fixture(scope="module")
+def app_client() -> TestClient:
+    app = FastAPI()
+
+    @app.get("/items/{item_id}")
+    def item(item_id: int):
+        return PlainTextResponse("x" * 100)
+
+    @app.get("/boom")
+    def boom():
+        raise RuntimeError("boom")
+
+    app.mount("/files", Starlette(routes=[Route("/{name}", lambda request: PlainTextResponse("file"))]))
+    return TestClient(metrics.MetricsMiddleware(app), raise_server_exceptions=False)
+
+
+def test_requests_are_labelled_by_route_template(app_client):
+    labels = {"method": "GET", "route": "/items/{item_id}"}
+    before = _sample("http_requests_total", status="200", **labels)
+    count_before = _sample("http_request_duration_seconds_count", **labels)
+    size_before = _sample("http_response_size_bytes_sum", **labels)
+    for item_id in (1, 2, 3):
+        assert app_client.get(f"/items/{item_id}").status_code == 200
+    assert _sample("http_requests_total", status="200", **labels) == before + 3
+    assert _sample("http_request_duration_seconds_count", **labels) == count_before + 3
+    assert _sample("http_response_size_bytes_sum", **labels) == size_before + 300
+    assert _sample("http_requests_total", method="GET", route="/items/1", status="200") == 0
+    assert _sample("http_requests_in_flight") == 0
+
+
+def test_unmatched_mounted_and_failed_requests(app_client):
+    cases = [
+        ("/nowhere/42", {"method": "GET", "route": metrics.UNMATCHED_ROUTE, "status": "404"}),
+        ("/files/photo.jpg", {"method": "GET", "route": "/files/{path}", "status": "200"}),
+        ("/boom", {"method": "GET", "route": "/boom", "status": "500"}),
+    ]
+    for path, labels in cases:
+        before = _sample("http_requests_total", **labels)
+        app_client.get(path)
+        assert _sample("http_requests_total", **labels) == before + 1, path
+
+
+def test_unknown_methods_share_one_label(app_client):
+    labels = {"method": "other", "route": "/items/{item_id}", "status": "405"}
+    before = _sample("http_requests_total", **labels)
+    app_client.request("PROPFIND", "/items/1")
+    assert _sample("http_requests_total", **labels) == before + 1
+
+
+@pytest.mark.db
+def test_metrics_endpoint(client, account):
+    failures = _sample("auth_logins_total", outcome="failure")
+    assert client.post("/auth/login", json={"email": account["email"], "password": "wrong"}).status_code == 401
+    assert _sample("auth_logins_total", outcome="failure") == failures + 1
+    client.get("/vehicles/browse/0")
+
+    r = client.get("/metrics")
+    assert r.status_code == 200
+    assert r.headers["content-type"].startswith("text/plain")
+    assert 'http_requests_total{method="GET",route="/vehicles/browse/{vehicle_id}",status="404"}' in r.text
+    assert 'db_pool_size{pool="primary"}' in r.text
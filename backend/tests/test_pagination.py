@@ -0,0 +1,72 @@
+from datetime import datetime, timezone
+from decimal import Decimal
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.vehicles import pagination
+from app.vehicles.models import Vehicle
+
+
+def _sql(clause) -> str:
+    return str(clause.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}))
+
+
+@pytest.mark.parametrize("sort, attr, value", [
+    ("newest", "created_at", datetime(2026, 3, 1, 12, 30, 5, 123456, tzinfo=timezone.utc)),
+    ("price_asc", "amount", Decimal("450000.50")),
+    ("year_desc", "model_year", 2019),
+    ("mileage_asc", "mileage", 42000),
+    ("mileage_asc", "mileage", None),
+])
+def test_cursor_round_trip(sort, attr, value):
+    cursor = pagination.encode_cursor(sort, Vehicle(id=17, **{attr: value}))
+    assert pagination.decode_cursor(cursor) == (sort, value, 17)
+    assert "=" not in cursor  # URL-safe, unpadded
+
+
+def test_relevance_cursor_is_tied_to_its_search():
+    vehicle = Vehicle(id=5)
+    vehicle.search_rank = 0.25
+    cursor = pagination.encode_cursor(pagination.RELEVANCE, vehicle, "swift diesel")
+    assert pagination.decode_cursor(cursor, "swift diesel") == ("relevance", 0.25, 5)
+    for other in ("swift petrol", None):
+        with pytest.raises(pagination.InvalidCursor, match="search query"):
+            pagination.decode_cursor(cursor, other)
+
+
+@pytest.mark.parametrize("cursor", [
+    "not-a-cursor",
+    "",
+    "eyJzIjoiYm9ndXMiLCJrIjoxLCJpZCI6MX0",  # {"s":"bogus","k":1,"id":1}
+    "eyJzIjoibmV3ZXN0In0",  # {"s":"newest"}
+])
+def test_invalid_cursor(cursor):
+    with pytest.raises(pagination.InvalidCursor):
+        pagination.decode_cursor(cursor)
+
+
+def test_resolve_sort():
+    assert pagination.resolve_sort(None) == pagination.DEFAULT_SORT
+    assert pagination.resolve_sort(None, searching=True) == pagination.RELEVANCE
+    assert pagination.resolve_sort("price_desc") == "price_desc"
+    with pytest.raises(ValueError):
+        pagination.resolve_sort("relevance")
+    with pytest.raises(ValueError):
+        pagination.resolve_sort("cheapest")
+
+
+def test_after_cursor_is_a_plain_range():
+    """No `OR ... IS NULL`: that would keep Postgres from using the cursor as an index range."""
+    assert _sql(pagination.after_cursor("mileage_asc", 42000, 17)) == "(vehicles.mileage, vehicles.id) > (42000, 17)"
+    assert _sql(pagination.after_cursor("price_desc", Decimal("10"), 17)) == "(vehicles.amount, vehicles.id) < (10, 17)"
+    assert _sql(pagination.after_cursor("mileage_asc", None, 17)) == "vehicles.mileage IS NULL AND vehicles.id > 17"
+
+
+def test_next_section():
+    # ASC sorts NULLs last: after the non-NULL values come the NULLs, and nothing after those
+    assert _sql(pagination.next_section("mileage_asc", 42000)) == "vehicles.mileage IS NULL"
+    assert pagination.next_section("mileage_asc", None) is None
+    # Non-nullable keys have a single section
+    assert pagination.next_section("oldest", datetime(2026, 1, 1, tzinfo=timezone.utc)) is None
+    assert pagination.next_section("price_asc", Decimal("1")) is None
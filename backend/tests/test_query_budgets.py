@@ -0,0 +1,145 @@
+"""Every endpoint with a @query_budget, called against PostgreSQL with QUERY_BUDGET_STRICT on.
+
+An endpoint that goes over its budget raises QueryBudgetExceeded out of the
+test client, so an N+1 regression fails here. Listings are called with several
+vehicles of several images each, so per-row queries would show.
+"""
+import json
+import uuid
+
+import pytest
+
+from app.core.config import settings
+
+pytestmark = pytest.mark.db
+
+
+@pytest.fixture
+def vehicles(create_vehicle) -> list[dict]:
+    return [
+        create_vehicle(images=3, name=f"Budget car {i}", amount=300000 + i * 1000, mileage=None if i == 0 else i * 1000)
+        for i in range(4)
+    ]
+
+
+def test_strict_mode_is_on():
+    assert settings.QUERY_BUDGET_STRICT
+
+
+def test_browse(client, vehicles):
+    for params in (
+        {},
+        {"product": "car", "min_amount": 1000, "max_year": 2030},
+        {"q": "Budget car"},
+        {"facets": "true"},
+        {"sort": "price_asc", "page": 2, "per_page": 2},
+    ):
+        r = client.get("/vehicles/browse", params=params)
+        assert r.status_code == 200, (params, r.text)
+
+
+def test_browse_cursor_pages(client, vehicles):
+    """Walk mileage_asc two at a time, through the page where non-NULL mileages run into NULLs."""
+    seen, cursor = [], None
+    while True:
+        params = {"sort": "mileage_asc", "per_page": 2, "max_amount": 303000, "q": "Budget car"}
+        r = client.get("/vehicles/browse", params={**params, **({"cursor": cursor} if cursor else {})})
+        assert r.status_code == 200, r.text
+        seen += [v["id"] for v in r.json()["items"]]
+        cursor = r.json()["next_cursor"]
+        if not cursor:
+            break
+    ours = {v["id"] for v in vehicles}
+    assert [i for i in seen if i in ours] == [v["id"] for v in vehicles[1:]] + [vehicles[0]["id"]]
+
+
+def test_tenant_list(client, auth_headers, vehicles):
+    r = client.get("/vehicles", headers=auth_headers, params={"per_page": 2})
+    assert r.status_code == 200, r.text
+    r = client.get("/vehicles", headers=auth_headers, params={"per_page": 2, "cursor": r.json()["next_cursor"]})
+    assert r.status_code == 200, r.text
+    r = client.get("/vehicles", headers=auth_headers, params={"status_filter": "active", "product": "car"})
+    assert r.status_code == 200, r.text
+
+
+def test_detail_and_revalidation(client, auth_headers, vehicles):
+    vehicle_id = vehicles[1]["id"]
+    for path, headers in ((f"/vehicles/browse/{vehicle_id}", {}), (f"/vehicles/{vehicle_id}", auth_headers)):
+        r = client.get(path, headers=headers)
+        assert r.status_code == 200, r.text
+        r = client.get(path, headers={**headers, "If-None-Match": r.headers["etag"]})
+        assert r.status_code == 304
+
+
+def test_share_page(client, vehicles):
+    r = client.get(f"/v/{vehicles[1]['id']}")
+    assert r.status_code == 200, r.text
+    assert r.headers["vary"] == "Accept-Encoding"
+    r = client.get(f"/v/{vehicles[1]['id']}", headers={"If-None-Match": r.headers["etag"]})
+    assert r.status_code == 304
+    assert r.headers["vary"] == "Accept-Encoding"
+
+
+def test_update_and_images(client, auth_headers, vehicles, image_file):
+    vehicle_id = vehicles[2]["id"]
+    r = client.patch(f"/vehicles/{vehicle_id}", headers=auth_headers, json={"amount": 310000, "status": "sold"})
+    assert r.status_code == 200, r.text
+    r = client.post(f"/vehicles/{vehicle_id}/images", headers=auth_headers, files=[image_file(), image_file()])
+    assert r.status_code in (200, 201), r.text
+    image_ids = [img["id"] for img in client.get(f"/vehicles/{vehicle_id}", headers=auth_headers).json()["images"]]
+    r = client.request("DELETE", f"/vehicles/{vehicle_id}/images", headers=auth_headers,
+                       json={"image_ids": image_ids[:2]})
+    assert r.status_code == 200, r.text
+    r = client.delete(f"/vehicles/{vehicle_id}", headers=auth_headers)
+    assert r.status_code == 204, r.text
+
+
+def test_batch_update_and_delete(client, auth_headers, vehicles):
+    ids = [v["id"] for v in vehicles[:2]]
+    r = client.patch("/vehicles/batch", headers=auth_headers, json={"ids": ids, "patch": {"status": "inactive"}})
+    assert r.status_code == 200, r.text
+    assert r.json()["matched"] == 2
+    r = client.request("DELETE", "/vehicles/batch", headers=auth_headers, json={"ids": ids})
+    assert r.status_code == 200, r.text
+    assert sorted(r.json()["ids"]) == sorted(ids)
+
+
+def test_import_and_export(client, auth_headers):
+    rows = "".join(
+        json.dumps({"name": f"Imported {i}", "product": "bike", "amount": 50000 + i, "model_year": 2020}) + "\n"
+        for i in range(settings.IMPORT_BATCH_SIZE + 5)  # more than one INSERT batch
+    )
+    r = client.post("/vehicles/import", headers=auth_headers,
+                    files={"file": ("stock.ndjson", rows.encode(), "application/x-ndjson")})
+    assert r.status_code == 200, r.text
+    assert r.json()["inserted"] == settings.IMPORT_BATCH_SIZE + 5
+    for fmt in ("ndjson", "csv"):
+        r = client.get("/vehicles/export", headers=auth_headers, params={"format": fmt, "product": "bike"})
+        assert r.status_code == 200, r.text
+        assert r.text.count("Imported ") == settings.IMPORT_BATCH_SIZE + 5
+
+
+def test_browse_facets_leave_out_their_own_filter(client, create_vehicle):
+    where = f"Facetville {uuid.uuid4().hex[:8]}"
+    for product, amount, year in (("car", 300000, 2019), ("car", 600000, 2021), ("bike", 90000, 2021)):
+        create_vehicle(images=1, product=product, amount=amount, model_year=year, location=where)
+    r = client.get("/vehicles/browse", params={"location": where, "product": "car", "max_amount": 500000,
+                                               "facets": "true"})
+    assert r.status_code == 200, r.text
+    body = r.json()
+    assert body["total"] == 1
+    facets = body["facets"]
+    # Products under the price filter only; prices under the product filter only; years under both
+    assert facets["product"] == {"car": 1, "bike": 1}
+    assert [(float(b["min"]), b["count"]) for b in facets["price"]] == [(250000, 1), (500000, 1)]
+    assert [(b["min"], b["count"]) for b in facets["model_year"]] == [(2015, 1)]
+
+
+def test_relevance_cursor_rejects_another_search(client, vehicles):
+    r = client.get("/vehicles/browse", params={"q": "Budget car", "per_page": 1})
+    assert r.status_code == 200, r.text
+    cursor = r.json()["next_cursor"]
+    assert client.get("/vehicles/browse", params={"q": "Budget car", "per_page": 1, "cursor": cursor}).status_code == 200
+    r = client.get("/vehicles/browse", params={"q": "Swift", "per_page": 1, "cursor": cursor})
+    assert r.status_code == 400
+    assert "search query" in r.json()["detail"]
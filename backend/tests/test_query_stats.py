@@ -0,0 +1,90 @@
+"""QueryBudgetMiddleware on a bare ASGI app (no database): statements are simulated on the request's stats."""
+import asyncio
+import logging
+
+import pytest
+
+from app.core import query_stats
+
+
+def _app(statements: int, budget: int):
+    @query_stats.query_budget(budget)
+    def endpoint():
+        pass
+
+    async def app(scope, receive, send):
+        scope["endpoint"] = endpoint  # as the router sets it
+        query_stats.current_stats().count += statements
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b"ok"})
+
+    return app
+
+
+def _call(app) -> list[dict]:
+    sent = []
+
+    async def receive():
+        return {"type": "http.request"}
+
+    async def send(message):
+        sent.append(message)
+
+    scope = {"type": "http", "method": "GET", "path": "/vehicles", "headers": []}
+    asyncio.run(app(scope, receive, send))
+    return sent
+
+
+def test_within_budget():
+    sent = _call(query_stats.QueryBudgetMiddleware(_app(statements=3, budget=3), strict=True))
+    assert sent[0]["status"] == 200
+
+
+def test_over_budget_fails_when_strict():
+    with pytest.raises(query_stats.QueryBudgetExceeded, match="issued 4 queries \\(budget 3\\)"):
+        _call(query_stats.QueryBudgetMiddleware(_app(statements=4, budget=3), strict=True))
+
+
+def test_over_budget_is_logged_otherwise(caplog):
+    with caplog.at_level(logging.WARNING, logger=query_stats.__name__):
+        sent = _call(query_stats.QueryBudgetMiddleware(_app(statements=4, budget=3)))
+    assert sent[0]["status"] == 200
+    assert "issued 4 queries (budget 3)" in caplog.text
+
+
+def test_statements_while_the_body_streams_count():
+    @query_stats.query_budget(2)
+    def endpoint():
+        pass
+
+    async def app(scope, receive, send):
+        scope["endpoint"] = endpoint
+        query_stats.current_stats().count += 1
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        for _ in range(2):
+            query_stats.current_stats().count += 1
+            await send({"type": "http.response.body", "body": b"chunk", "more_body": True})
+        await send({"type": "http.response.body", "body": b""})
+
+    with pytest.raises(query_stats.QueryBudgetExceeded, match="issued 3 queries \\(budget 2\\)"):
+        _call(query_stats.QueryBudgetMiddleware(app, strict=True))
+
+
+def test_uncounted_statements():
+    async def app(scope, receive, send):
+        with query_stats.uncounted():
+            assert query_stats.current_stats() is None
+        assert query_stats.current_stats() is not None
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b""})
+
+    _call(query_stats.QueryBudgetMiddleware(app, strict=True))
+
+
+def test_profile_headers():
+    app = query_stats.QueryBudgetMiddleware(_app(statements=2, budget=5), profile=True, timing_headers=True)
+    headers = dict(_call(app)[0]["headers"])
+    assert headers[b"x-query-count"] == b"2"
+    assert headers[b"server-timing"].startswith(b"db;dur=")
+    headers = dict(_call(query_stats.QueryBudgetMiddleware(_app(statements=2, budget=5), timing_headers=True))[0]["headers"])
+    assert b"x-query-count" not in headers  # headers only come with the profiler
@@ -0,0 +1,74 @@
+"""BodySizeLimitMiddleware on a bare ASGI app (no database)."""
+import asyncio
+
+from fastapi import FastAPI, File, UploadFile
+from fastapi.testclient import TestClient
+
+from app.core.request_limits import BodySizeLimitMiddleware
+
+received = []
+
+
+def _client(max_bytes: int) -> TestClient:
+    app = FastAPI()
+
+    @app.post("/upload")
+    def upload(images: list[UploadFile] = File(...)):
+        received.append(len(images))
+        return {"files": len(images)}
+
+    app.add_middleware(BodySizeLimitMiddleware, max_bytes=max_bytes)
+    return TestClient(app)
+
+
+def _files(count: int, size: int) -> list:
+    return [("images", (f"{i}.jpg", b"x" * size, "image/jpeg")) for i in range(count)]
+
+
+def test_within_limit():
+    r = _client(10_000).post("/upload", files=_files(2, 1000))
+    assert r.status_code == 200
+    assert r.json() == {"files": 2}
+
+
+def test_content_length_over_limit_is_refused_up_front():
+    received.clear()
+    r = _client(10_000).post("/upload", files=_files(3, 5000))
+    assert r.status_code == 413
+    assert received == []
+
+
+def test_chunked_body_is_cut_off_as_it_arrives():
+    received.clear()
+    app = _client(10_000).app
+    reads, sent = [], []
+
+    head = b'--b\r\nContent-Disposition: form-data; name="images"; filename="a.jpg"\r\n\r\n'
+
+    async def receive():
+        reads.append(1)
+        return {"type": "http.request", "body": (head if len(reads) == 1 else b"") + b"x" * 1000,
+                "more_body": len(reads) < 100}
+
+    async def send(message):
+        sent.append(message)
+
+    scope = {"type": "http", "method": "POST", "path": "/upload", "query_string": b"", "root_path": "",
+             "headers": [(b"content-type", b"multipart/form-data; boundary=b")]}
+    asyncio.run(app(scope, receive, send))
+    assert sent[0]["status"] == 413
+    assert received == []
+    assert len(reads) == 10  # stopped at the first chunk past the limit, not after the whole body
+
+
+def test_zero_disables_the_limit():
+    r = _client(0).post("/upload", files=_files(3, 5000))
+    assert r.status_code == 200
+
+
+def test_app_applies_the_configured_limit():
+    from app.core.config import settings
+    from main import app
+
+    limits = [m.kwargs for m in app.user_middleware if m.cls is BodySizeLimitMiddleware]
+    assert limits == [{"max_bytes": int(settings.MAX_REQUEST_BODY_MB * 1024 * 1024)}]
@@ -0,0 +1,55 @@
+import uuid
+
+import pytest
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.database import SessionLocal
+from app.vehicles import response_cache
+from app.vehicles.models import Vehicle
+
+pytestmark = pytest.mark.db
+
+
+@pytest.fixture
+def pages(monkeypatch):
+    """A live browse page cache (the test session runs with BROWSE_CACHE_TTL_SECONDS=0)."""
+    cache = TTLCache(maxsize=16, ttl=60)
+    monkeypatch.setattr(settings, "BROWSE_CACHE_TTL_SECONDS", 60)
+    monkeypatch.setattr(response_cache, "_pages", cache)
+    return cache
+
+
+def _names(client, **params) -> list[str]:
+    r = client.get("/vehicles/browse", params=params)
+    assert r.status_code == 200, r.text
+    return [v["name"] for v in r.json()["items"]]
+
+
+def test_pages_are_cached_until_a_listing_changes(client, auth_headers, create_vehicle, account, pages):
+    where = f"Cachetown {uuid.uuid4().hex[:8]}"
+    vehicle = create_vehicle(images=0, name="Cached one", location=where)
+    assert _names(client, location=where) == ["Cached one"]
+    with SessionLocal() as db:  # behind the app's back: nothing invalidates
+        db.add(Vehicle(name="Sneaked in", product="car", amount=1, model_year=2020, location=where,
+                       account_id=account["account_id"], status="active"))
+        db.commit()
+    assert _names(client, location=where) == ["Cached one"]
+    assert pages.stats()["hits"] == 1
+    # Cursor pages and pages past BROWSE_CACHE_MAX_PAGE always go to the database
+    assert len(_names(client, location=where, page=settings.BROWSE_CACHE_MAX_PAGE + 1, per_page=1)) == 0
+    # A write through the API drops the cached pages
+    r = client.patch(f"/vehicles/{vehicle['id']}", headers=auth_headers, json={"name": "Renamed"})
+    assert r.status_code == 200, r.text
+    assert sorted(_names(client, location=where)) == ["Renamed", "Sneaked in"]
+
+
+def test_inactive_listing_writes_keep_the_cache(client, auth_headers, create_vehicle, pages):
+    vehicle = create_vehicle(images=0)
+    r = client.patch(f"/vehicles/{vehicle['id']}", headers=auth_headers, json={"status": "inactive"})
+    assert r.status_code == 200, r.text
+    _names(client)
+    assert pages.stats()["size"] == 1
+    r = client.patch(f"/vehicles/{vehicle['id']}", headers=auth_headers, json={"name": "Still hidden"})
+    assert r.status_code == 200, r.text
+    assert pages.stats()["size"] == 1
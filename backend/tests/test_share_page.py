@@ -0,0 +1,29 @@
+import pytest
+
+pytestmark = pytest.mark.db
+
+
+def test_each_encoding_has_its_own_etag(client, create_vehicle):
+    path = f"/v/{create_vehicle(images=1)['id']}"
+    plain = client.get(path, headers={"Accept-Encoding": "identity"})
+    gzipped = client.get(path, headers={"Accept-Encoding": "gzip"})
+    assert plain.status_code == gzipped.status_code == 200
+    assert "content-encoding" not in plain.headers
+    assert gzipped.headers["content-encoding"] == "gzip"
+    assert gzipped.headers["etag"] == plain.headers["etag"][:-1] + '-gz"'
+    for r in (plain, gzipped):
+        assert r.headers["vary"] == "Accept-Encoding"
+    # A validator only revalidates the encoding it was sent with
+    r = client.get(path, headers={"Accept-Encoding": "gzip", "If-None-Match": gzipped.headers["etag"]})
+    assert r.status_code == 304
+    assert r.headers["vary"] == "Accept-Encoding"
+    r = client.get(path, headers={"Accept-Encoding": "gzip", "If-None-Match": plain.headers["etag"]})
+    assert r.status_code == 200
+
+
+def test_etag_depends_on_the_base_url(client, create_vehicle):
+    path = f"/v/{create_vehicle(images=1)['id']}"
+    here = client.get(path, headers={"Accept-Encoding": "identity"})
+    there = client.get(f"https://share.example.com{path}", headers={"Accept-Encoding": "identity"})
+    assert "https://share.example.com/storage/" in there.text
+    assert here.headers["etag"] != there.headers["etag"]
@@ -0,0 +1,82 @@
+import hashlib
+import io
+import os
+from pathlib import Path
+
+import pytest
+
+from app.core.config import settings
+from app.database import SessionLocal
+from app.vehicles import images, storage
+
+
+@pytest.fixture
+def root(tmp_path, monkeypatch) -> Path:
+    monkeypatch.setattr(settings, "STORAGE_DIR", str(tmp_path))
+    return tmp_path
+
+
+def _files(root: Path) -> list[str]:
+    return sorted(str(p.relative_to(root)) for p in root.rglob("*") if p.is_file())
+
+
+def test_identical_uploads_share_one_sharded_file(root):
+    data = b"same photo bytes"
+    digest = hashlib.sha256(data).hexdigest()
+    first = storage.save_stream(io.BytesIO(data), "jpg")
+    second = storage.save_stream(io.BytesIO(data), "jpg")
+    assert first == second == f"vehicles/{digest[:2]}/{digest[2:4]}/{digest}.jpg"
+    assert storage.save_stream(io.BytesIO(b"another photo"), "jpg") != first
+    assert len(_files(root)) == 2
+    assert (root / first).read_bytes() == data
+
+
+def test_oversized_upload_leaves_nothing_behind(root):
+    with pytest.raises(storage.UploadRejected):
+        storage.save_stream(io.BytesIO(b"x" * (storage.MAX_FILE_SIZE + 1)), "jpg")
+    with pytest.raises(storage.UploadRejected):
+        storage.save_stream(io.BytesIO(b""), "jpg", size_hint=storage.MAX_FILE_SIZE + 1)
+    assert _files(root) == []
+
+
+def test_extension():
+    assert storage.extension("Photo.JPEG") == "jpg"
+    assert storage.extension("a.webp") == "webp"
+    with pytest.raises(storage.UploadRejected):
+        storage.extension("script.svg")
+
+
+def test_save_all_keeps_upload_order(root, monkeypatch):
+    monkeypatch.setattr(settings, "UPLOAD_WORKERS", 4)
+    payloads = [f"photo {i}".encode() for i in range(6)]
+    paths = storage.save_all([(io.BytesIO(p), "png", None) for p in payloads])
+    assert [(root / p).read_bytes() for p in paths] == payloads
+
+
+@pytest.mark.db
+def test_release_keeps_files_still_referenced_or_recently_stored(client, auth_headers, create_vehicle, monkeypatch):
+    shared = ("images", ("shared.jpg", b"\xff\xd8\xff shared by two listings", "image/jpeg"))
+    first, second = create_vehicle(images=0), create_vehicle(images=0)
+    for vehicle in (first, second):
+        r = client.post(f"/vehicles/{vehicle['id']}/images", headers=auth_headers, files=[shared])
+        assert r.status_code == 200, r.text
+    path = client.get(f"/vehicles/{first['id']}", headers=auth_headers).json()["images"][0]["image_path"]
+    file = Path(settings.STORAGE_DIR) / path
+    monkeypatch.setattr(settings, "STORAGE_GRACE_MINUTES", 0)
+
+    assert client.delete(f"/vehicles/{first['id']}", headers=auth_headers).status_code == 204
+    with SessionLocal() as db:
+        images.release(db, [(path, None)])
+    assert file.exists()  # the second listing still uses it
+
+    assert client.delete(f"/vehicles/{second['id']}", headers=auth_headers).status_code == 204
+    monkeypatch.setattr(settings, "STORAGE_GRACE_MINUTES", 60)
+    with SessionLocal() as db:
+        images.release(db, [(path, None)])
+    assert file.exists()  # unreferenced, but stored within the grace period
+
+    old = file.stat().st_mtime - 2 * 3600
+    os.utime(file, (old, old))
+    with SessionLocal() as db:
+        images.release(db, [(path, None)])
+    assert not file.exists()
@@ -0,0 +1,76 @@
+"""scripts.gc_storage and scripts.migrate_storage_layout against a temporary STORAGE_DIR."""
+import os
+import time
+import uuid
+from pathlib import Path
+
+import pytest
+
+from app.core.config import settings
+from app.database import SessionLocal
+from app.vehicles import images, storage
+from app.vehicles.models import VehicleImage
+from scripts import gc_storage, migrate_storage_layout
+
+pytestmark = pytest.mark.db
+
+
+@pytest.fixture
+def root(tmp_path, monkeypatch) -> Path:
+    monkeypatch.setattr(settings, "STORAGE_DIR", str(tmp_path))
+    return tmp_path
+
+
+def _write(root: Path, rel: str, age_minutes: float = 120) -> Path:
+    path = root / rel
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(b"\xff\xd8\xff" + uuid.uuid4().bytes)
+    old = time.time() - age_minutes * 60
+    os.utime(path, (old, old))
+    return path
+
+
+def test_gc_deletes_only_old_unreferenced_files(root, client, auth_headers, create_vehicle):
+    vehicle = create_vehicle(images=1)
+    kept = client.get(f"/vehicles/{vehicle['id']}", headers=auth_headers).json()["images"][0]["image_path"]
+    old = time.time() - 7200
+    os.utime(root / kept, (old, old))
+    kept_variant = _write(root, images.variant_path(kept, "thumb_webp"))
+    orphan = _write(root, storage.content_path("ab" * 32, "jpg"))
+    orphan_variant = _write(root, images.variant_path(storage.content_path("cd" * 32, "png"), "thumb"))
+    stale_part = _write(root, "vehicles/upload-1.part")
+    fresh_orphan = _write(root, storage.content_path("ef" * 32, "jpg"), age_minutes=5)
+    fresh_part = _write(root, "vehicles/upload-2.part", age_minutes=5)
+
+    assert gc_storage.collect(batch=2, pause=0, grace_minutes=60, dry_run=True)[:2] == (7, 3)
+    assert all(p.exists() for p in (orphan, orphan_variant, stale_part))
+
+    checked, orphans, freed = gc_storage.collect(batch=2, pause=0, grace_minutes=60, dry_run=False)
+    assert (checked, orphans) == (7, 3) and freed > 0
+    assert not any(p.exists() for p in (orphan, orphan_variant, stale_part))
+    assert all(p.exists() for p in (root / kept, kept_variant, fresh_orphan, fresh_part))
+
+
+def test_migrate_moves_flat_files_and_their_variants(root, client, auth_headers, create_vehicle):
+    vehicle = create_vehicle(images=0)
+    flat = f"vehicles/{uuid.uuid4().hex}.jpg"
+    data = _write(root, flat).read_bytes()
+    _write(root, images.variant_path(flat, "thumb"))
+    with SessionLocal() as db:
+        img = VehicleImage(vehicle_id=vehicle["id"], image_path=flat, variants={"thumb": images.variant_path(flat, "thumb")})
+        db.add(img)
+        db.commit()
+        image_id = img.id
+
+    migrated, _ = migrate_storage_layout.migrate(batch=2, dry_run=False)
+    assert migrated == 1
+    with SessionLocal() as db:
+        img = db.get(VehicleImage, image_id)
+        new, variants = img.image_path, img.variants
+    assert migrate_storage_layout.SHARDED.match(new)
+    assert (root / new).read_bytes() == data
+    assert variants == {"thumb": images.variant_path(new, "thumb")}
+    assert (root / variants["thumb"]).is_file()
+    assert not (root / flat).exists() and not (root / images.variant_path(flat, "thumb")).exists()
+
+    assert migrate_storage_layout.migrate(batch=2, dry_run=False)[0] == 0  # already migrated
@@ -0,0 +1,100 @@
+"""StorageFiles on a bare Starlette app over a temporary directory (no database)."""
+import os
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+from starlette.applications import Starlette
+from starlette.routing import Mount
+
+from app.core import config
+from app.vehicles import serving
+
+DIGEST = "ab" * 32
+HASHED = f"vehicles/ab/ab/{DIGEST}.jpg"
+VARIANT = f"vehicles/ab/ab/{DIGEST}_thumb_webp.webp"
+LEGACY = "vehicles/photo.jpg"
+BODY = bytes(range(256)) * 4
+
+
+@pytest.fixture
+def root(tmp_path) -> Path:
+    for rel in (HASHED, VARIANT, LEGACY, f"{HASHED}.part"):
+        (tmp_path / rel).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / rel).write_bytes(BODY)
+    return tmp_path
+
+
+def _client(root: Path, **kwargs) -> TestClient:
+    files = serving.StorageFiles(directory=str(root), **kwargs)
+    return TestClient(Starlette(routes=[Mount("/storage", files)]))
+
+
+def test_content_etag():
+    assert serving.content_etag(HASHED) == f'"{DIGEST}"'
+    assert serving.content_etag(VARIANT) == f'"{DIGEST}_thumb_webp"'
+    assert serving.content_etag(LEGACY) is None
+
+
+def test_hashed_files_are_immutable_with_a_stable_etag(root):
+    client = _client(root, max_age=600)
+    r = client.get(f"/storage/{HASHED}")
+    assert r.status_code == 200 and r.content == BODY
+    assert r.headers["cache-control"] == "public, max-age=600, immutable"
+    assert r.headers["etag"] == f'"{DIGEST}"'
+
+    os.utime(root / HASHED, (1, 1))  # a re-upload of the same content touches the mtime
+    r = client.get(f"/storage/{HASHED}", headers={"If-None-Match": f'"{DIGEST}"'})
+    assert r.status_code == 304
+    assert r.headers["etag"] == f'"{DIGEST}"'
+
+
+def test_legacy_names_revalidate(root):
+    r = _client(root).get(f"/storage/{LEGACY}")
+    assert r.status_code == 200
+    assert r.headers["cache-control"] == serving.REVALIDATE
+    assert r.headers["etag"] != f'"{DIGEST}"'  # Starlette's own mtime/size tag
+
+
+def test_files_being_written_are_hidden(root):
+    assert _client(root).get(f"/storage/{HASHED}.part").status_code == 404
+
+
+def test_range_with_if_range_on_the_content_etag(root):
+    client = _client(root)
+    r = client.get(f"/storage/{HASHED}", headers={"Range": "bytes=10-19", "If-Range": f'"{DIGEST}"'})
+    assert r.status_code == 206
+    assert r.content == BODY[10:20]
+    assert r.headers["content-range"] == f"bytes 10-19/{len(BODY)}"
+    r = client.get(f"/storage/{HASHED}", headers={"Range": "bytes=10-19", "If-Range": '"something-else"'})
+    assert r.status_code == 200 and r.content == BODY
+
+
+def test_x_accel_redirect(root):
+    client = _client(root, sendfile="x-accel-redirect", accel_prefix="/_files")
+    r = client.get(f"/storage/{VARIANT}")
+    assert r.status_code == 200 and r.content == b""
+    assert r.headers["x-accel-redirect"] == f"/_files/{VARIANT}"
+    assert r.headers["etag"] == f'"{DIGEST}_thumb_webp"'
+    assert r.headers["content-type"] == "image/webp"
+    assert client.get(f"/storage/{VARIANT}", headers={"If-None-Match": f'"{DIGEST}_thumb_webp"'}).status_code == 304
+
+
+def test_x_sendfile(root):
+    r = _client(root, sendfile="x-sendfile").get(f"/storage/{HASHED}")
+    assert r.content == b""
+    assert r.headers["x-sendfile"] == os.path.realpath(root / HASHED)
+
+
+def test_invalid_sendfile_mode(root):
+    with pytest.raises(ValueError, match="STORAGE_SENDFILE"):
+        serving.StorageFiles(directory=str(root), sendfile="nginx")
+
+
+def test_relative_storage_dir_is_taken_from_the_backend_directory(monkeypatch):
+    backend = Path(config.__file__).resolve().parents[2]
+    monkeypatch.setenv("STORAGE_DIR", "media/uploads")
+    monkeypatch.chdir("/")
+    assert config._get_storage_dir() == str(backend / "media" / "uploads")
+    monkeypatch.setenv("STORAGE_DIR", "/srv/storage")
+    assert config._get_storage_dir() == "/srv/storage"
@@ -0,0 +1,46 @@
+"""
+Static assets for server-rendered pages (view/static), served at /assets.
+Each file is fingerprinted with a hash of its content (product.css -> product.<hash>.css)
+so it can be cached by browsers and proxies forever; a changed file gets a new URL.
+"""
+import hashlib
+import mimetypes
+from pathlib import Path
+from typing import NamedTuple, Optional
+
+STATIC_DIR = Path(__file__).resolve().parent / "static"
+URL_PREFIX = "/assets"
+CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+
+class Asset(NamedTuple):
+    filename: str
+    content: bytes
+    media_type: str
+
+
+def _fingerprint(path: Path) -> Asset:
+    content = path.read_bytes()
+    digest = hashlib.sha256(content).hexdigest()[:12]
+    media_type = mimetypes.guess_type(path.name)[0] or "application/octet-stream"
+    if media_type.startswith("text/") or media_type.endswith("javascript"):
+        media_type += "; charset=utf-8"
+    return Asset(f"{path.stem}.{digest}{path.suffix}", content, media_type)
+
+
+# source name (e.g. "product.css") -> Asset; loaded once at import
+_BY_NAME = {p.name: _fingerprint(p) for p in sorted(STATIC_DIR.iterdir()) if p.is_file()}
+_BY_FILENAME = {a.filename: a for a in _BY_NAME.values()}
+
+# Changes whenever any asset changes; part of the share page ETag
+REVISION = hashlib.sha256("".join(a.filename for a in _BY_NAME.values()).encode()).hexdigest()[:12]
+
+
+def url(base_url: str, name: str) -> str:
+    """Absolute, fingerprinted URL of static asset `name`."""
+    return f"{base_url}{URL_PREFIX}/{_BY_NAME[name].filename}"
+
+
+def lookup(filename: str) -> Optional[Asset]:
+    """Asset for a fingerprinted filename, or None (unknown or outdated fingerprint)."""
+    return _BY_FILENAME.get(filename)
@@ -0,0 +1,17 @@
+(function(){
+  var slides=document.querySelectorAll('.slide');
+  var dots=document.querySelectorAll('.dot');
+  var inner=document.getElementById('carousel');
+  var counter=document.querySelector('.img-counter');
+  if(slides.length<=1)return;
+  var idx=0;
+  function go(n){
+    idx=(n+slides.length)%slides.length;
+    inner.style.transform='translateX(-'+idx*100+'%)';
+    dots.forEach(function(d,i){d.classList.toggle('active',i===idx);});
+    if(counter)counter.textContent=(idx+1)+'/'+slides.length;
+  }
+  document.getElementById('prev')&&document.getElementById('prev').addEventListener('click',function(){go(idx-1);});
+  document.getElementById('next')&&document.getElementById('next').addEventListener('click',function(){go(idx+1);});
+  dots.forEach(function(d,i){d.addEventListener('click',function(){go(i);});});
+})();